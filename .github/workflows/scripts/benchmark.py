@@ -0,0 +1,669 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Benchmark the workflow scripts on a synthetic corpus.
+
+Methodology:
+
+    A reproducible corpus is generated from a seed: a tree of TSX files
+    with a tunable density of style violations and line length, and a
+    tree of locale directories with deeply nested JSON files. Each check
+    is then run over the corpus several times and the fastest run is
+    reported, along with the peak memory of a separate traced run, which
+    is not timed.
+
+    Only the standard library is used, so the benchmark runs wherever the
+    scripts themselves do.
+
+Usage:
+    python benchmark.py --files 10000 --output results.json
+    python benchmark.py --files 10000 --baseline results.json
+
+    The exit code is 1 when a check is slower than in the baseline by
+    more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import compare_translations  # noqa: E402
+import css_check  # noqa: E402
+import locale_snapshot  # noqa: E402
+import translation_check  # noqa: E402
+
+# Timing and memory of one benchmark
+BenchmarkResult = namedtuple(
+    "BenchmarkResult", ["name", "files", "bytes", "seconds", "peak_memory"]
+)
+
+# Files written in each directory of the TSX tree
+_FILES_PER_DIRECTORY = 100
+
+# Locale files checked by the scripts
+_LOCALE_FILES = ("common.json", "translation.json", "errors.json")
+
+# Lines holding a violation, filled in with random values
+_VIOLATION_LINES = (
+    "  const accent{index} = '#{color:06x}';",
+    "  const shadow{index} = 'rgba({value}, {value}, {value}, 0.5)';",
+    "  const box{index}Style = {{ marginTop: '{value}px' }};",
+)
+
+
+def _pad(line: str, line_length: int, rng: random.Random) -> str:
+    """Pad a line of code with a trailing comment.
+
+    Args:
+        line: The line of code.
+        line_length: Length to pad the line to.
+        rng: The random generator of the corpus.
+
+    Returns:
+        str: The padded line.
+    """
+    if len(line) + 4 >= line_length:
+        return line
+    words = []
+    length = len(line) + 4
+    while length < line_length:
+        word = rng.choice(("value", "item", "index", "state", "props"))
+        words.append(word)
+        length += len(word) + 1
+    return f"{line} // {' '.join(words)}"[:line_length]
+
+
+def generate_tsx_file(
+    index: int,
+    lines: int,
+    line_length: int,
+    violation_density: float,
+    keys: list[str],
+    rng: random.Random,
+) -> str:
+    """Generate the source of a TSX component.
+
+    Args:
+        index: Number of the component, used in its names.
+        lines: Number of lines in the component body.
+        line_length: Typical length of a line.
+        violation_density: Fraction of body lines holding a violation.
+        keys: Translation keys the component may use.
+        rng: The random generator of the corpus.
+
+    Returns:
+        str: The source of the file.
+    """
+    body = []
+    for line_index in range(lines):
+        roll = rng.random()
+        if roll < violation_density:
+            line = rng.choice(_VIOLATION_LINES).format(
+                index=line_index,
+                color=rng.randrange(0x1000000),
+                value=rng.randrange(256),
+            )
+        elif roll < violation_density + 0.1 and keys:
+            line = f"  const label{line_index} = t('{rng.choice(keys)}');"
+        else:
+            line = (
+                f"  const value{line_index} = compute{line_index % 7}"
+                f"(items, {line_index});"
+            )
+        body.append(_pad(line, line_length, rng))
+
+    return "\n".join(
+        [
+            "import React from 'react';",
+            "import { useTranslation } from 'react-i18next';",
+            "import styles from './Component.module.css';",
+            "",
+            f"export default function Component{index}(): JSX.Element {{",
+            "  const { t } = useTranslation('translation');",
+            *body,
+            "  return (",
+            "    <div className={styles.container}>",
+            f"      <p>{{t('{keys[0] if keys else 'title'}')}}</p>",
+            "    </div>",
+            "  );",
+            "}",
+            "",
+        ]
+    )
+
+
+def generate_tsx_tree(
+    root: str | Path,
+    files: int,
+    violation_density: float = 0.05,
+    line_length: int = 80,
+    lines: int = 60,
+    keys: list[str] | None = None,
+    seed: int = 0,
+) -> None:
+    """Write a tree of TSX components.
+
+    Args:
+        root: Directory to write the tree to.
+        files: Number of files to write.
+        violation_density: Fraction of body lines holding a violation.
+        line_length: Typical length of a line.
+        lines: Number of lines in the body of each component.
+        keys: Translation keys the components may use.
+        seed: Seed of the random generator. The same seed and arguments
+            always give the same tree.
+
+    Returns:
+        None
+    """
+    rng = random.Random(seed)
+    keys = keys or []
+    for index in range(files):
+        directory = Path(root, f"module{index // _FILES_PER_DIRECTORY}")
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"Component{index}.tsx").write_text(
+            generate_tsx_file(
+                index, lines, line_length, violation_density, keys, rng
+            ),
+            encoding="utf-8",
+        )
+
+
+def generate_locale(keys: int, depth: int, rng: random.Random) -> dict:
+    """Generate a nested locale dictionary.
+
+    Args:
+        keys: Approximate number of leaf keys.
+        depth: Number of nesting levels.
+        rng: The random generator of the corpus.
+
+    Returns:
+        dict: The locale, with string leaves, some of them holding
+        ``{{name}}`` interpolations.
+    """
+    if depth <= 1:
+        return {
+            f"key{index}": (
+                f"Text {index} for {{{{name}}}}"
+                if rng.random() < 0.2
+                else f"Text {index}"
+            )
+            for index in range(max(1, keys))
+        }
+    branches = max(2, round(keys ** (1 / depth)))
+    return {
+        f"group{index}": generate_locale(keys // branches, depth - 1, rng)
+        for index in range(branches)
+    }
+
+
+def _translate(
+    locale: dict, language: str, missing: float, rng: random.Random
+) -> dict:
+    """Derive the locale of another language, dropping some keys.
+
+    Args:
+        locale: The default locale.
+        language: Code of the language.
+        missing: Fraction of the keys to leave out.
+        rng: The random generator of the corpus.
+
+    Returns:
+        dict: The translated locale.
+    """
+    translated = {}
+    for key, value in locale.items():
+        if isinstance(value, dict):
+            translated[key] = _translate(value, language, missing, rng)
+        elif rng.random() >= missing:
+            translated[key] = f"[{language}] {value}"
+    return translated
+
+
+def generate_locale_tree(
+    root: str | Path,
+    languages: int = 10,
+    keys: int = 2000,
+    depth: int = 4,
+    missing: float = 0.001,
+    seed: int = 0,
+) -> list[str]:
+    """Write a tree of locale directories.
+
+    Args:
+        root: Directory to write the tree to. The default language is in
+            its "en" subdirectory.
+        languages: Number of languages besides the default one.
+        keys: Approximate number of keys in each locale file.
+        depth: Number of nesting levels of the keys.
+        missing: Fraction of keys left out of the other languages.
+        seed: Seed of the random generator. The same seed and arguments
+            always give the same tree.
+
+    Returns:
+        list: The flattened keys of the default translation.json.
+    """
+    rng = random.Random(seed)
+    default = {
+        name: generate_locale(keys, depth, rng) for name in _LOCALE_FILES
+    }
+    codes = ["en"] + [f"l{index:02d}" for index in range(languages)]
+    for code in codes:
+        directory = Path(root, code)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, locale in default.items():
+            if code != "en":
+                locale = _translate(locale, code, missing, rng)
+            (directory / name).write_text(
+                json.dumps(locale, indent=2, ensure_ascii=False),
+                encoding="utf-8",
+            )
+    return sorted(translation_check.get_keys(default["translation.json"]))
+
+
+def _tree_size(root: str | Path, suffixes: tuple[str, ...]) -> tuple[int, int]:
+    """Count the files with the given suffixes in a tree and their size.
+
+    Args:
+        root: Root directory of the tree.
+        suffixes: File name suffixes to count.
+
+    Returns:
+        tuple: The number of files and their total size in bytes.
+    """
+    files = 0
+    size = 0
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if name.endswith(suffixes):
+                files += 1
+                size += os.path.getsize(os.path.join(directory, name))
+    return files, size
+
+
+def measure(
+    name: str, function, files: int, size: int, repeat: int = 3
+) -> BenchmarkResult:
+    """Time a function and measure its peak memory.
+
+    Args:
+        name: Name of the benchmark.
+        function: The function to run, without arguments.
+        files: Number of files the function processes.
+        size: Total size in bytes of those files.
+        repeat: Number of timed runs. The fastest one is reported.
+
+    Returns:
+        BenchmarkResult: The fastest time and the peak memory allocated
+        by Python while running the function once more under
+        tracemalloc.
+    """
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(name, files, size, min(seconds), peak_memory)
+
+
+def _run_css_check(root: str, jobs: int) -> None:
+    """Run css_check over a TSX tree.
+
+    Args:
+        root: Root directory of the tree.
+        jobs: Number of worker processes.
+
+    Returns:
+        None
+    """
+    css_check.check_files([root], [], [], [], jobs)
+
+
+def _run_translation_check(root: str, locales_dir: str) -> None:
+    """Run translation_check over a TSX tree, as its main function does.
+
+    Args:
+        root: Root directory of the tree.
+        locales_dir: Directory of the default locale.
+
+    Returns:
+        None
+    """
+    valid_keys = translation_check.load_locale_keys(locales_dir)
+    for path in translation_check.get_target_files(directories=[root]):
+        translation_check.check_file(path, valid_keys)
+
+
+def _load_locale_keys(locales_dir: str, cache_dir: str | None) -> None:
+    """Load the keys of a locale as a new process would.
+
+    Args:
+        locales_dir: Directory of the locale.
+        cache_dir: Directory of the snapshots, or None to parse the files.
+
+    Returns:
+        None
+    """
+    locale_snapshot.clear_memory()
+    translation_check.load_locale_keys(locales_dir, cache_dir)
+
+
+def _run_compare_translations(directory: str) -> None:
+    """Run compare_translations over a locale tree, discarding its output.
+
+    Args:
+        directory: Root directory of the locale tree.
+
+    Returns:
+        None
+    """
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with redirect_stdout(devnull):
+            try:
+                compare_translations.check_translations(directory)
+            except SystemExit:
+                pass
+
+
+def run_benchmarks(
+    corpus_dir: str | Path, args: argparse.Namespace
+) -> list[BenchmarkResult]:
+    """Generate the corpus and benchmark every check on it.
+
+    Args:
+        corpus_dir: Directory to generate the corpus in.
+        args: The parsed command line arguments.
+
+    Returns:
+        list: The result of each benchmark.
+    """
+    source_dir = os.path.join(corpus_dir, "src")
+    locales_dir = os.path.join(corpus_dir, "locales")
+    keys = generate_locale_tree(
+        locales_dir,
+        args.languages,
+        args.locale_keys,
+        args.locale_depth,
+        seed=args.seed,
+    )
+    generate_tsx_tree(
+        source_dir,
+        args.files,
+        args.violation_density,
+        args.line_length,
+        args.lines,
+        keys,
+        seed=args.seed,
+    )
+    source_files, source_size = _tree_size(source_dir, (".tsx",))
+    locale_files, locale_size = _tree_size(locales_dir, (".json",))
+    default_dir = os.path.join(locales_dir, "en")
+    default_files, default_size = _tree_size(default_dir, (".json",))
+    snapshot_dir = os.path.join(corpus_dir, "snapshots")
+    # Build the snapshot loaded by the locale_keys_snapshot benchmark
+    _load_locale_keys(default_dir, snapshot_dir)
+
+    return [
+        measure(
+            "css_check",
+            lambda: _run_css_check(source_dir, args.jobs),
+            source_files,
+            source_size,
+            args.repeat,
+        ),
+        measure(
+            "translation_check",
+            lambda: _run_translation_check(source_dir, default_dir),
+            source_files + default_files,
+            source_size + default_size,
+            args.repeat,
+        ),
+        measure(
+            "locale_keys_parsed",
+            lambda: _load_locale_keys(default_dir, None),
+            default_files,
+            default_size,
+            args.repeat,
+        ),
+        measure(
+            "locale_keys_snapshot",
+            lambda: _load_locale_keys(default_dir, snapshot_dir),
+            default_files,
+            default_size,
+            args.repeat,
+        ),
+        measure(
+            "compare_translations",
+            lambda: _run_compare_translations(locales_dir),
+            locale_files,
+            locale_size,
+            args.repeat,
+        ),
+    ]
+
+
+def result_to_json(result: BenchmarkResult) -> dict:
+    """Return a benchmark result with its throughput, for the JSON report.
+
+    Args:
+        result: The benchmark result.
+
+    Returns:
+        dict: The result fields, files per second and MB per second.
+    """
+    seconds = max(result.seconds, 1e-9)
+    return {
+        "files": result.files,
+        "bytes": result.bytes,
+        "seconds": result.seconds,
+        "files_per_second": result.files / seconds,
+        "mb_per_second": result.bytes / seconds / (1024 * 1024),
+        "peak_memory": result.peak_memory,
+    }
+
+
+def format_results(results: list[BenchmarkResult]) -> str:
+    """Format benchmark results as a table.
+
+    Args:
+        results: The benchmark results.
+
+    Returns:
+        str: The formatted table.
+    """
+    output_lines = [
+        f"{'Benchmark':<24}{'Files':>10}{'Seconds':>10}"
+        f"{'Files/s':>12}{'MB/s':>10}{'Peak MB':>10}"
+    ]
+    for result in results:
+        report = result_to_json(result)
+        output_lines.append(
+            f"{result.name:<24}{result.files:>10}{result.seconds:>10.3f}"
+            f"{report['files_per_second']:>12.1f}"
+            f"{report['mb_per_second']:>10.2f}"
+            f"{result.peak_memory / (1024 * 1024):>10.1f}"
+        )
+    return "\n".join(output_lines)
+
+
+def compare_to_baseline(
+    results: dict, baseline: dict, threshold: float
+) -> list[str]:
+    """Find the benchmarks that got slower than in a baseline.
+
+    Args:
+        results: Benchmark results, as written to the JSON report.
+        baseline: Baseline results, in the same format.
+        threshold: Allowed slowdown, as a fraction of the baseline
+            throughput.
+
+    Returns:
+        list: A message for each benchmark whose throughput in files per
+        second dropped by more than the threshold.
+    """
+    regressions = []
+    for name, result in results["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        current = result["files_per_second"]
+        expected = previous["files_per_second"]
+        if current < expected * (1 - threshold):
+            regressions.append(
+                f"{name}: {current:.1f} files/s, baseline {expected:.1f} "
+                f"files/s (-{1 - current / expected:.0%})"
+            )
+    return regressions
+
+
+def main():
+    """Run the benchmarks.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the workflow scripts on a synthetic corpus."
+    )
+    parser.add_argument(
+        "--files", type=int, default=1000, help="Number of TSX files."
+    )
+    parser.add_argument(
+        "--violation-density",
+        type=float,
+        default=0.05,
+        help="Fraction of lines holding a style violation.",
+    )
+    parser.add_argument(
+        "--line-length",
+        type=int,
+        default=80,
+        help="Typical length of a line of the TSX files.",
+    )
+    parser.add_argument(
+        "--lines",
+        type=int,
+        default=60,
+        help="Number of lines in the body of each TSX component.",
+    )
+    parser.add_argument(
+        "--languages",
+        type=int,
+        default=10,
+        help="Number of languages besides English.",
+    )
+    parser.add_argument(
+        "--locale-keys",
+        type=int,
+        default=2000,
+        help="Approximate number of keys in each locale file.",
+    )
+    parser.add_argument(
+        "--locale-depth",
+        type=int,
+        default=4,
+        help="Nesting depth of the locale keys.",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the corpus generator."
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Timed runs of each benchmark. The fastest is reported.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes used by css_check.",
+    )
+    parser.add_argument(
+        "--corpus-dir",
+        help="""Generate the corpus in this directory and keep it, instead
+        of in a temporary directory.""",
+    )
+    parser.add_argument(
+        "--output", help="Write the results as JSON to this path."
+    )
+    parser.add_argument(
+        "--baseline",
+        help="Compare the results to a JSON report written by --output.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Allowed drop in files per second against the baseline.",
+    )
+    args = parser.parse_args()
+    if args.files < 1 or args.repeat < 1 or args.jobs < 1:
+        parser.error("--files, --repeat and --jobs must be at least 1.")
+
+    corpus_dir = args.corpus_dir or tempfile.mkdtemp(prefix="benchmark-")
+    try:
+        results = run_benchmarks(corpus_dir, args)
+    finally:
+        if args.corpus_dir is None:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    print(format_results(results))
+    report = {
+        "parameters": {
+            name: value
+            for name, value in vars(args).items()
+            if name not in ("corpus_dir", "output", "baseline", "threshold")
+        },
+        "results": {result.name: result_to_json(result) for result in results},
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        try:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error: Failed to read baseline: {e}", file=sys.stderr)
+            sys.exit(2)
+        if baseline.get("parameters") != report["parameters"]:
+            print(
+                "Warning: The baseline was run with different parameters.",
+                file=sys.stderr,
+            )
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        if regressions:
+            print("Regressions against the baseline:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("No regressions against the baseline.")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
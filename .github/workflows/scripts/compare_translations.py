@@ -58,6 +58,10 @@ import sys
 import re
 from collections import namedtuple
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import locale_flatten  # noqa: E402
+
 # Named tuple for file and missing
 #   translations combination
 FileTranslation = namedtuple(
@@ -177,25 +181,14 @@ def flatten_json(nested_json, parent_key=""):
 
     Args:
         nested_json (dict): The JSON object to flatten.
-        parent_key (str): The base key for recursion to track key hierarchy.
+        parent_key (str): The base key prepended to every key.
 
     Returns:
-        dict: A flattened dictionary with concatenated keys.
+        dict: A flattened dictionary with concatenated keys, in the order
+        the keys appear in the JSON.
     """
-    flat_dict = {}
-
-    for key, value in nested_json.items():
-        # Create the new key by concatenating parent and current key
-        new_key = f"{parent_key}.{key}" if parent_key else key
-
-        if isinstance(value, dict):
-            # Recursively flatten the nested dictionary
-            flat_dict.update(flatten_json(value, new_key))
-        else:
-            # Assign the value to the flattened key
-            flat_dict[new_key] = value
-
-    return flat_dict
+    prefix = f"{parent_key}." if parent_key else ""
+    return dict(locale_flatten.flatten(nested_json, prefix))
 
 
 def load_translation(filepath):
@@ -3,10 +3,31 @@
 """Check TypeScript files for CSS violations and embedded CSS."""
 
 import argparse
+import bisect
+import codecs
+import glob
+import hashlib
+import heapq
+import json
+import mmap
 import os
 import re
+import string
+import subprocess
 import sys
-from collections import namedtuple
+import time
+from array import array
+from collections import Counter, namedtuple
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import groupby
+from typing import BinaryIO
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import file_discovery  # noqa: E402
+from line_index import LineIndex  # noqa: E402
 
 # Define namedtuple for storing detailed violations
 DetailedViolation = namedtuple(
@@ -20,343 +41,3243 @@ DetailedViolation = namedtuple(
     ],
 )
 CSSCheckResult = namedtuple("CSSCheckResult", ["violations"])
+# A violation together with the offsets of its snippet in the content
+LocatedViolation = namedtuple(
+    "LocatedViolation", ["start", "end", "violation"]
+)
+
+
+# CSS properties that are reported when written in camelCase
+_CAMELCASE_PROPERTIES = (
+    "backgroundColor",
+    "fontSize",
+    "fontFamily",
+    "fontWeight",
+    "lineHeight",
+    "marginTop",
+    "marginBottom",
+    "marginLeft",
+    "marginRight",
+    "paddingTop",
+    "paddingBottom",
+    "paddingLeft",
+    "paddingRight",
+    "borderRadius",
+    "boxShadow",
+    "textAlign",
+    "textDecoration",
+    "zIndex",
+    "maxWidth",
+    "minWidth",
+    "maxHeight",
+    "minHeight",
+)
+_SIZE_UNITS = ("px", "em", "rem", "vh", "vw", "%")
+
+# Pattern definitions. The order of the entries is the order in which
+# violations found on the same line are reported. "first_chars" lists every
+# character a match of the rule can start with, and "literals" lists strings
+# of which every match contains at least one.
+PATTERNS = {
+    "hex_color": {
+        "regex": r"#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})\b",
+        "first_chars": "#",
+        "literals": ["#"],
+        "description": """Hex color code found.
+            Use CSS variables from stylesheet instead.""",
+    },
+    "rgb_color": {
+        "regex": (
+            r"\brgba?\s*\(\s*"
+            r"\d+\s*,\s*"
+            r"\d+\s*,\s*"
+            r"\d+\s*"
+            r"(?:,\s*[\d.]+\s*)?"
+            r"\)"
+        ),
+        "first_chars": "r",
+        "literals": ["rgb"],
+        "description": """RGB/RGBA color code found.
+            Use CSS variables from stylesheet instead.""",
+    },
+    "hsl_color": {
+        "regex": (
+            r"\bhsla?\s*\(\s*"
+            r"\d+\s*,\s*"
+            r"\d+%\s*,\s*"
+            r"\d+%\s*"
+            r"(?:,\s*[\d.]+\s*)?"
+            r"\)"
+        ),
+        "first_chars": "h",
+        "literals": ["hsl"],
+        "description": """HSL/HSLA color code found.
+            Use CSS variables from stylesheet instead.""",
+    },
+    "inline_style_object": {
+        "regex": r"style\s*=\s*\{\{",
+        "first_chars": "s",
+        "literals": ["style"],
+        "description": """Inline style object found.
+            Move styles to CSS file and use className instead.""",
+    },
+    "inline_style_string": {
+        "regex": r'style\s*=\s*["\']',
+        "first_chars": "s",
+        "literals": ["style"],
+        "description": """Inline style string found.
+            Move styles to CSS file and use className instead.""",
+    },
+    "camelcase_css_property": {
+        "regex": r"\b(?:" + "|".join(_CAMELCASE_PROPERTIES) + r")\s*[:=]",
+        "first_chars": "bflmptz",
+        "literals": list(_CAMELCASE_PROPERTIES),
+        "description": """Camelcase CSS property found.
+            Move styles to CSS file and use className instead.""",
+    },
+    "pixel_value": {
+        "regex": (
+            r":\s*"
+            r"['\"]?"
+            r"\d+(?:" + "|".join(_SIZE_UNITS) + ")"
+            r"['\"]?"
+            r"(?=\s*[,}])"
+        ),
+        "first_chars": ":",
+        "literals": [
+            digit + unit for digit in "0123456789" for unit in _SIZE_UNITS
+        ],
+        "description": """Direct size value assignment found.
+            Move styles to CSS file and use className instead.""",
+    },
+}
+
+# Line boundaries, matching the ones recognised by str.splitlines. In UTF-8
+# encoded content NEL, LS and PS are multi-byte sequences.
+_TEXT_LINE_BREAK = r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]"
+_UTF8_LINE_BREAK = (
+    r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]"
+)
+
+# A character of a quoted string literal, which ends at a line break
+_TEXT_STRING_CHAR = r"[^{quote}\\\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]"
+_UTF8_STRING_CHAR = (
+    r"[^{quote}\\\n\r\x0b\x0c\x1c\x1d\x1e\xc2\xe2]"
+    r"|\xc2(?!\x85)|\xe2(?!\x80[\xa8\xa9])"
+)
+
+# A character other than whitespace. Multi-byte characters in UTF-8
+# encoded content are matched as a whole.
+_TEXT_CHAR = r"\S"
+_UTF8_CHAR = r"[\xc0-\xff][\x80-\xbf]*|[^\x80-\xbf\s]"
+
+# Whitespace that does not end a line. The rules are scanned over whole
+# code spans at once, so ``\s`` inside them is narrowed to this class to
+# keep every match on a single line. Patterns use ASCII matching, so they
+# behave the same on text and on UTF-8 encoded bytes.
+_INLINE_SPACE = r"[\t ]"
+
+# Tokens that change the analyzer state in code. As for the rules, a
+# leading character class lets the engine skip the positions where no token
+# can start.
+_CODE_TOKENS = (
+    r"(?P<line_comment>//)|(?P<block_comment>/\*)"
+    r"|(?P<single_quote>')|(?P<double_quote>\")|(?P<template>`)"
+    r"|(?P<open_brace>\{)|(?P<close_brace>\})"
+    r"|(?P<open_paren>\()|(?P<close_paren>\))"
+    r"|(?P<open_bracket>\[)|(?P<close_bracket>\])"
+    r"|(?P<slash>/)"
+)
+_CODE_TOKEN = r"(?=[/'\"`{}()\[\]])(?:" + _CODE_TOKENS + ")"
+# In TSX code ``<`` may also start a JSX element
+_JSX_CODE_TOKEN = r"(?=[/'\"`{}()\[\]<])(?:" + _CODE_TOKENS + r"|(?P<less><))"
+
+# Tokens inside a JSX opening tag
+_TAG_TOKEN = (
+    r"(?P<line_comment>//)|(?P<block_comment>/\*)"
+    r"|(?P<self_close>/>)|(?P<tag_end>>)|(?P<open_brace>\{)"
+    r"|(?P<attribute>[\w$:.-]+)|(?P<single_quote>')|(?P<double_quote>\")"
+)
+
+# The start of a JSX element or fragment. The type parameters of a generic
+# arrow function, such as ``<T,>``, do not start an element.
+_JSX_OPEN = r"<(?:[A-Za-z_$][\w$.:-]*(?![\w$.:-]|\s*(?:,|extends\b))|(?=>))"
+_JSX_CLOSE = r"</[^>]*>?"
+
+# Body of a template literal up to the closing backtick or a ``${``. Runs
+# of plain characters are consumed at once rather than one by one.
+_TEMPLATE_CHUNK = (
+    r"(?:[^`\\$]+|\\[\s\S]|\$(?!\{))*(?:`|(?P<substitution>\$\{))?"
+)
+
+# The last token before an offset, which tells whether an expression or a
+# statement comes next. It is searched for up to the end of the window with
+# the trailing whitespace and line breaks trimmed, so it ends there.
+_LAST_TOKEN = r"(?:(?<![\w$])[\w$]+|=>|\.\.\.|(?!{line_break})(?:{char}))\Z"
+
+# Keywords after which an expression starts
+_EXPRESSION_KEYWORDS = frozenset(
+    [
+        "await",
+        "case",
+        "default",
+        "delete",
+        "in",
+        "instanceof",
+        "new",
+        "of",
+        "return",
+        "throw",
+        "typeof",
+        "void",
+        "yield",
+    ]
+)
+
+# What an opening bracket belongs to: the key of an object property, the
+# target of an assignment or declaration and its type annotation, possibly
+# through an arrow function, or the function it is an argument list of.
+# Each form ends with its own characters, so only the forms that can end
+# with the last character before the bracket are searched for, up to that
+# character.
+_OWNER_KEY = r"(?P<key>(?<![\w$-])[\w$-]+|'[^'\n]*'|\"[^\"\n]*\")\s*:"
+_OWNER_TARGET = (
+    r"(?P<target>(?<![\w$.])[\w$.]+)\s*(?::(?P<annotation>[^=;{}]*))?"
+    r"(?<![=!<>])=(?![=>])"
+    r"(?:\s*(?:async\s*)?(?:\([^()]*\)|[\w$]+)\s*(?::[^=;{}]*)?=>)?"
+)
+_OWNER_CALLEE = (
+    r"(?P<callee>(?<![\w$.])[\w$.]+(?:\s*\([^()]*\))?)\s*(?:<[^<>;]*>)?"
+)
+_OWNERS = {
+    ":": _OWNER_KEY,
+    "=": _OWNER_TARGET,
+    ">": f"{_OWNER_TARGET}|{_OWNER_CALLEE}",
+    **dict.fromkeys(
+        string.ascii_letters + string.digits + "_$.)", _OWNER_CALLEE
+    ),
+}
+# How far back the owner of a bracket is looked for
+_OWNER_WINDOW = 200
+
+# Names of styles, style props, style helpers and style types
+_STYLE_NAME = r"(?=[sScC])(?:[sS]tyle|css|CSS|\bsx\b|SxProps)"
+# Whitespace matched by ``\s``, and the line breaks beyond it that a last
+# token may be followed by
+_SPACE = " \t\n\r\x0b\x0c"
+_TEXT_SPACE = _SPACE + "\x1c\x1d\x1e\x85\u2028\u2029"
+_UTF8_SPACE = _SPACE + "\x1c\x1d\x1e"
+_UTF8_WIDE_LINE_BREAKS = (b"\xc2\x85", b"\xe2\x80\xa8", b"\xe2\x80\xa9")
+# Attributes, keys and variables whose string values are URLs
+_URL_NAME = r"(?i:href|src)\Z"
+_URL_OWNER = r"(?i:href|src)['\"]?\s*[:=]\s*\Z"
+# Type aliases and interfaces, whose braces hold types rather than values
+_TYPE_DECLARATION = (
+    r"\b(?:type\s+[\w$]+\s*(?:<[^=]*>)?\s*=|interface\s+[\w$]+[^{;=]*)\s*\Z"
+)
+# Member assignment on a style object, as in ``element.style.fontSize =``
+_STYLE_MEMBER = r"[sS]tyle\s*\.\s*\Z"
+
+# Bits of the context mask built by analyze_source
+_STYLE_OBJECT = 1
+_URL = 2
+
+# Compiled lexer and rule patterns for one kind of content
+_Syntax = namedtuple(
+    "_Syntax",
+    [
+        "rules",
+        "rule_patterns",
+        "prefilter",
+        "literal_rules",
+        "line_break",
+        "code_token",
+        "jsx_code_token",
+        "tag_token",
+        "children_token",
+        "jsx_open",
+        "jsx_close",
+        "string_literals",
+        "jsx_strings",
+        "template_chunk",
+        "regex_literal",
+        "last_token",
+        "space",
+        "line_space",
+        "wide_line_breaks",
+        "owners",
+        "style_name",
+        "url_name",
+        "url_owner",
+        "url_call",
+        "type_declaration",
+        "style_member",
+        "import_statement",
+        "comment_end",
+        "close_paren",
+    ],
+)
+
+
+def _compile(source: str, binary: bool, flags: int = 0) -> re.Pattern:
+    """Compile a pattern for text or for UTF-8 encoded bytes.
+
+    Args:
+        source: The pattern, written with escapes for non-ASCII characters.
+        binary: Whether the pattern is matched against bytes.
+        flags: Additional regular expression flags.
+
+    Returns:
+        re.Pattern: The compiled pattern.
+    """
+    if binary:
+        source = source.encode("ascii")
+    return re.compile(source, flags | re.ASCII)
+
+
+def _rule_regex(info: dict) -> str:
+    """Return the pattern of a rule as it is matched over code spans.
+
+    Args:
+        info: The pattern definition of the rule.
+
+    Returns:
+        str: The pattern, with whitespace narrowed to a single line.
+    """
+    return info["regex"].replace(r"\s", _INLINE_SPACE)
+
+
+def _compile_rules(patterns: dict, binary: bool) -> re.Pattern:
+    """Compile the rule table into a single alternation of named groups.
+
+    Each rule is wrapped in a lookahead so that matches of different rules
+    may overlap (for example ``fontSize:`` and ``: '16px'`` share the
+    colon), exactly as when every rule was searched for separately. A
+    leading character class built from "first_chars" lets the engine skip
+    positions where no rule can start.
+
+    Args:
+        patterns: Mapping of violation type to its pattern definition.
+        binary: Whether the rules are matched against bytes.
+
+    Returns:
+        re.Pattern: The compiled combined rule expression.
+    """
+    first_chars = set()
+    alternatives = []
+    for name, info in patterns.items():
+        first_chars.update(info["first_chars"])
+        alternatives.append(f"(?P<{name}>{_rule_regex(info)})")
+    guard = re.escape("".join(sorted(first_chars)))
+    return _compile(f"(?=[{guard}])(?=(?:{'|'.join(alternatives)}))", binary)
+
+
+def _literal_trie(literals: Iterable[str]) -> str:
+    """Build a pattern matching the longest of some literals at an offset.
+
+    The literals are merged into a trie, so the engine follows a single
+    branch per character instead of trying every literal in turn. A node
+    that ends a literal makes the rest of its branch optional, which keeps
+    the longest literal, so a literal that is a prefix of another one does
+    not hide it.
+
+    Args:
+        literals: The literals, such as ``style`` and ``12px``.
+
+    Returns:
+        str: The pattern.
+    """
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def branch(node: dict) -> str:
+        """Return the pattern of the literal endings below a trie node.
+
+        Args:
+            node: The trie node.
+
+        Returns:
+            str: The pattern, empty at the end of a literal.
+        """
+        alternatives = [
+            re.escape(char) + branch(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not alternatives:
+            return ""
+        pattern = "(?:" + "|".join(alternatives) + ")"
+        return pattern + "?" if "" in node else pattern
+
+    return branch(trie)
+
+
+def _compile_syntax(
+    line_break: str, string_char: str, char: str, binary: bool
+) -> _Syntax:
+    """Compile the lexer and rule patterns for one kind of content.
+
+    Args:
+        line_break: Pattern matching a single line break.
+        string_char: Pattern matching a character of a quoted string, with
+            a ``{quote}`` placeholder for the quote that ends the string.
+        char: Pattern matching a whole character other than whitespace.
+        binary: Whether the patterns are matched against bytes.
+
+    Returns:
+        _Syntax: The compiled patterns.
+    """
+    literal_rules = {}
+    for name, info in PATTERNS.items():
+        for literal in info["literals"]:
+            key = literal.encode("ascii") if binary else literal
+            literal_rules.setdefault(key, []).append(name)
+
+    # Regular expression literals end at the closing slash, which may not
+    # be inside a character class, and never span lines
+    regex_char = string_char.format(quote=r"/\[")
+    class_char = string_char.format(quote=r"\]")
+    regex_escape = rf"\\(?!{line_break})[\s\S]"
+
+    # One pattern per form of owner, shared by the characters it ends with
+    owners = {
+        source: _compile(rf"(?:{source})\Z", binary)
+        for source in set(_OWNERS.values())
+    }
+
+    return _Syntax(
+        rules=_compile_rules(PATTERNS, binary),
+        # Every rule on its own, matched the same way, for profiling
+        rule_patterns={
+            name: _compile(f"(?={_rule_regex(info)})", binary)
+            for name, info in PATTERNS.items()
+        },
+        prefilter=_compile(
+            _literal_trie(
+                {
+                    literal
+                    for info in PATTERNS.values()
+                    for literal in info["literals"]
+                }
+            ),
+            binary,
+        ),
+        literal_rules=literal_rules,
+        line_break=_compile(line_break, binary),
+        code_token=_compile(_CODE_TOKEN, binary),
+        jsx_code_token=_compile(_JSX_CODE_TOKEN, binary),
+        tag_token=_compile(_TAG_TOKEN, binary),
+        children_token=_compile(
+            r"(?=[{<])(?:(?P<open_brace>\{)|(?P<close_tag></)|(?P<less><))",
+            binary,
+        ),
+        jsx_open=_compile(_JSX_OPEN, binary),
+        jsx_close=_compile(_JSX_CLOSE, binary),
+        # Quoted string literals end at the closing quote or at the end of
+        # the line
+        string_literals={
+            name: _compile(
+                f"{quote}(?:{string_char.format(quote=quote)}"
+                rf"|\\(?:{line_break}|[\s\S]))*{quote}?",
+                binary,
+            )
+            for name, quote in [("single_quote", "'"), ("double_quote", '"')]
+        },
+        # JSX attribute strings have no escapes and may span lines
+        jsx_strings={
+            "single_quote": _compile(r"'[^']*'?", binary),
+            "double_quote": _compile(r'"[^"]*"?', binary),
+        },
+        template_chunk=_compile(_TEMPLATE_CHUNK, binary),
+        regex_literal=_compile(
+            rf"/(?:{regex_char}|{regex_escape}"
+            rf"|\[(?:{class_char}|{regex_escape})*\])+/[A-Za-z]*",
+            binary,
+        ),
+        last_token=_compile(
+            _LAST_TOKEN.format(line_break=line_break, char=char), binary
+        ),
+        space=_SPACE.encode("ascii") if binary else _SPACE,
+        line_space=_UTF8_SPACE.encode("ascii") if binary else _TEXT_SPACE,
+        wide_line_breaks=_UTF8_WIDE_LINE_BREAKS if binary else (),
+        owners={
+            last_char.encode("ascii") if binary else last_char: owners[source]
+            for last_char, source in _OWNERS.items()
+        },
+        style_name=_compile(_STYLE_NAME, binary),
+        url_name=_compile(_URL_NAME, binary),
+        url_owner=_compile(_URL_OWNER, binary),
+        url_call=_compile(r"url\(", binary, re.IGNORECASE),
+        type_declaration=_compile(_TYPE_DECLARATION, binary),
+        style_member=_compile(_STYLE_MEMBER, binary),
+        import_statement=_compile(r"import[ {(]", binary),
+        comment_end=b"*/" if binary else "*/",
+        close_paren=b")" if binary else ")",
+    )
+
+
+_TEXT_SYNTAX = _compile_syntax(
+    _TEXT_LINE_BREAK, _TEXT_STRING_CHAR, _TEXT_CHAR, False
+)
+_UTF8_SYNTAX = _compile_syntax(
+    _UTF8_LINE_BREAK, _UTF8_STRING_CHAR, _UTF8_CHAR, True
+)
+_RULE_ORDER = {name: index for index, name in enumerate(PATTERNS)}
+
+# Runs of non-ASCII bytes, which must each be valid UTF-8 on their own
+_NON_ASCII = re.compile(rb"[\x80-\xff]+")
+
+# Hunk header of a unified diff, capturing the new start line and count
+_DIFF_HUNK = re.compile(r"@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def _syntax_for(content: str | bytes) -> _Syntax:
+    """Return the patterns that apply to the given content.
+
+    Args:
+        content: Text, or UTF-8 encoded bytes such as a memory map.
+
+    Returns:
+        _Syntax: The compiled patterns for the content.
+    """
+    return _TEXT_SYNTAX if isinstance(content, str) else _UTF8_SYNTAX
+
+
+def _decode(fragment: str | bytes) -> str:
+    """Return a fragment of the content as text.
+
+    Args:
+        fragment: A slice of text or of UTF-8 encoded bytes.
+
+    Returns:
+        str: The fragment as text.
+    """
+    return fragment if isinstance(fragment, str) else fragment.decode("utf-8")
+
+
+# Code spans of a file and the context of every offset in it, as a mask of
+# _STYLE_OBJECT and _URL bits
+SourceContext = namedtuple("SourceContext", ["spans", "mask"])
+
+# Frames closed by a brace
+_BRACE_FRAMES = (
+    "block",
+    "object",
+    "type",
+    "substitution",
+    "attribute",
+    "child",
+)
+# Closing tokens and the frames they close
+_CLOSED_FRAMES = {
+    "close_brace": _BRACE_FRAMES,
+    "close_paren": ("paren",),
+    "close_bracket": ("bracket",),
+}
+# Tokens after which a brace opens an object literal rather than a block
+_OBJECT_PRECEDERS = frozenset("( , = : [ ? ... | & ! < + - * % ~ ^".split())
+# Tokens after which an operand, rather than an operator, is expected
+_OPERAND_FOLLOWERS = frozenset(") ] } ' \" `".split())
+
+
+class _Frame:
+    """An open bracket or JSX element met while analyzing a file."""
+
+    __slots__ = ("kind", "start", "style", "url", "bits", "attribute")
+
+    def __init__(self, kind: str, start: int, style: bool, url: bool) -> None:
+        """Create a frame.
+
+        Args:
+            kind: What the frame is: "block", "object", "type", "paren",
+                "bracket", "substitution", "attribute" or "child" for
+                brackets, "tag" for a JSX opening tag and "element" for the
+                children of a JSX element.
+            start: Offset of the opening token.
+            style: Whether the frame is part of a style definition.
+            url: Whether the frame holds a URL.
+
+        Returns:
+            None
+        """
+        self.kind = kind
+        self.start = start
+        self.style = style
+        self.url = url
+        self.bits = (_STYLE_OBJECT if style and kind == "object" else 0) | (
+            _URL if url else 0
+        )
+        # Offsets of the last attribute name in a JSX opening tag
+        self.attribute = None
+
+
+class _SourceAnalyzer:
+    """Tokenize a TS or TSX file once, tracking brackets and JSX.
+
+    The analyzer keeps a stack of the open brackets and JSX elements.
+    Whether a bracket is part of a style definition is decided once, when
+    it is opened, from its parent and from what it belongs to, and the
+    ranges whose context differs from the enclosing one are recorded so the
+    context of every offset can be painted onto a mask in one go.
+    """
+
+    def __init__(self, content: str | bytes, jsx: bool) -> None:
+        """Prepare the analysis of a file.
+
+        Args:
+            content: The content of the file, as text or UTF-8 bytes.
+            jsx: Whether the file may contain JSX.
+
+        Returns:
+            None
+        """
+        self.content = content
+        self.syntax = _syntax_for(content)
+        self.code_token = (
+            self.syntax.jsx_code_token if jsx else self.syntax.code_token
+        )
+        self.length = len(content)
+        self.spans = []
+        self.span_start = 0
+        self.frames = []
+        # (start, end, bits) of the ranges to paint onto the mask
+        self.painted = []
+        # Start and end offsets of the style names in the file, found on
+        # first use
+        self.style_starts = None
+        self.style_ends = None
+
+    def run(self, end: int) -> SourceContext:
+        """Analyze the file.
+
+        Args:
+            end: Offset at which the analysis may stop.
+
+        Returns:
+            SourceContext: The code spans and the context mask.
+        """
+        position = 0
+        while position < end:
+            frame = self.frames[-1] if self.frames else None
+            if frame is not None and frame.kind == "tag":
+                position = self._tag(frame, position)
+            elif frame is not None and frame.kind == "element":
+                position = self._children(position)
+            else:
+                position = self._code(position)
+
+        if self.length > self.span_start:
+            self.spans.append((self.span_start, self.length))
+        while self.frames:
+            self._pop(self.length)
+
+        # Enclosing ranges start first, so nested ones are painted over them
+        mask = bytearray(self.length)
+        self.painted.sort(key=lambda painted: painted[0])
+        for start, stop, bits in self.painted:
+            mask[start:stop] = bytes([bits]) * (stop - start)
+        return SourceContext(spans=self.spans, mask=mask)
+
+    def _push(self, kind: str, start: int, style: bool, url: bool) -> None:
+        """Open a frame.
+
+        Args:
+            kind: The kind of frame.
+            start: Offset of the opening token.
+            style: Whether the frame is part of a style definition.
+            url: Whether the frame holds a URL.
+
+        Returns:
+            None
+        """
+        self.frames.append(_Frame(kind, start, style, url))
+
+    def _pop(self, position: int) -> _Frame:
+        """Close the innermost frame.
+
+        Args:
+            position: Offset just after the closing token.
+
+        Returns:
+            _Frame: The closed frame.
+        """
+        frame = self.frames.pop()
+        parent_bits = self.frames[-1].bits if self.frames else 0
+        if frame.bits != parent_bits:
+            self.painted.append((frame.start, position, frame.bits))
+        return frame
+
+    def _comment(self, kind: str, start: int, position: int) -> int:
+        """Skip a comment, leaving it out of the code spans.
+
+        Args:
+            kind: "line_comment" or "block_comment".
+            start: Offset of the comment marker.
+            position: Offset just after the comment marker.
+
+        Returns:
+            position: Offset just after the comment.
+        """
+        if start > self.span_start:
+            self.spans.append((self.span_start, start))
+        if kind == "line_comment":
+            line_break = self.syntax.line_break.search(self.content, position)
+            position = (
+                self.length if line_break is None else line_break.start()
+            )
+        else:
+            comment_end = self.content.find(self.syntax.comment_end, position)
+            position = self.length if comment_end == -1 else comment_end + 2
+        self.span_start = position
+        return position
+
+    def _code(self, position: int) -> int:
+        """Handle the next token in code.
+
+        Args:
+            position: Offset to continue from.
+
+        Returns:
+            position: Offset just after the token.
+        """
+        syntax = self.syntax
+        token = self.code_token.search(self.content, position)
+        if token is None:
+            return self.length
+        kind = token.lastgroup
+        start = token.start()
+        position = token.end()
+
+        if kind == "line_comment" or kind == "block_comment":
+            return self._comment(kind, start, position)
+        if kind in syntax.string_literals:
+            end = syntax.string_literals[kind].match(self.content, start).end()
+            self._string(start, end)
+            return end
+        if kind == "template":
+            return self._template(position)
+        if kind == "open_brace":
+            self._open_brace(start)
+        elif kind == "open_paren":
+            parent = self.frames[-1] if self.frames else None
+            style = parent is not None and parent.style
+            url = parent is not None and parent.url
+            self._push(
+                "paren", start, style or self._owned_by_style(start), url
+            )
+        elif kind == "open_bracket":
+            parent = self.frames[-1] if self.frames else None
+            self._push(
+                "bracket",
+                start,
+                parent is not None and parent.style,
+                parent is not None and parent.url,
+            )
+        elif kind in _CLOSED_FRAMES:
+            frame = self.frames[-1] if self.frames else None
+            # Stray closing tokens are ignored
+            if frame is not None and frame.kind in _CLOSED_FRAMES[kind]:
+                self._pop(position)
+                if frame.kind == "substitution":
+                    return self._template(position)
+        elif self._starts_operand(start):
+            if kind == "slash":
+                literal = syntax.regex_literal.match(self.content, start)
+                if literal is not None:
+                    return literal.end()
+            else:
+                element = syntax.jsx_open.match(self.content, start)
+                if element is not None:
+                    self._push("tag", start, False, False)
+                    return element.end()
+        return position
+
+    def _tag(self, frame: _Frame, position: int) -> int:
+        """Handle the next token in a JSX opening tag.
+
+        Args:
+            frame: The frame of the tag.
+            position: Offset to continue from.
+
+        Returns:
+            position: Offset just after the token.
+        """
+        syntax = self.syntax
+        token = syntax.tag_token.search(self.content, position)
+        if token is None:
+            return self.length
+        kind = token.lastgroup
+        start = token.start()
+        position = token.end()
+
+        if kind == "line_comment" or kind == "block_comment":
+            return self._comment(kind, start, position)
+        if kind == "attribute":
+            frame.attribute = (start, position)
+            return position
+
+        attribute = frame.attribute
+        frame.attribute = None
+        if kind in syntax.jsx_strings:
+            end = syntax.jsx_strings[kind].match(self.content, start).end()
+            if attribute is not None and syntax.url_name.search(
+                self.content, *attribute
+            ):
+                self.painted.append((start, end, frame.bits | _URL))
+            return end
+        if kind == "open_brace":
+            self._push(
+                "attribute",
+                start,
+                attribute is not None
+                and syntax.style_name.search(self.content, *attribute)
+                is not None,
+                attribute is not None
+                and syntax.url_name.search(self.content, *attribute)
+                is not None,
+            )
+        elif kind == "tag_end":
+            frame.kind = "element"
+        else:
+            self._pop(position)
+        return position
+
+    def _children(self, position: int) -> int:
+        """Handle the next token in the children of a JSX element.
+
+        Args:
+            position: Offset to continue from.
+
+        Returns:
+            position: Offset just after the token.
+        """
+        syntax = self.syntax
+        token = syntax.children_token.search(self.content, position)
+        if token is None:
+            return self.length
+        kind = token.lastgroup
+        start = token.start()
+
+        if kind == "open_brace":
+            self._push("child", start, False, False)
+            return token.end()
+        if kind == "close_tag":
+            end = syntax.jsx_close.match(self.content, start).end()
+            self._pop(end)
+            return end
+        element = syntax.jsx_open.match(self.content, start)
+        if element is None:
+            return token.end()
+        self._push("tag", start, False, False)
+        return element.end()
+
+    def _template(self, position: int) -> int:
+        """Skip over the body of a template literal.
+
+        Args:
+            position: Offset just after a backtick or a closing ``}``.
+
+        Returns:
+            position: Offset just after the end of the template body. A
+            substitution frame is opened when the body ends at a ``${``.
+        """
+        chunk = self.syntax.template_chunk.match(self.content, position)
+        self._string(position, chunk.end())
+        if chunk.lastgroup == "substitution":
+            parent = self.frames[-1] if self.frames else None
+            self._push(
+                "substitution",
+                chunk.end() - 2,
+                parent is not None and parent.style,
+                parent is not None and parent.url,
+            )
+        return chunk.end()
+
+    def _string(self, start: int, end: int) -> None:
+        """Record the URLs held by a string literal.
+
+        The whole string is a URL when it is the value of an ``href`` or
+        ``src`` key or variable, and otherwise every ``url(...)`` in it is.
+
+        Args:
+            start: Offset of the string literal.
+            end: Offset just after the string literal.
+
+        Returns:
+            None
+        """
+        syntax = self.syntax
+        frame = self.frames[-1] if self.frames else None
+        bits = frame.bits if frame is not None else 0
+        if bits & _URL:
+            return
+        if syntax.url_owner.search(self.content, max(0, start - 32), start):
+            self.painted.append((start, end, bits | _URL))
+            return
+        url = syntax.url_call.search(self.content, start, end)
+        while url is not None:
+            close = self.content.find(syntax.close_paren, url.end(), end)
+            stop = end if close == -1 else close + 1
+            self.painted.append((url.start(), stop, bits | _URL))
+            url = syntax.url_call.search(self.content, stop, end)
+
+    def _open_brace(self, start: int) -> None:
+        """Open a block, an object literal or a type literal.
+
+        Args:
+            start: Offset of the brace.
+
+        Returns:
+            None
+        """
+        parent = self.frames[-1] if self.frames else None
+        last_token = self._last_token(start)
+        window = max(0, start - _OWNER_WINDOW)
+
+        if parent is not None and parent.kind == "type":
+            kind = "type"
+        elif last_token is None:
+            kind = "block"
+        elif last_token == "{":
+            # Double braces, as in ``style={{``
+            kind = (
+                "object"
+                if parent is not None
+                and parent.kind in ("attribute", "child", "substitution")
+                else "block"
+            )
+        elif last_token in _OBJECT_PRECEDERS:
+            kind = "object"
+        elif last_token in _EXPRESSION_KEYWORDS:
+            kind = "object"
+        else:
+            kind = "block"
+        if kind != "type" and self.syntax.type_declaration.search(
+            self.content, window, start
+        ):
+            kind = "type"
+
+        style = parent is not None and parent.style and kind != "type"
+        url = parent is not None and parent.url
+        if not style and kind != "type":
+            style = self._owned_by_style(start, kind)
+        self._push(kind, start, style, url)
+
+    def _owned_by_style(self, start: int, kind: str = "paren") -> bool:
+        """Check whether a bracket belongs to a style definition.
+
+        Objects belong to a style definition when their key, variable or
+        type is named like a style, as in ``const buttonStyle = {``. Blocks
+        and argument lists do when they belong to a lower-case function
+        named like one, such as ``makeStyles(`` or ``getStyles = () => (``,
+        but not to a component such as ``StyleSettings``.
+
+        Args:
+            start: Offset of the opening bracket.
+            kind: The kind of frame the bracket opens.
+
+        Returns:
+            bool: True if the bracket belongs to a style definition.
+        """
+        syntax = self.syntax
+        window = max(0, start - _OWNER_WINDOW)
+        if not self._has_style_name(window, start):
+            return False
+        stop = self._trim(window, start, syntax.space)
+        pattern = syntax.owners.get(self.content[stop - 1 : stop])
+        if pattern is None:
+            return False
+        owner = pattern.search(self.content, window, stop)
+        if owner is None:
+            return False
+        if kind == "object":
+            names = ("key", "target", "annotation")
+        elif kind == "block":
+            names = ("target",)
+        else:
+            names = ("target", "callee")
+        for name in names:
+            if name not in owner.re.groupindex:
+                continue
+            name_start, name_end = owner.span(name)
+            if name_start == -1:
+                continue
+            if name != "annotation" and kind != "object":
+                if not self.content[name_start : name_start + 1].islower():
+                    continue
+            if syntax.style_name.search(self.content, name_start, name_end):
+                return True
+        return False
+
+    def _has_style_name(self, start: int, end: int) -> bool:
+        """Check whether a style name may be between two offsets.
+
+        The style names of the whole file are found once, so the check is
+        a binary search. A name that only partly overlaps the range also
+        counts, which errs on the side of looking for the owner.
+
+        Args:
+            start: Offset of the start of the range.
+            end: Offset of the end of the range.
+
+        Returns:
+            bool: True if a style name overlaps the range.
+        """
+        if self.style_ends is None:
+            matches = list(self.syntax.style_name.finditer(self.content))
+            self.style_starts = [match.start() for match in matches]
+            self.style_ends = [match.end() for match in matches]
+        index = bisect.bisect_right(self.style_ends, start)
+        return (
+            index < len(self.style_starts) and self.style_starts[index] < end
+        )
+
+    def _trim(
+        self,
+        start: int,
+        end: int,
+        space: str | bytes,
+        line_breaks: tuple[bytes, ...] = (),
+    ) -> int:
+        """Return the end of a range without its trailing whitespace.
+
+        Args:
+            start: Offset of the start of the range.
+            end: Offset of the end of the range.
+            space: The whitespace characters to trim.
+            line_breaks: Multi-byte line breaks to trim as well.
+
+        Returns:
+            int: Offset just after the last other character of the range,
+            or start if there is none.
+        """
+        text = self.content[start:end].rstrip(space)
+        while line_breaks and text.endswith(line_breaks):
+            for line_break in line_breaks:
+                if text.endswith(line_break):
+                    text = text[: -len(line_break)].rstrip(space)
+                    break
+        return start + len(text)
+
+    def _last_token(self, position: int) -> str | None:
+        """Return the last token before an offset.
+
+        Args:
+            position: The offset.
+
+        Returns:
+            str | None: The token, or None at the start of the file.
+        """
+        window = max(0, position - 64)
+        token = self.syntax.last_token.search(
+            self.content,
+            window,
+            self._trim(
+                window,
+                position,
+                self.syntax.line_space,
+                self.syntax.wide_line_breaks,
+            ),
+        )
+        if token is None:
+            return None
+        text = token.group(0)
+        return (
+            text if isinstance(text, str) else text.decode("utf-8", "replace")
+        )
+
+    def _starts_operand(self, position: int) -> bool:
+        """Check whether an operand rather than an operator comes next.
+
+        This tells a regular expression literal from a division and a JSX
+        element from a comparison.
+
+        Args:
+            position: Offset of the ambiguous token.
+
+        Returns:
+            bool: True if an operand is expected at the offset.
+        """
+        last_token = self._last_token(position)
+        if last_token is None:
+            return True
+        # Non-ASCII characters can only be part of identifiers here
+        last_char = last_token[-1]
+        if last_char.isalnum() or last_char in "_$" or not last_char.isascii():
+            return last_token in _EXPRESSION_KEYWORDS
+        return last_token not in _OPERAND_FOLLOWERS
+
+
+def analyze_source(
+    content: str | bytes, jsx: bool = True, end: int | None = None
+) -> SourceContext:
+    """Tokenize a file once and work out the context of every offset.
+
+    Comments are left out of the code spans. String literals, including
+    template literals and their ``${}`` substitutions, regular expression
+    literals and JSX text are code, so comment markers inside them (for
+    example ``'https://'``) do not start a comment. Brackets and JSX
+    elements are tracked as they open and close, which gives the mask:
+
+    - _STYLE_OBJECT is set inside object literals that are part of a style
+      definition: the value of a ``style``, ``sx`` or other style-named
+      JSX attribute or key, an object assigned to a style-named variable
+      or typed as one, an argument of a style helper such as
+      ``makeStyles``, and anything nested in those.
+    - _URL is set inside the values of ``href`` and ``src`` attributes,
+      keys and variables, and inside ``url(...)`` in strings.
+
+    The analysis visits every character at most once, so it runs in linear
+    time, and looking up the context of an offset takes constant time.
+
+    Args:
+        content: The content of the file, either as text or as UTF-8
+            encoded bytes. Offsets are in the same units as the content.
+        jsx: Whether the file may contain JSX, as TSX files do.
+        end: Optional offset at which the analysis may stop. The result is
+            only exact up to this offset, and the last span is extended to
+            the end of the content.
+
+    Returns:
+        SourceContext: The code spans, sorted and non-overlapping, and the
+        context mask, with one entry per offset.
+    """
+    return _SourceAnalyzer(content, jsx).run(
+        len(content) if end is None else end
+    )
+
+
+def lex_code_spans(
+    content: str | bytes, end: int | None = None, jsx: bool = True
+) -> list[tuple[int, int]]:
+    """Split the content into the regions that are code.
+
+    Args:
+        content: The content of the file to lex, either as text or as UTF-8
+            encoded bytes. Offsets are in the same units as the content.
+        end: Optional offset at which lexing may stop. The spans are only
+            exact up to this offset, and the last one is extended to the
+            end of the content.
+        jsx: Whether the file may contain JSX.
+
+    Returns:
+        spans: Sorted, non-overlapping (start, end) offsets of code regions,
+        as found by analyze_source.
+    """
+    return analyze_source(content, jsx, end).spans
+
+
+def _line_segments(
+    spans: list[tuple[int, int]], line_start: int, line_end: int
+) -> list[tuple[int, int]]:
+    """Return the parts of a line that are code.
+
+    Args:
+        spans: Code spans of the file, as returned by lex_code_spans.
+        line_start: Offset of the first character of the line.
+        line_end: Offset of the line break ending the line.
+
+    Returns:
+        list: The (start, end) offsets of the code regions of the line.
+    """
+    segments = []
+    span_index = max(0, bisect.bisect_right(spans, (line_start,)) - 1)
+    while span_index < len(spans) and spans[span_index][0] < line_end:
+        start = max(spans[span_index][0], line_start)
+        end = min(spans[span_index][1], line_end)
+        span_index += 1
+        if start < end:
+            segments.append((start, end))
+    return segments
+
+
+class PrefilterStats:
+    """Count the work the literal prefilter saves.
+
+    A rule can only match on lines holding one of its "literals". Lines
+    holding none of the literals of any rule are never scanned, and files
+    without any are not even lexed.
+
+    Attributes:
+        files_scanned: Files holding a literal of some rule.
+        files_skipped: Files skipped because they hold no literal.
+        lines_scanned: Lines holding a literal of some rule.
+        lines_skipped: Lines skipped because they hold no literal.
+        rule_hits: Number of lines holding a literal, per rule.
+        rule_skips: Number of lines without a literal, per rule.
+    """
+
+    def __init__(self) -> None:
+        """Start with all counters at zero.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.files_scanned = 0
+        self.files_skipped = 0
+        self.lines_scanned = 0
+        self.lines_skipped = 0
+        self.rule_hits = dict.fromkeys(PATTERNS, 0)
+        self.rule_skips = dict.fromkeys(PATTERNS, 0)
+
+    def record(self, line_count: int, candidates: dict[int, set]) -> None:
+        """Count the outcome of the prefilter for one file.
+
+        Args:
+            line_count: Number of lines in the file.
+            candidates: The rules with a literal on each line, by line.
+
+        Returns:
+            None
+        """
+        if candidates:
+            self.files_scanned += 1
+        else:
+            self.files_skipped += 1
+        self.lines_scanned += len(candidates)
+        self.lines_skipped += line_count - len(candidates)
+
+        hits = dict.fromkeys(PATTERNS, 0)
+        for rules in candidates.values():
+            for name in rules:
+                hits[name] += 1
+        for name, count in hits.items():
+            self.rule_hits[name] += count
+            self.rule_skips[name] += line_count - count
+
+    def merge(self, other: "PrefilterStats") -> None:
+        """Add the counters of another instance to this one.
+
+        Args:
+            other: The counters to add.
+
+        Returns:
+            None
+        """
+        self.files_scanned += other.files_scanned
+        self.files_skipped += other.files_skipped
+        self.lines_scanned += other.lines_scanned
+        self.lines_skipped += other.lines_skipped
+        for name in PATTERNS:
+            self.rule_hits[name] += other.rule_hits[name]
+            self.rule_skips[name] += other.rule_skips[name]
+
+    def format(self) -> str:
+        """Format the counters as a table.
+
+        Args:
+            None
+
+        Returns:
+            str: The formatted counters.
+        """
+        files = self.files_scanned + self.files_skipped
+        lines = self.lines_scanned + self.lines_skipped
+        output_lines = [
+            f"Prefilter: scanned {self.files_scanned} of {files} files "
+            f"and {self.lines_scanned} of {lines} lines",
+            f"{'Rule':<28}{'Lines hit':>12}{'Lines skipped':>16}",
+        ]
+        for name in PATTERNS:
+            output_lines.append(
+                f"{name:<28}{self.rule_hits[name]:>12}"
+                f"{self.rule_skips[name]:>16}"
+            )
+        return "\n".join(output_lines)
+
+
+class ScanProfile:
+    """Record where the time of a scan goes.
+
+    Times are measured with time.perf_counter. When files are scanned in
+    several processes, the phase, rule and file times are the sum over all
+    processes and may add up to more than the wall time of the scan.
+    Timing every rule on its own matches the rules a second time. That
+    time is kept in rule_timing_seconds and left out of the phases and
+    the file times, but not out of the wall time.
+
+    Attributes:
+        wall_seconds: Wall time of the whole run.
+        phases: Seconds spent in each phase: reading files, the literal
+            prefilter, the analysis of the files that pass it, matching
+            the rules and reporting the violations.
+        rule_seconds: Seconds spent matching each rule on its own over the
+            same code as the scan.
+        rule_timing_seconds: Seconds spent timing the rules on their own,
+            which a scan without a profile does not spend.
+        rule_matches: Matches of each rule, before the context checks.
+        rule_violations: Violations reported for each rule.
+        files: Seconds, size in bytes and number of violations of each
+            file, by path.
+    """
+
+    PHASES = ("read", "prefilter", "lex", "match", "report")
+
+    def __init__(self) -> None:
+        """Start with all times and counters at zero.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.wall_seconds = 0.0
+        self.phases = dict.fromkeys(self.PHASES, 0.0)
+        self.rule_seconds = dict.fromkeys(PATTERNS, 0.0)
+        self.rule_timing_seconds = 0.0
+        self.rule_matches = dict.fromkeys(PATTERNS, 0)
+        self.rule_violations = dict.fromkeys(PATTERNS, 0)
+        self.files = {}
+
+    def record_file(
+        self, file_path: str, seconds: float, size: int, violations: int
+    ) -> None:
+        """Record the cost of scanning one file.
+
+        Args:
+            file_path: Path to the file.
+            seconds: Time spent reading and checking the file.
+            size: Size of the file in bytes.
+            violations: Number of violations found in the file.
+
+        Returns:
+            None
+        """
+        self.files[file_path] = {
+            "seconds": seconds,
+            "bytes": size,
+            "violations": violations,
+        }
+
+    def record_rules(
+        self,
+        rule_patterns: dict,
+        content: str | bytes,
+        segments: list[tuple[int, int]],
+    ) -> None:
+        """Time every rule on its own over the code that was scanned.
+
+        The scan matches all rules in a single pass, so the time of each
+        rule is measured by matching it separately over the same code. The
+        time this takes is added to rule_timing_seconds by the caller.
+
+        Args:
+            rule_patterns: The compiled pattern of each rule.
+            content: The content of the file.
+            segments: The (start, end) offsets of the code scanned.
+
+        Returns:
+            None
+        """
+        for name, pattern in rule_patterns.items():
+            started = time.perf_counter()
+            matches = 0
+            for start, end in segments:
+                for _ in pattern.finditer(content, start, end):
+                    matches += 1
+            self.rule_seconds[name] += time.perf_counter() - started
+            self.rule_matches[name] += matches
+
+    def merge(self, other: "ScanProfile") -> None:
+        """Add the times and counters of another instance to this one.
+
+        Args:
+            other: The profile to add.
+
+        Returns:
+            None
+        """
+        for phase in self.PHASES:
+            self.phases[phase] += other.phases[phase]
+        self.rule_timing_seconds += other.rule_timing_seconds
+        for name in PATTERNS:
+            self.rule_seconds[name] += other.rule_seconds[name]
+            self.rule_matches[name] += other.rule_matches[name]
+            self.rule_violations[name] += other.rule_violations[name]
+        self.files.update(other.files)
+
+    def to_json(self) -> dict:
+        """Return the profile as a JSON-serializable report.
+
+        Args:
+            None
+
+        Returns:
+            dict: The report, with rules and files sorted slowest first.
+        """
+        return {
+            "wall_seconds": self.wall_seconds,
+            "files_scanned": len(self.files),
+            "bytes_scanned": sum(
+                entry["bytes"] for entry in self.files.values()
+            ),
+            "phases": dict(self.phases),
+            "rule_timing_seconds": self.rule_timing_seconds,
+            "rules": [
+                {
+                    "rule": name,
+                    "seconds": self.rule_seconds[name],
+                    "matches": self.rule_matches[name],
+                    "violations": self.rule_violations[name],
+                }
+                for name in sorted(
+                    PATTERNS, key=lambda name: -self.rule_seconds[name]
+                )
+            ],
+            "files": [
+                {"path": path, **entry}
+                for path, entry in sorted(
+                    self.files.items(), key=lambda item: -item[1]["seconds"]
+                )
+            ],
+        }
+
+    def format(self, limit: int = 10) -> str:
+        """Format the profile as tables sorted slowest first.
+
+        Args:
+            limit: Number of files to list.
+
+        Returns:
+            str: The formatted profile.
+        """
+        report = self.to_json()
+        output_lines = [
+            f"Profile: {report['files_scanned']} files, "
+            f"{report['bytes_scanned']} bytes in "
+            f"{self.wall_seconds:.3f}s, "
+            f"{self.rule_timing_seconds:.3f}s timing the rules",
+            f"{'Phase':<28}{'Seconds':>12}",
+        ]
+        for phase, seconds in self.phases.items():
+            output_lines.append(f"{phase:<28}{seconds:>12.4f}")
+        output_lines.append(
+            f"{'Rule':<28}{'Seconds':>12}{'Matches':>12}{'Violations':>12}"
+        )
+        for entry in report["rules"]:
+            output_lines.append(
+                f"{entry['rule']:<28}{entry['seconds']:>12.4f}"
+                f"{entry['matches']:>12}{entry['violations']:>12}"
+            )
+        output_lines.append(
+            f"{'Seconds':>12}{'Bytes':>12}{'Violations':>12}  Slowest files"
+        )
+        for entry in report["files"][:limit]:
+            output_lines.append(
+                f"{entry['seconds']:>12.4f}{entry['bytes']:>12}"
+                f"{entry['violations']:>12}  {entry['path']}"
+            )
+        return "\n".join(output_lines)
+
+
+def check_embedded_styles(
+    content: str | bytes,
+    file_path: str,
+    stats: PrefilterStats | None = None,
+    profile: ScanProfile | None = None,
+) -> list[DetailedViolation]:
+    """Check for embedded CSS and style violations in the content.
+
+    See locate_embedded_styles for how the content is scanned.
+
+    Args:
+        content: The content of the file to check, as text or as UTF-8
+            encoded bytes.
+        file_path: Path to the file being checked.
+        stats: Optional counters updated with the work the prefilter saved.
+        profile: Optional profile updated with the time spent in each
+            phase and on each rule.
+
+    Returns:
+        list: A list of DetailedViolation objects found.
+    """
+    return [
+        located.violation
+        for located in locate_embedded_styles(
+            content, file_path, stats, profile
+        )
+    ]
+
+
+def locate_embedded_styles(
+    content: str | bytes,
+    file_path: str,
+    stats: PrefilterStats | None = None,
+    profile: ScanProfile | None = None,
+) -> list[LocatedViolation]:
+    """Find embedded CSS and style violations and where they are.
+
+    A literal prefilter first finds the lines holding a string that some
+    rule needs, such as ``#``, ``style`` or ``12px``. Files without any are
+    rejected at once. Otherwise the file is analyzed once, up to the last
+    of those lines, and all rules are matched in a single pass over the
+    code of those lines only. The analysis tells in constant time whether
+    a match is inside a style definition, such as a ``style={{}}`` or
+    ``sx`` object or an object assigned to a style-named variable, or
+    inside a URL. Property names and sizes are only reported inside style
+    definitions, and nothing is reported inside URLs.
+
+    The content may also be given as UTF-8 encoded bytes, for example a
+    memory-mapped file. The bytes are then scanned as they are and only the
+    reported snippets and the lines they need as context are decoded. The
+    violations found are the same either way.
+
+    Args:
+        content: The content of the file to check, as text or as UTF-8
+            encoded bytes.
+        file_path: Path to the file being checked.
+        stats: Optional counters updated with the work the prefilter saved.
+        profile: Optional profile updated with the time spent in each
+            phase and on each rule.
+
+    Returns:
+        list: A LocatedViolation for each violation found, with the
+        offsets of its snippet in the content. Offsets are in bytes when
+        the content is bytes.
+    """
+    syntax = _syntax_for(content)
+    started = time.perf_counter()
+
+    hits = list(syntax.prefilter.finditer(content))
+    if not hits:
+        if stats is not None:
+            line_count = LineIndex(content, syntax.line_break).line_count
+            stats.record(line_count, {})
+        if profile is not None:
+            profile.phases["prefilter"] += time.perf_counter() - started
+        return []
+
+    lines = LineIndex(content, syntax.line_break)
+
+    # The rules that can match on each line holding a literal
+    candidates = {}
+    for line_index, hit in zip(
+        lines.lines_of([hit.start() for hit in hits]), hits
+    ):
+        candidates.setdefault(line_index, set()).update(
+            syntax.literal_rules[hit.group(0)]
+        )
+    if stats is not None:
+        stats.record(lines.line_count, candidates)
+    prefiltered = time.perf_counter()
+
+    context = analyze_source(
+        content,
+        file_path.endswith((".tsx", ".jsx")),
+        lines.end(max(candidates)),
+    )
+    mask = context.mask
+    analyzed = time.perf_counter()
+
+    found = []
+    scanned = []
+    for line_index in candidates:
+        line_start = lines.start(line_index)
+        line_end = lines.end(line_index)
+
+        # Skip import statements
+        match = syntax.import_statement.search(content, line_start, line_end)
+        if match and not _decode(content[line_start : match.start()]).strip():
+            continue
+
+        for segment_start, segment_end in _line_segments(
+            context.spans, line_start, line_end
+        ):
+            if profile is not None:
+                scanned.append((segment_start, segment_end))
+            for match in syntax.rules.finditer(
+                content, segment_start, segment_end
+            ):
+                violation_type = match.lastgroup
+                start, end = match.span(violation_type)
+                # URLs are not style violations
+                if mask[start] & _URL:
+                    continue
+                # Property names and sizes only count in style definitions,
+                # or when set on a style object as in ``style.fontSize =``
+                if violation_type == "camelcase_css_property":
+                    if not mask[start] & _STYLE_OBJECT and not (
+                        content[end - 1 : end] in ("=", b"=")
+                        and syntax.style_member.search(
+                            content, max(0, start - 16), start
+                        )
+                    ):
+                        continue
+                if violation_type == "pixel_value":
+                    if not mask[start] & _STYLE_OBJECT:
+                        continue
+
+                found.append(
+                    (
+                        line_index,
+                        _RULE_ORDER[violation_type],
+                        LocatedViolation(
+                            start,
+                            end,
+                            DetailedViolation(
+                                file_path=file_path,
+                                line_number=line_index + 1,
+                                violation_type=violation_type,
+                                code_snippet=_decode(content[start:end]),
+                                description=PATTERNS[violation_type][
+                                    "description"
+                                ],
+                            ),
+                        ),
+                    )
+                )
+
+    # Report violations on a line in rule order, as the rules are listed
+    found.sort(key=lambda item: (*item[:2], item[2].start))
+
+    if profile is not None:
+        profile.phases["prefilter"] += prefiltered - started
+        profile.phases["lex"] += analyzed - prefiltered
+        profile.phases["match"] += time.perf_counter() - analyzed
+        for item in found:
+            profile.rule_violations[item[2].violation.violation_type] += 1
+        timed = time.perf_counter()
+        profile.record_rules(syntax.rule_patterns, content, scanned)
+        profile.rule_timing_seconds += time.perf_counter() - timed
+    return [item[2] for item in found]
+
+
+class ViolationStore(Sequence):
+    """Compact, append-only store of the violations of a scan.
+
+    A violation takes four array slots instead of a tuple and its strings:
+    the ids of its file path, its rule and its snippet, and its line number.
+    File paths and snippets are interned in tables, and the rule id indexes
+    a table of rule names and descriptions, so a description is stored
+    once per store and looked up when a violation is read. Reading a
+    violation returns a DetailedViolation view, so the store can be used
+    wherever a list of violations is expected.
+    """
+
+    __slots__ = (
+        "_file_ids",
+        "_line_numbers",
+        "_rule_ids",
+        "_snippet_ids",
+        "_paths",
+        "_path_index",
+        "_rules",
+        "_rule_index",
+        "_snippets",
+        "_snippet_index",
+    )
+
+    def __init__(self, violations: Iterable[DetailedViolation] = ()) -> None:
+        """Create a store holding the given violations.
+
+        Args:
+            violations: The violations to store first.
+
+        Returns:
+            None
+        """
+        self._file_ids = array("I")
+        self._line_numbers = array("I")
+        self._rule_ids = array("H")
+        self._snippet_ids = array("I")
+        self._paths = []
+        self._path_index = {}
+        # Rules of the pattern table come first, in reporting order
+        self._rules = [
+            (name, info["description"]) for name, info in PATTERNS.items()
+        ]
+        self._rule_index = {
+            rule: index for index, rule in enumerate(self._rules)
+        }
+        self._snippets = []
+        self._snippet_index = {}
+        self.extend(violations)
+
+    @staticmethod
+    def _intern(value, table: list, index: dict) -> int:
+        """Return the id of a value, adding it to its table if needed.
+
+        Args:
+            value: The value.
+            table: The values, by id.
+            index: The id of each value in the table.
+
+        Returns:
+            int: The id.
+        """
+        value_id = index.get(value)
+        if value_id is None:
+            value_id = index[value] = len(table)
+            table.append(value)
+        return value_id
+
+    def append(self, violation: DetailedViolation) -> None:
+        """Add a violation to the store.
+
+        Args:
+            violation: The violation.
+
+        Returns:
+            None
+        """
+        self._file_ids.append(
+            self._intern(violation.file_path, self._paths, self._path_index)
+        )
+        self._line_numbers.append(violation.line_number)
+        self._rule_ids.append(
+            self._intern(
+                (violation.violation_type, violation.description),
+                self._rules,
+                self._rule_index,
+            )
+        )
+        self._snippet_ids.append(
+            self._intern(
+                violation.code_snippet, self._snippets, self._snippet_index
+            )
+        )
+
+    def extend(self, violations: Iterable[DetailedViolation]) -> None:
+        """Add violations to the store.
+
+        Args:
+            violations: The violations, in order.
+
+        Returns:
+            None
+        """
+        for violation in violations:
+            self.append(violation)
+
+    def _view(self, index: int) -> DetailedViolation:
+        """Build the view of a stored violation.
+
+        Args:
+            index: Position of the violation, which must be in range.
+
+        Returns:
+            DetailedViolation: The violation.
+        """
+        violation_type, description = self._rules[self._rule_ids[index]]
+        return DetailedViolation(
+            self._paths[self._file_ids[index]],
+            self._line_numbers[index],
+            violation_type,
+            self._snippets[self._snippet_ids[index]],
+            description,
+        )
+
+    def __len__(self) -> int:
+        """Return the number of stored violations.
+
+        Args:
+            None
+
+        Returns:
+            int: The number of violations.
+        """
+        return len(self._line_numbers)
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> DetailedViolation | list[DetailedViolation]:
+        """Return a violation, or a list of them for a slice.
+
+        Args:
+            index: Position of the violation, or a slice of positions.
+
+        Returns:
+            DetailedViolation | list: The violation or violations.
+
+        Raises:
+            IndexError: If the position is out of range.
+        """
+        if isinstance(index, slice):
+            return [
+                self._view(position) for position in range(len(self))[index]
+            ]
+        return self._view(range(len(self))[index])
+
+    def __iter__(self) -> Iterator[DetailedViolation]:
+        """Iterate over the violations in the order they were added.
+
+        Args:
+            None
+
+        Yields:
+            DetailedViolation: Each violation.
+        """
+        for index in range(len(self)):
+            yield self._view(index)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the violations with those of another sequence.
+
+        Args:
+            other: A store, list or tuple of violations.
+
+        Returns:
+            bool: True if both hold the same violations in the same order.
+        """
+        if not isinstance(other, (ViolationStore, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            mine == theirs for mine, theirs in zip(self, other)
+        )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """Return a representation listing the violations.
+
+        Args:
+            None
+
+        Returns:
+            str: The representation.
+        """
+        return f"ViolationStore({list(self)!r})"
+
+    def by_file(self) -> Iterator[tuple[str, list[DetailedViolation]]]:
+        """Group the violations by file, in report order.
+
+        Args:
+            None
+
+        Yields:
+            tuple: The path of each file, in sorted order, and its
+            violations sorted by line number, in the order they were added
+            within a line.
+        """
+        paths = self._paths
+        order = sorted(
+            range(len(self)),
+            key=lambda index: (
+                paths[self._file_ids[index]],
+                self._line_numbers[index],
+            ),
+        )
+        for file_id, indexes in groupby(
+            order, key=lambda index: self._file_ids[index]
+        ):
+            yield paths[file_id], [self._view(index) for index in indexes]
+
+
+def _ruleset_hash() -> str:
+    """Hash the rule table together with the code that applies it.
+
+    The code includes the modules that find the files and resolve the
+    lines of matches, since results depend on them as well.
+
+    Args:
+        None
+
+    Returns:
+        str: A hex digest that changes whenever scan results could change.
+    """
+    digest = hashlib.sha256(
+        json.dumps(PATTERNS, sort_keys=True).encode("utf-8")
+    )
+    for path in (
+        __file__,
+        file_discovery.__file__,
+        sys.modules[LineIndex.__module__].__file__,
+    ):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """On-disk cache of scan results keyed by file content.
+
+    Each entry stores the violations of one file content, keyed by the hash
+    of that content and of the rule set, so renamed or reverted files are
+    hits as well. Entries are spread over subdirectories named after the
+    first two characters of the key. The directory can be saved and
+    restored between CI runs as is.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            directory: Directory holding the cache entries.
+            max_bytes: Total entry size above which old entries are evicted.
+
+        Returns:
+            None
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ruleset = _ruleset_hash()
+
+    def key(self, data: bytes) -> str:
+        """Compute the cache key of a file content.
+
+        Args:
+            data: The raw content of the file.
+
+        Returns:
+            str: The cache key.
+        """
+        digest = hashlib.sha256(self.ruleset.encode("ascii"))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        """Return the path of the entry for a key.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            str: Path of the entry file.
+        """
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str, file_path: str) -> list | None:
+        """Load the violations stored for a key.
+
+        Args:
+            key: The cache key.
+            file_path: Path of the file the violations are reported for.
+
+        Returns:
+            list: The cached violations, or None if there is no valid entry.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, encoding="utf-8") as f:
+                records = json.load(f)
+            # Refresh the entry so that eviction removes the least recent
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            return [
+                DetailedViolation(
+                    file_path=file_path,
+                    line_number=line_number,
+                    violation_type=violation_type,
+                    code_snippet=code_snippet,
+                    description=PATTERNS[violation_type]["description"],
+                )
+                for line_number, violation_type, code_snippet in records
+            ]
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def put(self, key: str, violations: list[DetailedViolation]) -> None:
+        """Store the violations found for a key.
+
+        Args:
+            key: The cache key.
+            violations: The violations found in the file.
+
+        Returns:
+            None
+        """
+        entry_path = self._entry_path(key)
+        records = [
+            [v.line_number, v.violation_type, v.code_snippet]
+            for v in violations
+        ]
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            temp_path = f"{entry_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(records, f, separators=(",", ":"))
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            print(f"Warning: Failed to write cache: {e}", file=sys.stderr)
+
+    def evict(self) -> None:
+        """Remove the least recently used entries above the size limit.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        entries = []
+        total = 0
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+def _map_file(file: BinaryIO) -> mmap.mmap | bytes:
+    """Memory-map an open file, checking that it is valid UTF-8.
+
+    Only the runs of non-ASCII bytes are decoded for the check, so files
+    that are mostly ASCII are never copied into memory as a whole.
+
+    Args:
+        file: The file, opened in binary mode.
+
+    Returns:
+        mmap.mmap | bytes: A read-only mapping of the file, or empty bytes
+        for an empty file, which cannot be mapped.
+
+    Raises:
+        UnicodeDecodeError: If the file is not valid UTF-8.
+    """
+    if not os.fstat(file.fileno()).st_size:
+        return b""
+    data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        for run in _NON_ASCII.finditer(data):
+            try:
+                run.group(0).decode("utf-8")
+            except UnicodeDecodeError:
+                # Raise the same error as decoding the whole file would
+                str(data, "utf-8")
+    except UnicodeDecodeError:
+        data.close()
+        raise
+    return data
+
+
+def process_typescript_file(
+    file_path: str,
+    all_violations: list[DetailedViolation] | ViolationStore,
+    cache: ResultCache | None = None,
+    memory_map: bool = False,
+    stats: PrefilterStats | None = None,
+    profile: ScanProfile | None = None,
+) -> None:
+    """Process a TypeScript file for CSS violations.
+
+    Args:
+        file_path: Path to the TypeScript file to process.
+        all_violations: List or ViolationStore receiving the violations
+            found.
+        cache: Optional result cache. Files whose content is in the cache
+            are not scanned again.
+        memory_map: Whether to scan a memory map of the file instead of
+            reading and decoding it as a whole.
+        stats: Optional prefilter counters, updated unless the result
+            comes from the cache.
+        profile: Optional profile updated with the time spent on the file,
+            not counting the time spent timing the rules on their own.
+
+    Returns:
+        None: This function adds to the provided list or store.
+    """
+    started = time.perf_counter()
+    rule_timing = profile.rule_timing_seconds if profile is not None else 0
+    try:
+        with open(file_path, "rb") as f:
+            data = _map_file(f) if memory_map else f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading file {file_path}: {e}", file=sys.stderr)
+        return
+    # Unmap the file once it is scanned rather than when it is collected
+    with data if isinstance(data, mmap.mmap) else nullcontext(data):
+        size = len(data)
+        try:
+            if cache is not None:
+                key = cache.key(data)
+                violations = cache.get(key, file_path)
+            if cache is None or violations is None:
+                content = data if memory_map else data.decode("utf-8")
+        except UnicodeDecodeError as e:
+            print(f"Error reading file {file_path}: {e}", file=sys.stderr)
+            return
+        if profile is not None:
+            profile.phases["read"] += time.perf_counter() - started
+
+        if cache is None or violations is None:
+            # Check for embedded styles
+            violations = check_embedded_styles(
+                content, file_path, stats, profile
+            )
+            if cache is not None:
+                cache.put(key, violations)
+            del content
+    all_violations.extend(violations)
+    if profile is not None:
+        rule_timing = profile.rule_timing_seconds - rule_timing
+        profile.record_file(
+            file_path,
+            time.perf_counter() - started - rule_timing,
+            size,
+            len(violations),
+        )
+
+
+def _scan_file(
+    file_path: str,
+    cache: ResultCache | None = None,
+    memory_map: bool = False,
+    stats: PrefilterStats | None = None,
+    profile: ScanProfile | None = None,
+) -> tuple[ViolationStore, PrefilterStats | None, ScanProfile | None]:
+    """Scan a single TypeScript file for CSS violations.
+
+    Args:
+        file_path: Path to the TypeScript file to scan.
+        cache: Optional result cache.
+        memory_map: Whether to scan a memory map of the file.
+        stats: Optional prefilter counters to update.
+        profile: Optional profile to update.
+
+    Returns:
+        tuple: The violations found in the file, the updated counters and
+        the updated profile, which are copies when the file is scanned in
+        a worker process.
+    """
+    # Workers send the store back in a few arrays and tables rather than a
+    # tuple per violation with its own copy of the description
+    violations = ViolationStore()
+    process_typescript_file(
+        file_path, violations, cache, memory_map, stats, profile
+    )
+    return violations, stats, profile
+
+
+def _file_size(file_path: str) -> int:
+    """Return the size of a file, or zero if it cannot be read.
+
+    Args:
+        file_path: Path to the file.
+
+    Returns:
+        int: The size of the file in bytes.
+    """
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+# Node below which no path is excluded. Never modified.
+_EMPTY_TRIE = {}
+
+# Suffixes of the files checked for embedded styles
+STYLED_SUFFIXES = (".ts", ".tsx")
+
+# Fewest files worth starting a worker process for. Scanning a file takes
+# about a millisecond, while starting a worker takes tens of milliseconds,
+# so pre-commit and --since runs touching a few files stay serial.
+_FILES_PER_JOB = 32
+
+
+def _is_checked_file(file_name: str) -> bool:
+    """Check whether a file name is a non-test TypeScript source file.
+
+    Args:
+        file_name: Base name of the file.
+
+    Returns:
+        bool: True if the file must be checked.
+    """
+    return file_name.endswith(STYLED_SUFFIXES) and not any(
+        pattern in file_name for pattern in [".test.", ".spec."]
+    )
+
+
+def _build_path_trie(paths: set) -> dict | None:
+    """Build a prefix trie over the components of absolute paths.
+
+    Every node maps a path component to the node below it. A component
+    mapped to None is one of the given paths, so everything below it is
+    covered.
+
+    Args:
+        paths: Absolute paths to store in the trie.
+
+    Returns:
+        trie: The root node, or None if a root directory is in paths.
+    """
+    trie = {}
+    for path in paths:
+        parts = [part for part in path.split(os.sep) if part]
+        if not parts:
+            return None
+        node = trie
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+            if node is None:
+                # An ancestor directory is already covered
+                break
+        else:
+            node[parts[-1]] = None
+    return trie
+
+
+def _trie_node(trie: dict | None, path: str) -> dict | None:
+    """Find the trie node of an absolute path.
+
+    Args:
+        trie: Root node of a trie built by _build_path_trie.
+        path: Absolute path to look up.
+
+    Returns:
+        node: The node of path, or None if path is covered by the trie.
+    """
+    node = trie
+    for part in path.split(os.sep):
+        if node is None:
+            break
+        if part:
+            node = node.get(part, _EMPTY_TRIE)
+    return node
+
+
+def _is_inside(path: str, directories: set) -> bool:
+    """Check whether a path is inside or equal to one of the directories.
+
+    Args:
+        path: Absolute, normalized path to check.
+        directories: Absolute, normalized directory paths.
+
+    Returns:
+        bool: True if path or one of its ancestors is in directories.
+    """
+    while path not in directories:
+        parent = os.path.dirname(path)
+        if parent == path:
+            return False
+        path = parent
+    return True
+
+
+def _discover_files(
+    directories: list,
+    files: list,
+    exclude_files: set,
+    exclude_directories: set,
+) -> list[str]:
+    """Collect the TypeScript files to check, in scan order.
+
+    Directories are listed through file_discovery, so files that git
+    ignores are skipped. Test directories and excluded directories are
+    left out.
+
+    Args:
+        directories: List of directories to scan for TypeScript files.
+        files: List of specific files to check.
+        exclude_files: Absolute paths of files to exclude.
+        exclude_directories: Absolute paths of directories to exclude.
+
+    Returns:
+        file_paths: Absolute paths of the files to check.
+    """
+    file_paths = []
+    seen = set()
+    exclusions = _build_path_trie(exclude_directories)
+
+    # Drop directories that sit inside another directory being scanned
+    roots = set()
+    for directory in sorted(
+        set(os.path.abspath(directory) for directory in directories),
+        key=len,
+    ):
+        if not _is_inside(directory, roots):
+            roots.add(directory)
+
+    matches = file_discovery.compile_filter(STYLED_SUFFIXES)
+    for directory in sorted(roots):
+        if (
+            _trie_node(exclusions, directory) is None
+            or os.path.basename(directory) in file_discovery.TEST_DIRECTORIES
+        ):
+            continue
+        for file_path in file_discovery.discover_files(
+            directory,
+            matches,
+            exclude_directories,
+            file_discovery.TEST_DIRECTORIES,
+        ):
+            if file_path not in exclude_files:
+                seen.add(file_path)
+                file_paths.append(file_path)
+
+    # Process individual files explicitly listed
+    for file_path in files:
+        file_path = os.path.abspath(file_path)
+        if (
+            file_path not in seen
+            and file_path not in exclude_files
+            and _is_checked_file(os.path.basename(file_path))
+        ):
+            seen.add(file_path)
+            file_paths.append(file_path)
+
+    return file_paths
+
+
+def _scan_in_parallel(
+    file_paths: list[str],
+    jobs: int,
+    cache: ResultCache | None = None,
+    memory_map: bool = False,
+    collect_stats: bool = False,
+    collect_profile: bool = False,
+) -> Iterator[
+    tuple[list[DetailedViolation], PrefilterStats | None, ScanProfile | None]
+]:
+    """Scan files across a pool of worker processes.
+
+    The largest files are handed out first so that a few big files do not
+    end up running alone at the end of the scan. Results are yielded in
+    the order of file_paths regardless of the order they complete in, as
+    soon as all earlier files are done. Closing the generator early cancels
+    the files that have not started yet.
+
+    Args:
+        file_paths: Paths of the files to scan.
+        jobs: Number of worker processes to use.
+        cache: Optional result cache shared by the workers.
+        memory_map: Whether to scan memory maps of the files.
+        collect_stats: Whether to count the work saved by the prefilter.
+        collect_profile: Whether to profile the scan of every file.
+
+    Yields:
+        tuple: The violations of each file, its prefilter counters and its
+        profile, in the order of file_paths.
+    """
+    schedule = sorted(
+        range(len(file_paths)),
+        key=lambda index: _file_size(file_paths[index]),
+        reverse=True,
+    )
+    futures = [None] * len(file_paths)
+
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        for index in schedule:
+            futures[index] = executor.submit(
+                _scan_file,
+                file_paths[index],
+                cache,
+                memory_map,
+                PrefilterStats() if collect_stats else None,
+                ScanProfile() if collect_profile else None,
+            )
+        for future in futures:
+            yield future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def iter_file_violations(
+    directories: list,
+    files: list,
+    exclude_files: list,
+    exclude_directories: list,
+    jobs: int = 1,
+    cache: ResultCache | None = None,
+    memory_map: bool = False,
+    stats: PrefilterStats | None = None,
+    profile: ScanProfile | None = None,
+) -> Iterator[tuple[str, list[DetailedViolation]]]:
+    """Discover, read and scan files, yielding results as they are ready.
+
+    Files are yielded in sorted path order, the order in which they appear
+    in the report, so results can be printed while later files are still
+    being scanned. Stopping the iteration stops the scan.
+
+    Args:
+        directories: List of directories to scan for TypeScript files.
+        files: List of specific files to check.
+        exclude_files: List of file paths to exclude from the scan.
+        exclude_directories: List of directories to exclude from the scan.
+        jobs: Most worker processes used to scan the files. Fewer are
+            started when there are too few files to keep them busy, and
+            small scans run in this process.
+        cache: Optional result cache used to skip unchanged files.
+        memory_map: Whether to scan memory maps of the files instead of
+            reading and decoding them as a whole.
+        stats: Optional counters updated with the work the prefilter saved
+            on the files scanned so far.
+        profile: Optional profile updated with the cost of the files
+            scanned so far.
+
+    Yields:
+        tuple: The path of each file and the violations found in it, as a
+        ViolationStore.
+    """
+    exclude_files = set(os.path.abspath(file) for file in exclude_files)
+    exclude_directories = set(
+        os.path.abspath(dir) for dir in exclude_directories
+    )
+
+    file_paths = sorted(
+        _discover_files(directories, files, exclude_files, exclude_directories)
+    )
+
+    jobs = min(jobs, len(file_paths) // _FILES_PER_JOB)
+    if jobs > 1:
+        scanned = _scan_in_parallel(
+            file_paths,
+            jobs,
+            cache,
+            memory_map,
+            stats is not None,
+            profile is not None,
+        )
+    else:
+        scanned = (
+            _scan_file(
+                file_path,
+                cache,
+                memory_map,
+                PrefilterStats() if stats is not None else None,
+                ScanProfile() if profile is not None else None,
+            )
+            for file_path in file_paths
+        )
+
+    try:
+        for file_path, (violations, file_stats, file_profile) in zip(
+            file_paths, scanned
+        ):
+            if stats is not None:
+                stats.merge(file_stats)
+            if profile is not None:
+                profile.merge(file_profile)
+            yield file_path, violations
+    finally:
+        scanned.close()
+        if cache is not None:
+            cache.evict()
+
+
+def check_files(
+    directories: list,
+    files: list,
+    exclude_files: list,
+    exclude_directories: list,
+    jobs: int = 1,
+    cache: ResultCache | None = None,
+    memory_map: bool = False,
+) -> CSSCheckResult:
+    """Scan directories and specific files for TS files and their violations.
+
+    Args:
+        directories: List of directories to scan for TypeScript files.
+        files: List of specific files to check.
+        exclude_files: List of file paths to exclude from the scan.
+        exclude_directories: List of directories to exclude from the scan.
+        jobs: Number of worker processes used to scan the files. The
+            violations are the same, in the same order, for any value.
+        cache: Optional result cache used to skip unchanged files.
+        memory_map: Whether to scan memory maps of the files. The
+            violations are the same either way.
+
+    Returns:
+        CSSCheckResult: A result object containing violations found.
+    """
+    all_violations = []
+    for _, violations in iter_file_violations(
+        directories,
+        files,
+        exclude_files,
+        exclude_directories,
+        jobs,
+        cache,
+        memory_map,
+    ):
+        all_violations.extend(violations)
+
+    return CSSCheckResult(violations=all_violations)
+
+
+def validate_directories_input(input_directories: list[str]) -> list[str]:
+    """Validate that the --directories input is correctly formatted.
+
+    Files, directories and glob patterns may be mixed. Each input is only
+    expanded as far as requested: a file stays a single file rather than
+    becoming its parent directory, and a glob pattern (``**`` matches any
+    depth) becomes the paths it matches. Duplicate paths are removed.
+
+    Args:
+        input_directories: A list of file paths, directory paths or glob
+            patterns to validate.
+
+    Returns:
+        validated_paths: A list containing the validated file and directory
+        paths, in input order.
+
+    Raises:
+        ValueError: If a path is neither a valid file nor a directory, or if
+            a glob pattern matches nothing.
+    """
+    validated_paths = []
+    seen = set()
+    for path in input_directories:
+        if glob.has_magic(path):
+            matches = sorted(glob.glob(path, recursive=True))
+            if not matches:
+                raise ValueError(
+                    f"Invalid pattern: {path}. It does not match any path."
+                )
+        elif os.path.isdir(path) or os.path.isfile(path):
+            matches = [path]
+        else:
+            raise ValueError(
+                f"Invalid path: {path}. Must be an existing file or directory."
+            )
+
+        for match in matches:
+            key = os.path.abspath(match)
+            if key not in seen:
+                seen.add(key)
+                validated_paths.append(match)
+    return validated_paths
+
+
+def _unquote_git_path(path: str) -> str:
+    """Undo the C-style quoting git applies to unusual path names.
+
+    Args:
+        path: A path as printed by git.
+
+    Returns:
+        str: The path name.
+    """
+    if not (path.startswith('"') and path.endswith('"')):
+        return path
+    raw = codecs.escape_decode(path[1:-1].encode("utf-8"))[0]
+    return raw.decode("utf-8", errors="surrogateescape")
+
+
+def get_changed_lines(since: str) -> dict[str, list[tuple[int, int]]]:
+    """Find the lines changed since a git reference.
+
+    Runs a single ``git diff`` between the merge base of the reference and
+    the working tree, and collects the line ranges of every added or
+    modified hunk. The destination prefix is set explicitly so that a
+    ``diff.noprefix`` or ``diff.dstPrefix`` setting does not change the
+    paths.
+
+    Args:
+        since: The git reference to compare against, such as origin/main.
+
+    Returns:
+        changed_lines: A mapping of absolute file paths to sorted, inclusive
+        (first, last) line ranges that were changed.
+
+    Raises:
+        ValueError: If git is unavailable or the reference is unknown.
+    """
+    command = [
+        "git",
+        "diff",
+        "--unified=0",
+        "--no-color",
+        "--no-ext-diff",
+        "--src-prefix=a/",
+        "--dst-prefix=b/",
+        "--relative",
+        "--diff-filter=ACMRT",
+        "--merge-base",
+        since,
+        "--",
+    ]
+    try:
+        diff = subprocess.run(
+            command,
+            capture_output=True,
+            encoding="utf-8",
+            errors="surrogateescape",
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        details = getattr(e, "stderr", "") or str(e)
+        raise ValueError(
+            f"Could not diff against {since}: {details.strip()}"
+        ) from e
+
+    changed_lines = {}
+    ranges = None
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            # git ends the header with a tab when the path holds a space
+            path = _unquote_git_path(line[4:].removesuffix("\t"))
+            if path == "/dev/null":
+                ranges = None
+                continue
+            # Strip the "b/" destination prefix
+            path = os.path.abspath(path[2:])
+            ranges = changed_lines.setdefault(path, [])
+        elif line.startswith("@@") and ranges is not None:
+            hunk = _DIFF_HUNK.match(line)
+            if hunk is None:
+                continue
+            first = int(hunk.group(1))
+            count = 1 if hunk.group(2) is None else int(hunk.group(2))
+            if count:
+                ranges.append((first, first + count - 1))
+
+    for ranges in changed_lines.values():
+        ranges.sort()
+    return changed_lines
+
+
+def filter_changed_lines(
+    violations: list[DetailedViolation],
+    changed_lines: dict[str, list[tuple[int, int]]],
+) -> list[DetailedViolation]:
+    """Keep only the violations on changed lines.
+
+    Args:
+        violations: List of violations to filter.
+        changed_lines: Changed line ranges per file, as returned by
+            get_changed_lines.
+
+    Returns:
+        list: The violations that fall inside a changed line range.
+    """
+    kept = []
+    for violation in violations:
+        ranges = changed_lines.get(violation.file_path, [])
+        index = bisect.bisect_right(
+            ranges, (violation.line_number, sys.maxsize)
+        )
+        if index and ranges[index - 1][1] >= violation.line_number:
+            kept.append(violation)
+    return kept
 
 
-def check_embedded_styles(
-    content: str, file_path: str
-) -> list[DetailedViolation]:
-    """Check for embedded CSS and style violations in the content.
+def _format_header() -> list[str]:
+    """Format the lines opening the violation report.
 
     Args:
-        content: The content of the file to check.
-        file_path: Path to the file being checked.
+        None
 
     Returns:
-        list: A list of DetailedViolation objects found.
+        list: The header lines.
     """
-    violations = []
-    lines = content.splitlines()
+    return ["=" * 80, "EMBEDDED CSS VIOLATIONS FOUND", "=" * 80, ""]
 
-    # Pattern definitions
-    patterns = {
-        "hex_color": {
-            "regex": r"#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})\b",
-            "description": """Hex color code found.
-            Use CSS variables from stylesheet instead.""",
-        },
-        "rgb_color": {
-            "regex": (
-                r"\brgba?\s*\(\s*"
-                r"\d+\s*,\s*"
-                r"\d+\s*,\s*"
-                r"\d+\s*"
-                r"(?:,\s*[\d.]+\s*)?"
-                r"\)"
-            ),
-            "description": """RGB/RGBA color code found.
-            Use CSS variables from stylesheet instead.""",
-        },
-        "hsl_color": {
-            "regex": (
-                r"\bhsla?\s*\(\s*"
-                r"\d+\s*,\s*"
-                r"\d+%\s*,\s*"
-                r"\d+%\s*"
-                r"(?:,\s*[\d.]+\s*)?"
-                r"\)"
-            ),
-            "description": """HSL/HSLA color code found.
-            Use CSS variables from stylesheet instead.""",
-        },
-        "inline_style_object": {
-            "regex": r"style\s*=\s*\{\{",
-            "description": """Inline style object found.
-            Move styles to CSS file and use className instead.""",
-        },
-        "inline_style_string": {
-            "regex": r'style\s*=\s*["\']',
-            "description": """Inline style string found.
-            Move styles to CSS file and use className instead.""",
-        },
-        "camelcase_css_property": {
-            "regex": (
-                r"\b(?:"
-                r"backgroundColor|fontSize|fontFamily|fontWeight|lineHeight|"
-                r"marginTop|marginBottom|marginLeft|marginRight|"
-                r"paddingTop|paddingBottom|paddingLeft|paddingRight|"
-                r"borderRadius|boxShadow|textAlign|textDecoration|"
-                r"zIndex|maxWidth|minWidth|maxHeight|minHeight"
-                r")\s*[:=]"
-            ),
-            "description": """Camelcase CSS property found.
-            Move styles to CSS file and use className instead.""",
-        },
-        "pixel_value": {
-            "regex": (
-                r":\s*"
-                r"['\"]?"
-                r"\d+(?:px|em|rem|vh|vw|%)"
-                r"['\"]?"
-                r"(?=\s*[,}])"
-            ),
-            "description": """Direct size value assignment found.
-            Move styles to CSS file and use className instead.""",
-        },
-    }
 
-    in_block_comment = False
+def _format_file_violations(
+    file_path: str, file_violations: list[DetailedViolation]
+) -> list[str]:
+    """Format the report section of a single file.
 
-    for line_number, line in enumerate(lines, start=1):
-        # Skip comments and import statements
-        stripped_line = line.strip()
-        if stripped_line.startswith(("import ", "import{", "import(")):
-            continue
+    Args:
+        file_path: Path of the file.
+        file_violations: Violations found in the file.
 
-        result = ""
-        i = 0
-        while i < len(line):
-            if in_block_comment:
-                if line[i : i + 2] == "*/":
-                    in_block_comment = False
-                    i += 2
-                else:
-                    i += 1
-            else:
-                if line[i : i + 2] == "/*":
-                    in_block_comment = True
-                    i += 2
-                elif line[i : i + 2] == "//":
-                    break
-                else:
-                    result += line[i]
-                    i += 1
-        code_line = result
+    Returns:
+        list: The lines of the file section.
+    """
+    output_lines = [f"File: {file_path}", "-" * 80]
 
-        if not code_line.strip():
-            continue
+    # Sort violations by line number
+    for violation in sorted(file_violations, key=lambda v: v.line_number):
+        output_lines.append(
+            f"  Line {violation.line_number}: [{violation.violation_type}]"
+        )
+        output_lines.append(f"    Code: {violation.code_snippet}")
+        output_lines.append(f"    Issue: {violation.description}")
+        output_lines.append("")
 
-        # Check for URL references (skip these as they're not style violations)
-        if (
-            "url(" in code_line.lower()
-            or "href=" in code_line.lower()
-            or "src=" in code_line.lower()
-        ):
-            # Skip hex codes in URLs
+    output_lines.append("")
+    return output_lines
+
+
+def _format_summary(total_violations: int, files_affected: int) -> list[str]:
+    """Format the summary closing the violation report.
+
+    Args:
+        total_violations: Number of violations reported.
+        files_affected: Number of files with violations.
+
+    Returns:
+        list: The summary lines.
+    """
+    return [
+        "=" * 80,
+        "SUMMARY",
+        "=" * 80,
+        f"Total violations: {total_violations}",
+        f"Files affected: {files_affected}",
+        "",
+        "Please address these violations by:",
+        "1. Moving all styles to CSS files",
+        "2. Using className instead of inline styles",
+        "3. Defining colors and sizes as CSS variables",
+        "4. Importing and using CSS modules properly",
+        "",
+    ]
+
+
+def format_violation_output(violations: Sequence[DetailedViolation]) -> str:
+    """Format violations for human-readable output.
+
+    Args:
+        violations: List or ViolationStore of the violations to format.
+
+    Returns:
+        output: A formatted string containing all violations and a summary.
+    """
+    if not violations:
+        return ""
+
+    output_lines = _format_header()
+
+    if not isinstance(violations, ViolationStore):
+        violations = ViolationStore(violations)
+
+    # Files in sorted order for consistent output
+    files_affected = 0
+    for file_path, file_violations in violations.by_file():
+        output_lines.extend(
+            _format_file_violations(file_path, file_violations)
+        )
+        files_affected += 1
+
+    output_lines.extend(_format_summary(len(violations), files_affected))
+
+    return "\n".join(output_lines)
+
+
+def _write_lines(lines: list[str]) -> None:
+    """Write report lines to stdout immediately.
+
+    Args:
+        lines: The lines to write.
+
+    Returns:
+        None
+    """
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def stream_violation_output(
+    results: Iterator[tuple[str, list[DetailedViolation]]],
+    changed_lines: dict[str, list[tuple[int, int]]] | None = None,
+    max_violations: int | None = None,
+) -> int:
+    """Print the violation report while files are being scanned.
+
+    Each file section is printed as soon as the file is scanned. The output
+    is the same as printing format_violation_output for all violations
+    unless the violation limit is reached, in which case the report notes
+    that the scan stopped early.
+
+    Args:
+        results: File paths and their violations, in report order, as
+            yielded by iter_file_violations.
+        changed_lines: Optional changed line ranges per file. Violations
+            outside them are not reported.
+        max_violations: Optional number of violations after which the scan
+            is stopped.
+
+    Returns:
+        total_violations: The number of violations reported.
+    """
+    total_violations = 0
+    files_affected = 0
+    stopped_early = False
+
+    for file_path, violations in results:
+        if changed_lines is not None:
+            violations = filter_changed_lines(violations, changed_lines)
+        if not violations:
             continue
 
-        for violation_type, pattern_info in patterns.items():
-            matches = re.finditer(pattern_info["regex"], code_line)
-            for match in matches:
-                if violation_type == "camelcase_css_property":
-                    # Check if it's actually in a style context
-                    preceding_text = code_line[: match.start()].strip()
-                    if not any(
-                        keyword in preceding_text
-                        for keyword in ["style", "css", "Style", "CSS"]
-                    ):
-                        if "{" not in code_line[: match.start()]:
-                            continue
-                if violation_type == "pixel_value":
-                    # Look for style-related keywords nearby
-                    context_window = code_line[
-                        max(0, match.start() - 30) : min(
-                            len(code_line), match.end() + 30
-                        )
-                    ]
-                    if not any(
-                        keyword in context_window
-                        for keyword in [
-                            "style",
-                            "Style",
-                            "width",
-                            "height",
-                            "size",
-                            "margin",
-                            "padding",
-                        ]
-                    ):
-                        continue
+        if max_violations is not None:
+            violations = violations[: max_violations - total_violations]
+        if not total_violations:
+            _write_lines(_format_header())
+        _write_lines(_format_file_violations(file_path, violations))
+        total_violations += len(violations)
+        files_affected += 1
 
-                violations.append(
-                    DetailedViolation(
-                        file_path=file_path,
-                        line_number=line_number,
-                        violation_type=violation_type,
-                        code_snippet=match.group(0),
-                        description=pattern_info["description"],
-                    )
+        if max_violations is not None and total_violations >= max_violations:
+            stopped_early = True
+            break
+
+    if total_violations:
+        summary = _format_summary(total_violations, files_affected)
+        if stopped_early:
+            summary[-1:-1] = [
+                "",
+                f"Scan stopped after {total_violations} violation(s); "
+                "other files were not checked.",
+            ]
+        _write_lines(summary)
+
+    return total_violations
+
+
+class ViolationSummary:
+    """Count violations per rule, directory and file without keeping them.
+
+    Only counters are kept: one per rule, one per directory prefix and a
+    bounded heap of the files with the most violations, so the memory used
+    does not grow with the number of violations or files scanned.
+
+    Attributes:
+        depth: Number of leading directories that make up the prefix a
+            file is counted under.
+        top: Number of files ranked.
+        total_violations: Violations counted.
+        files_scanned: Files counted, with or without violations.
+        files_affected: Files with at least one violation.
+        rule_violations: Violations per rule.
+        rule_files: Files with at least one violation, per rule.
+        directory_violations: Violations per directory prefix.
+        directory_files: Files with at least one violation, per directory
+            prefix.
+    """
+
+    def __init__(self, depth: int = 2, top: int = 10) -> None:
+        """Start with all counters at zero.
+
+        Args:
+            depth: Number of leading directories in a directory prefix.
+            top: Number of files to rank.
+
+        Returns:
+            None
+        """
+        self.depth = depth
+        self.top = top
+        self.total_violations = 0
+        self.files_scanned = 0
+        self.files_affected = 0
+        self.rule_violations = Counter()
+        self.rule_files = Counter()
+        self.directory_violations = Counter()
+        self.directory_files = Counter()
+        # Min-heap of (violations, -order, path), so that on ties the files
+        # counted first are kept
+        self._top_files = []
+
+    def _directory(self, file_path: str) -> str:
+        """Return the directory prefix a file is counted under.
+
+        Args:
+            file_path: Path of the file.
+
+        Returns:
+            str: The first directories of the path, relative to the working
+            directory when the file is inside it, with ``/`` separators.
+        """
+        path = os.path.abspath(file_path)
+        cwd = os.getcwd()
+        if path.startswith(cwd + os.sep):
+            path = path[len(cwd) + 1 :]
+        directories = path.split(os.sep)[:-1]
+        if directories and not directories[0]:
+            # Keep the root of absolute paths outside the working directory
+            directories = directories[: self.depth + 1]
+        else:
+            directories = directories[: self.depth]
+        return "/".join(directories) or "."
+
+    def add(self, file_path: str, violations: list[DetailedViolation]) -> None:
+        """Count the violations of one file.
+
+        Args:
+            file_path: Path of the file.
+            violations: The violations found in it.
+
+        Returns:
+            None
+        """
+        self.files_scanned += 1
+        if not violations:
+            return
+        count = len(violations)
+        self.total_violations += count
+        self.files_affected += 1
+
+        rules = Counter(violation.violation_type for violation in violations)
+        self.rule_violations.update(rules)
+        self.rule_files.update(rules.keys())
+        directory = self._directory(file_path)
+        self.directory_violations[directory] += count
+        self.directory_files[directory] += 1
+
+        entry = (count, -self.files_affected, file_path)
+        if len(self._top_files) < self.top:
+            heapq.heappush(self._top_files, entry)
+        elif entry > self._top_files[0]:
+            heapq.heapreplace(self._top_files, entry)
+
+    def to_json(self) -> dict:
+        """Return the summary as a JSON-serializable report.
+
+        Args:
+            None
+
+        Returns:
+            dict: The report, with rules, directories and files ranked by
+            number of violations.
+        """
+        return {
+            "total_violations": self.total_violations,
+            "files_scanned": self.files_scanned,
+            "files_affected": self.files_affected,
+            "rules": [
+                {
+                    "rule": rule,
+                    "violations": violations,
+                    "files": self.rule_files[rule],
+                }
+                for rule, violations in sorted(
+                    self.rule_violations.items(),
+                    key=lambda item: (
+                        -item[1],
+                        _RULE_ORDER.get(item[0], len(_RULE_ORDER)),
+                    ),
+                )
+            ],
+            "directories": [
+                {
+                    "directory": directory,
+                    "violations": violations,
+                    "files": self.directory_files[directory],
+                }
+                for directory, violations in sorted(
+                    self.directory_violations.items(),
+                    key=lambda item: (-item[1], item[0]),
                 )
+            ],
+            "top_files": [
+                {"path": path, "violations": violations}
+                for violations, _, path in sorted(
+                    self._top_files, reverse=True
+                )
+            ],
+        }
 
-    return violations
+    def format(self) -> str:
+        """Format the summary as ranked tables.
 
+        Args:
+            None
+
+        Returns:
+            str: The formatted summary.
+        """
+        report = self.to_json()
+        output_lines = [
+            "=" * 80,
+            "EMBEDDED CSS VIOLATIONS SUMMARY",
+            "=" * 80,
+            f"Total violations: {self.total_violations} in "
+            f"{self.files_affected} of {self.files_scanned} files",
+            "",
+            f"{'Rule':<40}{'Violations':>12}{'Files':>12}",
+        ]
+        for entry in report["rules"]:
+            output_lines.append(
+                f"{entry['rule']:<40}{entry['violations']:>12}"
+                f"{entry['files']:>12}"
+            )
+        output_lines.extend(
+            ["", f"{'Directory':<40}{'Violations':>12}{'Files':>12}"]
+        )
+        for entry in report["directories"]:
+            output_lines.append(
+                f"{entry['directory']:<40}{entry['violations']:>12}"
+                f"{entry['files']:>12}"
+            )
+        output_lines.extend(["", f"{'Violations':>12}  Top files"])
+        for entry in report["top_files"]:
+            output_lines.append(f"{entry['violations']:>12}  {entry['path']}")
+        return "\n".join(output_lines)
 
-def process_typescript_file(
-    file_path: str, all_violations: list[DetailedViolation]
-) -> None:
-    """Process a TypeScript file for CSS violations.
+
+def summarize_violations(
+    results: Iterator[tuple[str, list[DetailedViolation]]],
+    summary: ViolationSummary,
+    changed_lines: dict[str, list[tuple[int, int]]] | None = None,
+) -> int:
+    """Count the violations of scanned files into a summary.
 
     Args:
-        file_path: Path to the TypeScript file to process.
-        all_violations: List to store violations found.
+        results: File paths and their violations, as yielded by
+            iter_file_violations.
+        summary: The summary to update.
+        changed_lines: Optional changed line ranges per file. Violations
+            outside them are not counted.
+
+    Returns:
+        total_violations: The number of violations counted.
+    """
+    for file_path, violations in results:
+        if changed_lines is not None:
+            violations = filter_changed_lines(violations, changed_lines)
+        summary.add(file_path, violations)
+    return summary.total_violations
+
+
+def _file_signature(file_path: str) -> tuple[int, int] | None:
+    """Return what tells whether a file changed since it was scanned.
+
+    Args:
+        file_path: Path to the file.
 
     Returns:
-        None: This function modifies the provided list.
+        tuple | None: The modification time in nanoseconds and the size of
+        the file, or None if it no longer exists.
     """
     try:
-        with open(file_path, encoding="utf-8") as f:
-            content = f.read()
-    except (OSError, UnicodeDecodeError) as e:
-        print(f"Error reading file {file_path}: {e}", file=sys.stderr)
-        return
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
-    # Check for embedded styles
-    violations = check_embedded_styles(content, file_path)
-    all_violations.extend(violations)
 
+def diff_violations(
+    old: list[DetailedViolation], new: list[DetailedViolation]
+) -> tuple[list[DetailedViolation], list[DetailedViolation]]:
+    """Compare the violations of a file before and after a change.
 
-def check_files(
-    directories: list,
-    files: list,
-    exclude_files: list,
-    exclude_directories: list,
-) -> CSSCheckResult:
-    """Scan directories and specific files for TS files and their violations.
+    Violations are matched by rule and snippet rather than by line, so
+    that inserting or removing lines above a violation does not report it
+    as both resolved and added.
 
     Args:
-        directories: List of directories to scan for TypeScript files.
-        files: List of specific files to check.
-        exclude_files: List of file paths to exclude from the scan.
-        exclude_directories: List of directories to exclude from the scan.
+        old: The violations before the change.
+        new: The violations after the change.
 
     Returns:
-        CSSCheckResult: A result object containing violations found.
+        tuple: The added violations, from new, and the resolved ones, from
+        old.
     """
-    all_violations = []
 
-    exclude_files = set(os.path.abspath(file) for file in exclude_files)
-    exclude_directories = set(
-        os.path.abspath(dir) for dir in exclude_directories
-    )
+    def unmatched(violations, others):
+        """Return the violations without a counterpart in others.
 
-    for directory in directories:
-        directory = os.path.abspath(directory)
+        Args:
+            violations: The violations to match.
+            others: The violations to match them against.
 
-        for root, _, files_in_dir in os.walk(directory):
-            root_dirname = os.path.basename(root)
+        Returns:
+            list: The violations left unmatched.
+        """
+        remaining = Counter((v.violation_type, v.code_snippet) for v in others)
+        result = []
+        for violation in violations:
+            key = (violation.violation_type, violation.code_snippet)
+            if remaining[key]:
+                remaining[key] -= 1
+            else:
+                result.append(violation)
+        return result
 
-            if root_dirname in {"__tests__", "test", "tests"} or any(
-                root.startswith(exclude_dir)
-                for exclude_dir in exclude_directories
-            ):
-                continue
+    return unmatched(new, old), unmatched(old, new)
 
-            for file in files_in_dir:
-                file_path = os.path.abspath(os.path.join(root, file))
-                if file_path in exclude_files:
-                    continue
 
-                if file.endswith((".ts", ".tsx")) and not any(
-                    pattern in file for pattern in [".test.", ".spec."]
-                ):
-                    process_typescript_file(file_path, all_violations)
+class ViolationWatcher:
+    """Keep the violations of a set of files up to date as they change.
 
-    # Process individual files explicitly listed
-    for file_path in files:
-        file_path = os.path.abspath(file_path)
-        file_name = os.path.basename(file_path)
-        if (
-            file_path not in exclude_files
-            and file_path.endswith((".ts", ".tsx"))
-            and not any(
-                pattern in file_name for pattern in [".test.", ".spec."]
+    The files are discovered and scanned once. Afterwards only their
+    modification times and sizes are polled, and only the files where
+    those changed are scanned again.
+
+    Attributes:
+        memory_map: Whether files are scanned as memory maps.
+        signatures: Modification time and size of each file, as last
+            scanned, or None if the file no longer exists.
+        violations: The current violations of each file.
+    """
+
+    def __init__(self, memory_map: bool = False) -> None:
+        """Start without any file.
+
+        Args:
+            memory_map: Whether to scan memory maps of the files.
+
+        Returns:
+            None
+        """
+        self.memory_map = memory_map
+        self.signatures = {}
+        self.violations = {}
+
+    def track(
+        self, results: Iterator[tuple[str, list[DetailedViolation]]]
+    ) -> Iterator[tuple[str, list[DetailedViolation]]]:
+        """Watch the files of a scan while passing its results through.
+
+        Args:
+            results: The (path, violations) pairs of the scanned files.
+
+        Yields:
+            tuple: The results, unchanged.
+        """
+        for file_path, violations in results:
+            self.signatures[file_path] = _file_signature(file_path)
+            self.violations[file_path] = violations
+            yield file_path, violations
+
+    def poll(
+        self,
+    ) -> list[tuple[str, list[DetailedViolation], list[DetailedViolation]]]:
+        """Scan again the files that changed since the last poll.
+
+        Args:
+            None
+
+        Returns:
+            list: The path, added violations and resolved violations of
+            every changed file whose violations differ, in path order.
+        """
+        changes = []
+        for file_path, signature in self.signatures.items():
+            current = _file_signature(file_path)
+            if current == signature:
+                continue
+            self.signatures[file_path] = current
+            violations = (
+                []
+                if current is None
+                else _scan_file(file_path, memory_map=self.memory_map)[0]
             )
-        ):
-            process_typescript_file(file_path, all_violations)
+            added, resolved = diff_violations(
+                self.violations[file_path], violations
+            )
+            self.violations[file_path] = violations
+            if added or resolved:
+                changes.append((file_path, added, resolved))
+        return changes
 
-    return CSSCheckResult(violations=all_violations)
+    def total(self) -> int:
+        """Return the number of violations in all watched files.
 
+        Args:
+            None
+
+        Returns:
+            int: The number of violations.
+        """
+        return sum(len(violations) for violations in self.violations.values())
 
-def validate_directories_input(input_directories: list[str]) -> list[str]:
-    """Validate that the --directories input is correctly formatted.
+
+def _format_changes(
+    changes: list[
+        tuple[str, list[DetailedViolation], list[DetailedViolation]]
+    ],
+    total_violations: int,
+) -> list[str]:
+    """Format the violations added and resolved by changes to files.
 
     Args:
-        input_directories: A list of file or directory paths to validate.
+        changes: The path, added and resolved violations of each file.
+        total_violations: Number of violations left in all files.
 
     Returns:
-        validated_dirs: A list containing validated directory paths.
-        If the input is a file, its parent directory is added to the list.
-
-    Raises:
-        ValueError: If a path is neither a valid file nor a directory.
+        list: The report lines.
     """
-    validated_dirs = []
-    for path in input_directories:
-        if os.path.isdir(path):
-            validated_dirs.append(path)
-        elif os.path.isfile(path):
-            validated_dirs.append(os.path.dirname(path))
-        else:
-            raise ValueError(
-                f"Invalid path: {path}. Must be an existing file or directory."
-            )
-    return validated_dirs
+    output_lines = []
+    for file_path, added, resolved in changes:
+        output_lines.append(f"File: {file_path}")
+        for sign, violations in (("-", resolved), ("+", added)):
+            for violation in sorted(violations, key=lambda v: v.line_number):
+                output_lines.append(
+                    f"  {sign} Line {violation.line_number}: "
+                    f"[{violation.violation_type}] {violation.code_snippet}"
+                )
+    output_lines.append(
+        f"[{time.strftime('%H:%M:%S')}] Total violations: {total_violations}"
+    )
+    output_lines.append("")
+    return output_lines
 
 
-def format_violation_output(violations: list[DetailedViolation]) -> str:
-    """Format violations for human-readable output.
+def watch_files(watcher: ViolationWatcher, interval: float) -> None:
+    """Report changes to the violations of the watched files until stopped.
 
     Args:
-        violations: List of violations to format.
+        watcher: The watcher holding the files and their violations.
+        interval: Seconds to wait between two polls.
 
     Returns:
-        output: A formatted string containing all violations and a summary.
+        None: Returns when interrupted with Ctrl+C.
     """
-    if not violations:
-        return ""
+    _write_lines(
+        [
+            f"Watching {len(watcher.signatures)} files for changes. "
+            "Press Ctrl+C to stop.",
+            "",
+        ]
+    )
+    try:
+        while True:
+            time.sleep(interval)
+            changes = watcher.poll()
+            if changes:
+                _write_lines(_format_changes(changes, watcher.total()))
+    except KeyboardInterrupt:
+        pass
 
-    output_lines = ["=" * 80]
-    output_lines.append("EMBEDDED CSS VIOLATIONS FOUND")
-    output_lines.append("=" * 80)
-    output_lines.append("")
 
-    # Group violations by file
-    violations_by_file = {}
-    for violation in violations:
-        if violation.file_path not in violations_by_file:
-            violations_by_file[violation.file_path] = []
-        violations_by_file[violation.file_path].append(violation)
+def _profile_report(
+    results: Iterator[tuple[str, list[DetailedViolation]]],
+    profile: ScanProfile,
+) -> Iterator[tuple[str, list[DetailedViolation]]]:
+    """Pass results through, timing how long each takes to report.
 
-    # Sort files for consistent output
-    for file_path in sorted(violations_by_file.keys()):
-        file_violations = violations_by_file[file_path]
-        output_lines.append(f"File: {file_path}")
-        output_lines.append("-" * 80)
+    Args:
+        results: The (path, violations) pairs of the scanned files.
+        profile: The profile charged with the reporting time.
 
-        # Sort violations by line number
-        for violation in sorted(file_violations, key=lambda v: v.line_number):
-            output_lines.append(
-                f"  Line {violation.line_number}: [{violation.violation_type}]"
-            )
-            output_lines.append(f"    Code: {violation.code_snippet}")
-            output_lines.append(f"    Issue: {violation.description}")
-            output_lines.append("")
+    Yields:
+        tuple: The results, unchanged.
+    """
+    for result in results:
+        started = time.perf_counter()
+        yield result
+        profile.phases["report"] += time.perf_counter() - started
 
-        output_lines.append("")
 
-    output_lines.append("=" * 80)
-    output_lines.append("SUMMARY")
-    output_lines.append("=" * 80)
-    output_lines.append(f"Total violations: {len(violations)}")
-    output_lines.append(f"Files affected: {len(violations_by_file)}")
-    output_lines.append("")
-    output_lines.append("Please address these violations by:")
-    output_lines.append("1. Moving all styles to CSS files")
-    output_lines.append("2. Using className instead of inline styles")
-    output_lines.append("3. Defining colors and sizes as CSS variables")
-    output_lines.append("4. Importing and using CSS modules properly")
-    output_lines.append("")
+def _write_profile(profile: ScanProfile, path: str) -> None:
+    """Write the JSON report of a profile and print its tables to stderr.
 
-    return "\n".join(output_lines)
+    Args:
+        profile: The profile of the scan.
+        path: Path of the JSON report.
+
+    Returns:
+        None
+    """
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(profile.to_json(), f, indent=2)
+            f.write("\n")
+    except OSError as e:
+        print(f"Warning: Failed to write profile: {e}", file=sys.stderr)
+    print(profile.format(), file=sys.stderr)
 
 
 def main():
@@ -374,7 +3295,9 @@ def main():
         "--directories",
         nargs="+",
         required=False,
-        help="List of directories to check for CSS violations.",
+        help="""Files, directories or glob patterns to check for CSS
+        violations. Only the given files and the matches of the patterns
+        are checked.""",
     )
     parser.add_argument(
         "--files",
@@ -394,15 +3317,135 @@ def main():
         default=[],
         help="Directories to exclude from analysis.",
     )
+    parser.add_argument(
+        "--since",
+        metavar="GIT_REF",
+        help="""Check only the files changed since the merge base with
+        GIT_REF, and report only violations on changed lines.""",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first violation.",
+    )
+    parser.add_argument(
+        "--max-violations",
+        type=int,
+        metavar="N",
+        help="Stop after N violations have been reported.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="""Most processes used to scan files; small scans run in a
+        single process (default: number of CPUs).""",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=".css_check_cache",
+        help="""Directory of the result cache, keyed by file content
+        (default: .css_check_cache).""",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=64,
+        help="Size in MB above which old cache entries are evicted.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Scan every file without reading or writing the cache.",
+    )
+    parser.add_argument(
+        "--prefilter-stats",
+        action="store_true",
+        help="""Print to stderr how many files and lines, per rule, the
+        literal prefilter allowed to skip.""",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="""Scan memory-mapped files as bytes, decoding only what is
+        reported. Useful on trees with large or generated sources.""",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="""Write a JSON report of the time spent reading, analyzing,
+        matching and reporting, per rule and per file, to PATH, and print
+        the slowest rules and files to stderr.""",
+    )
+    parser.add_argument(
+        "--summary",
+        nargs="?",
+        const="table",
+        choices=("table", "json"),
+        help="""Instead of listing every violation, print the number of
+        violations per rule and per directory and the files with the most
+        violations, as ranked tables or as JSON (default: table).""",
+    )
+    parser.add_argument(
+        "--summary-depth",
+        type=int,
+        default=2,
+        metavar="N",
+        help="Number of leading directories grouped in the summary.",
+    )
+    parser.add_argument(
+        "--summary-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of files ranked in the summary.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="""After the first report, keep polling the files and report
+        the violations added and resolved by every change, until stopped
+        with Ctrl+C.""",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=0.05,
+        help="Seconds between two polls in watch mode.",
+    )
     args = parser.parse_args()
 
-    if not args.directories and not args.files:
+    if args.since and (args.directories or args.files):
+        parser.error(
+            "--since cannot be combined with --directories or --files."
+        )
+    if not args.directories and not args.files and not args.since:
+        parser.error(
+            "At least one of --directories, --files or --since must be "
+            "provided."
+        )
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
+    if args.max_violations is not None and args.max_violations < 1:
+        parser.error("--max-violations must be at least 1.")
+    max_violations = 1 if args.fail_fast else args.max_violations
+    if args.watch and (args.since or max_violations is not None):
+        parser.error(
+            "--watch cannot be combined with --since, --fail-fast or "
+            "--max-violations."
+        )
+    if args.watch_interval <= 0:
+        parser.error("--watch-interval must be positive.")
+    if args.summary and (args.watch or max_violations is not None):
         parser.error(
-            "At least one of --directories or --files must be provided."
+            "--summary cannot be combined with --watch, --fail-fast or "
+            "--max-violations."
         )
+    if args.summary_depth < 1 or args.summary_top < 1:
+        parser.error("--summary-depth and --summary-top must be at least 1.")
 
     try:
-        directories = (
+        paths = (
             validate_directories_input(args.directories)
             if args.directories
             else []
@@ -410,16 +3453,80 @@ def main():
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    directories = [path for path in paths if os.path.isdir(path)]
+    files = [path for path in paths if not os.path.isdir(path)] + args.files
 
-    result = check_files(
+    changed_lines = None
+    if args.since:
+        try:
+            changed_lines = get_changed_lines(args.since)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        excluded = set(
+            os.path.abspath(directory)
+            for directory in args.exclude_directories
+        )
+        files = [
+            file_path
+            for file_path in changed_lines
+            if not _is_inside(file_path, excluded)
+        ]
+
+    stats = PrefilterStats() if args.prefilter_stats else None
+    profile = ScanProfile() if args.profile else None
+    started = time.perf_counter()
+    scan = iter_file_violations(
         directories=directories,
-        files=args.files,
+        files=files,
         exclude_files=args.exclude_files,
         exclude_directories=args.exclude_directories,
+        jobs=args.jobs,
+        cache=(
+            None
+            if args.no_cache
+            else ResultCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+        ),
+        memory_map=args.mmap,
+        stats=stats,
+        profile=profile,
     )
+    watcher = ViolationWatcher(args.mmap) if args.watch else None
+    results = scan if watcher is None else watcher.track(scan)
+    if profile is not None:
+        results = _profile_report(results, profile)
+    summary = (
+        ViolationSummary(args.summary_depth, args.summary_top)
+        if args.summary
+        else None
+    )
+    try:
+        if summary is not None:
+            total_violations = summarize_violations(
+                results, summary, changed_lines
+            )
+        else:
+            total_violations = stream_violation_output(
+                results, changed_lines, max_violations
+            )
+    finally:
+        scan.close()
+    if stats is not None:
+        print(stats.format(), file=sys.stderr)
+    if profile is not None:
+        profile.wall_seconds = time.perf_counter() - started
+        _write_profile(profile, args.profile)
+    if watcher is not None:
+        watch_files(watcher, args.watch_interval)
+        total_violations = watcher.total()
+    if summary is not None:
+        if args.summary == "json":
+            print(json.dumps(summary.to_json(), indent=2))
+        else:
+            print(summary.format())
+        sys.exit(1 if total_violations else 0)
 
-    if result.violations:
-        print(format_violation_output(result.violations))
+    if total_violations:
         sys.exit(1)
     else:
         print("✓ No embedded CSS violations found.")
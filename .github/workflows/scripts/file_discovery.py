@@ -0,0 +1,394 @@
+# -*- coding: UTF-8 -*-
+"""Discover the source files the workflow scripts check.
+
+The files of a directory are listed with a single ``git ls-files -z``
+call, which returns the tracked files and the untracked files that are
+not ignored, so trees such as ``node_modules`` or ``build`` are never
+visited. Outside a git work tree, or when git is not installed, the
+directory is walked with ``os.scandir`` instead, honoring the
+``.gitignore`` files found along the way.
+
+Listings are cached for the life of the process. Scripts that run for a
+long time and need to see new files call clear_cache.
+
+Filters are compiled once into a single regular expression, so that
+selecting the files costs one match per file whatever the number of
+suffixes and exclusions.
+"""
+
+import functools
+import os
+import re
+import subprocess
+import sys
+from collections.abc import Callable, Iterable
+
+# Directories never listed by the fallback walk
+_ALWAYS_IGNORED = frozenset({".git"})
+
+# Directories holding tests, which the checks skipping tests never walk
+TEST_DIRECTORIES = frozenset({"__tests__", "test", "tests"})
+
+# Status tags of ``git ls-files -t`` for files missing from the work tree:
+# deleted files and files outside a sparse checkout
+_MISSING_TAGS = frozenset({"R", "S"})
+
+
+def _git_listing(directory: str) -> list[str] | None:
+    """List the files of a directory that git does not ignore.
+
+    Args:
+        directory: Absolute path of the directory.
+
+    Returns:
+        list: Paths relative to the directory, with ``/`` separators, or
+        None if the directory is not in a git work tree.
+    """
+    command = [
+        "git",
+        "-C",
+        directory,
+        "ls-files",
+        "-z",
+        "-t",
+        "--cached",
+        "--deleted",
+        "--others",
+        "--exclude-standard",
+    ]
+    try:
+        output = subprocess.run(command, capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    present = {}
+    missing = set()
+    for entry in output.stdout.decode("utf-8", "surrogateescape").split("\0"):
+        if not entry:
+            continue
+        tag, path = entry[0], entry[2:]
+        if tag in _MISSING_TAGS:
+            missing.add(path)
+        else:
+            present[path] = None
+    return [path for path in present if path not in missing]
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression.
+
+    Args:
+        pattern: The glob, without its negation and trailing slash.
+
+    Returns:
+        str: The regular expression matching the same paths.
+    """
+    output = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            output.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            output.append(".*")
+            index += 2
+            continue
+        if char == "*":
+            output.append("[^/]*")
+        elif char == "?":
+            output.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", index + 2)
+            if end == -1:
+                output.append(re.escape(char))
+            else:
+                body = pattern[index + 1 : end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                output.append(f"[{body}]")
+                index = end
+        elif char == "\\" and index + 1 < len(pattern):
+            index += 1
+            output.append(re.escape(pattern[index]))
+        else:
+            output.append(re.escape(char))
+        index += 1
+    return "".join(output)
+
+
+def _parse_gitignore(path: str) -> list[tuple[re.Pattern, bool, bool]]:
+    """Parse a .gitignore file.
+
+    Args:
+        path: Path of the file.
+
+    Returns:
+        list: A rule per pattern, holding the compiled pattern, matched
+        against paths relative to the directory of the file, whether the
+        rule negates an earlier one and whether it only applies to
+        directories.
+    """
+    try:
+        with open(path, encoding="utf-8", errors="surrogateescape") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+
+    rules = []
+    for line in lines:
+        if line.endswith(" ") and not line.endswith("\\ "):
+            line = line.rstrip(" ")
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        directory_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        # A slash anywhere but at the end anchors the pattern
+        anchored = "/" in line
+        expression = _translate_glob(line.lstrip("/"))
+        if not anchored:
+            expression = "(?:.*/)?" + expression
+        rules.append(
+            (re.compile(f"(?s:{expression})\\Z"), negated, directory_only)
+        )
+    return rules
+
+
+def _is_ignored(
+    ignores: list[tuple[str, list]], path: str, is_directory: bool
+) -> bool:
+    """Apply the gitignore rules in scope to a path.
+
+    Args:
+        ignores: The directory of each .gitignore file in scope, relative
+            to the walked directory, with its rules, outermost first.
+        path: Path relative to the walked directory.
+        is_directory: Whether the path is a directory.
+
+    Returns:
+        bool: True if the last rule matching the path ignores it.
+    """
+    ignored = False
+    for base, rules in ignores:
+        relative = path[len(base) + 1 :] if base else path
+        for pattern, negated, directory_only in rules:
+            if directory_only and not is_directory:
+                continue
+            if pattern.match(relative):
+                ignored = not negated
+    return ignored
+
+
+def _walk(
+    directory: str, prune_paths: frozenset, prune_names: frozenset
+) -> list[str]:
+    """Walk a directory, skipping what its .gitignore files ignore.
+
+    Ignored and pruned directories are skipped before they are listed.
+    Symbolic links to directories are not followed.
+
+    Args:
+        directory: Absolute path of the directory.
+        prune_paths: Relative paths of directories to skip.
+        prune_names: Names of directories to skip wherever they are.
+
+    Returns:
+        list: Paths relative to the directory, with ``/`` separators.
+    """
+    paths = []
+    stack = [("", [])]
+    while stack:
+        relative, ignores = stack.pop()
+        root = os.path.join(directory, relative) if relative else directory
+        try:
+            with os.scandir(root) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except OSError as e:
+            print(f"Error reading directory {root}: {e}", file=sys.stderr)
+            continue
+
+        if any(entry.name == ".gitignore" for entry in entries):
+            rules = _parse_gitignore(os.path.join(root, ".gitignore"))
+            if rules:
+                ignores = ignores + [(relative, rules)]
+
+        subdirectories = []
+        for entry in entries:
+            path = f"{relative}/{entry.name}" if relative else entry.name
+            if entry.is_dir():
+                if (
+                    entry.is_symlink()
+                    or entry.name in _ALWAYS_IGNORED
+                    or entry.name in prune_names
+                    or path in prune_paths
+                    or _is_ignored(ignores, path, True)
+                ):
+                    continue
+                subdirectories.append((path, ignores))
+            elif not _is_ignored(ignores, path, False):
+                paths.append(path)
+
+        stack.extend(reversed(subdirectories))
+    return paths
+
+
+def _walk_order(path: str) -> list[tuple[int, str]]:
+    """Sort key placing the files of a directory before its subdirectories.
+
+    Args:
+        path: Path with ``/`` separators.
+
+    Returns:
+        list: The key.
+    """
+    parts = path.split("/")
+    return [(1, part) for part in parts[:-1]] + [(0, parts[-1])]
+
+
+@functools.lru_cache(maxsize=None)
+def list_files(
+    directory: str,
+    prune_paths: frozenset = frozenset(),
+    prune_names: frozenset = frozenset(),
+) -> tuple[str, ...]:
+    """List the files of a directory that are not ignored.
+
+    Args:
+        directory: Absolute path of the directory.
+        prune_paths: Relative paths of directories, with ``/`` separators,
+            whose files are left out.
+        prune_names: Names of directories whose files are left out
+            wherever they are.
+
+    Returns:
+        tuple: Paths relative to the directory, with ``/`` separators, in
+        name order with the files of a directory before its
+        subdirectories.
+    """
+    paths = _git_listing(directory)
+    if paths is None:
+        paths = _walk(directory, prune_paths, prune_names)
+    elif prune_paths or prune_names:
+        pruned = _compile_pruning(prune_paths, prune_names)
+        paths = [path for path in paths if not pruned.match(path)]
+    paths.sort(key=_walk_order)
+    return tuple(paths)
+
+
+def clear_cache() -> None:
+    """Forget the cached listings, so that new files are found.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    list_files.cache_clear()
+
+
+def _alternatives(values: Iterable[str]) -> str:
+    """Build a regular expression matching any of the given strings.
+
+    Args:
+        values: The strings to match.
+
+    Returns:
+        str: The alternation, longest strings first.
+    """
+    return "|".join(
+        re.escape(value) for value in sorted(values, key=len, reverse=True)
+    )
+
+
+def _compile_pruning(
+    prune_paths: frozenset, prune_names: frozenset
+) -> re.Pattern:
+    """Compile the test for paths below pruned directories.
+
+    Args:
+        prune_paths: Relative paths of the pruned directories.
+        prune_names: Names of the pruned directories.
+
+    Returns:
+        re.Pattern: A pattern matching the paths to leave out.
+    """
+    tests = []
+    if prune_paths:
+        tests.append(f"(?:{_alternatives(prune_paths)})/")
+    if prune_names:
+        tests.append(f"(?:.*/)?(?:{_alternatives(prune_names)})/")
+    return re.compile("|".join(tests), re.DOTALL)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_filter(
+    suffixes: tuple[str, ...],
+    exclude_suffixes: tuple[str, ...] = (),
+    skip_test_files: bool = True,
+) -> Callable[[str], bool]:
+    """Compile a file name filter into a single regular expression.
+
+    Args:
+        suffixes: The file names must end with one of these.
+        exclude_suffixes: The file names must not end with any of these.
+        skip_test_files: Whether to leave out ``.test.`` and ``.spec.``
+            files.
+
+    Returns:
+        Callable: A function telling whether a path, with ``/``
+        separators, is selected.
+    """
+    name = ""
+    if skip_test_files:
+        name += r"(?![^/]*\.(?:test|spec)\.)"
+    if exclude_suffixes:
+        name += f"(?![^/]*(?:{_alternatives(exclude_suffixes)})\\Z)"
+    name += f"[^/]*(?:{_alternatives(suffixes)})\\Z"
+    pattern = re.compile(f"(?:.*/)?{name}", re.DOTALL)
+    return lambda path: pattern.match(path) is not None
+
+
+def discover_files(
+    directory: str,
+    matches: Callable[[str], bool],
+    exclude_directories: Iterable[str] = (),
+    prune_names: Iterable[str] = (),
+) -> list[str]:
+    """Find the files of a directory selected by a filter.
+
+    Args:
+        directory: Directory to search.
+        matches: Filter built by compile_filter.
+        exclude_directories: Directories whose files are left out.
+        prune_names: Names of directories whose files are left out
+            wherever they are below the directory.
+
+    Returns:
+        list: Paths of the selected files, joined to the directory, in
+        name order with the files of a directory before its
+        subdirectories.
+    """
+    root = os.path.abspath(directory)
+    prune_paths = set()
+    for excluded in exclude_directories:
+        excluded = os.path.abspath(excluded)
+        if root == excluded or root.startswith(excluded + os.sep):
+            return []
+        if excluded.startswith(root + os.sep):
+            relative = excluded[len(root) + 1 :]
+            prune_paths.add(relative.replace(os.sep, "/"))
+
+    return [
+        os.path.join(directory, *path.split("/"))
+        for path in list_files(
+            root, frozenset(prune_paths), frozenset(prune_names)
+        )
+        if matches(path)
+    ]
@@ -0,0 +1,180 @@
+# -*- coding: UTF-8 -*-
+"""Map offsets in a file to line and column numbers.
+
+The checks match their patterns over whole files, so every match needs
+the line it is on. LineIndex finds the offsets of all line breaks in one
+pass and resolves match offsets with a binary search, without splitting
+the file into line strings.
+
+When NumPy is installed, the newlines are found with a single vectorized
+comparison over the bytes of the file and offsets are resolved in batches
+with ``searchsorted``. Otherwise ``find`` is called in a loop, which
+still runs in C and creates no line strings. NumPy is optional and listed
+in .github/workflows/requirements-optional.txt. Files holding line breaks
+other than LF, such as CR, CRLF or the other boundaries of
+str.splitlines, are indexed with the line break pattern of the caller
+instead.
+"""
+
+import bisect
+import re
+from collections.abc import Sequence
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Line breaks other than LF among the ones recognised by str.splitlines. In
+# UTF-8 encoded content NEL, LS and PS are multi-byte sequences.
+_TEXT_OTHER_BREAKS = tuple("\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+_UTF8_OTHER_BREAKS = tuple(
+    line_break.encode("utf-8") for line_break in _TEXT_OTHER_BREAKS
+)
+
+
+def _find_newlines(content: str | bytes) -> Sequence[int]:
+    """Find the offset of every LF in the content.
+
+    Args:
+        content: Text, bytes or a memory map.
+
+    Returns:
+        Sequence: The offsets in increasing order, as a NumPy array when
+        NumPy is installed and the offsets can be computed on bytes.
+    """
+    if numpy is not None:
+        if isinstance(content, str):
+            # Offsets in ASCII text are the same as in its encoding
+            buffer = content.encode("ascii") if content.isascii() else None
+        else:
+            buffer = content
+        if buffer is not None:
+            return numpy.flatnonzero(
+                numpy.frombuffer(buffer, dtype=numpy.uint8) == 0x0A
+            )
+
+    newline = "\n" if isinstance(content, str) else b"\n"
+    offsets = []
+    offset = content.find(newline)
+    while offset != -1:
+        offsets.append(offset)
+        offset = content.find(newline, offset + 1)
+    return offsets
+
+
+class LineIndex:
+    """Offsets of the lines of a text, text as bytes or memory map.
+
+    Lines and columns are zero-based. Columns count characters in text
+    and bytes in bytes.
+
+    Attributes:
+        length: Length of the content.
+        line_count: Number of lines, counting the one after a final line
+            break.
+    """
+
+    def __init__(self, content: str | bytes, line_break: re.Pattern):
+        """Index the lines of the content.
+
+        Args:
+            content: The content to index.
+            line_break: Pattern matching a single line break in the
+                content. It must match a lone LF as a line break, and only
+                characters that str.splitlines breaks on.
+
+        Returns:
+            None
+        """
+        self.length = len(content)
+        other_breaks = (
+            _TEXT_OTHER_BREAKS
+            if isinstance(content, str)
+            else _UTF8_OTHER_BREAKS
+        )
+        # Searching each break on its own is much faster than a pattern
+        if all(content.find(other) == -1 for other in other_breaks):
+            ends = _find_newlines(content)
+            if numpy is not None and isinstance(ends, numpy.ndarray):
+                starts = numpy.concatenate(([0], ends + 1))
+            else:
+                starts = [0]
+                starts.extend(end + 1 for end in ends)
+        else:
+            ends = []
+            starts = [0]
+            for match in line_break.finditer(content):
+                ends.append(match.start())
+                starts.append(match.end())
+        self._ends = ends
+        self._starts = starts
+        self.line_count = len(starts)
+
+    def start(self, line: int) -> int:
+        """Return the offset of the first character of a line.
+
+        Args:
+            line: The line.
+
+        Returns:
+            int: The offset.
+        """
+        return int(self._starts[line])
+
+    def end(self, line: int) -> int:
+        """Return the offset of the line break ending a line.
+
+        Args:
+            line: The line.
+
+        Returns:
+            int: The offset, or the length of the content for the last
+            line.
+        """
+        if line < len(self._ends):
+            return int(self._ends[line])
+        return self.length
+
+    def line_of(self, offset: int) -> int:
+        """Find the line holding an offset.
+
+        Args:
+            offset: The offset.
+
+        Returns:
+            int: The line.
+        """
+        if numpy is not None and isinstance(self._starts, numpy.ndarray):
+            return int(numpy.searchsorted(self._starts, offset, "right")) - 1
+        return bisect.bisect_right(self._starts, offset) - 1
+
+    def lines_of(self, offsets: Sequence[int]) -> list[int]:
+        """Find the lines holding a batch of offsets.
+
+        Args:
+            offsets: The offsets, in any order.
+
+        Returns:
+            list: The line of each offset.
+        """
+        if numpy is not None and isinstance(self._starts, numpy.ndarray):
+            return (
+                numpy.searchsorted(self._starts, offsets, side="right") - 1
+            ).tolist()
+        starts = self._starts
+        return [bisect.bisect_right(starts, offset) - 1 for offset in offsets]
+
+    def positions(self, offsets: Sequence[int]) -> list[tuple[int, int]]:
+        """Find the line and column of a batch of offsets.
+
+        Args:
+            offsets: The offsets, in any order.
+
+        Returns:
+            list: The line and column of each offset.
+        """
+        return [
+            (line, offset - self.start(line))
+            for offset, line in zip(offsets, self.lines_of(offsets))
+        ]
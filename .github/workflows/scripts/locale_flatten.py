@@ -0,0 +1,44 @@
+# -*- coding: UTF-8 -*-
+"""Flatten nested locale JSON into dot-notation keys.
+
+Locale files nest their keys by feature, so ``{"login": {"title": "x"}}``
+holds the key ``login.title``. flatten walks the nesting with an explicit
+stack of iterators instead of recursion, so arbitrarily deep files do not
+hit the recursion limit, and yields every key as it is reached, so
+callers build a single set or dict instead of one per nested object that
+is then merged into its parent.
+
+Each prefix is formatted once per nested object rather than once per
+level above every key, and the keys are interned, since the same keys
+appear in the files of every locale.
+"""
+
+import sys
+from collections.abc import Iterator
+
+
+def flatten(data: dict, prefix: str = "") -> Iterator[tuple[str, object]]:
+    """Yield the flattened keys of nested locale JSON with their values.
+
+    Nested objects are walked depth first, in the order of their keys.
+    Empty nested objects yield nothing.
+
+    Args:
+        data: Parsed JSON object.
+        prefix: String prepended to every key, such as ``"parent."``.
+
+    Yields:
+        tuple: Each dot-notation key and its value.
+    """
+    stack = [(prefix, iter(data.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            key = sys.intern(f"{prefix}{key}")
+            if isinstance(value, dict):
+                # Resume the current object once the nested one is done
+                stack.append((f"{key}.", iter(value.items())))
+                break
+            yield key, value
+        else:
+            stack.pop()
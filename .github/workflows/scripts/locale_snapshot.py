@@ -0,0 +1,176 @@
+# -*- coding: UTF-8 -*-
+"""Snapshots of the flattened keys of locale files.
+
+Parsing and flattening the locale JSON files is the slowest part of
+loading the translation keys. A snapshot stores the resulting keys under
+a key derived from the content of the files, so that later runs only read
+and hash the files, and rebuild the snapshot when any of them changes.
+
+A snapshot holds the number of keys and the keys in sorted order, one per
+line in UTF-8, so that loading it is a single decode and split rather than
+a JSON parse. Keys holding line breaks are only kept in memory.
+
+Snapshots loaded or built by a process are also kept in memory, so that a
+long-lived process reloading unchanged files does not decode them again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+
+# Bumped whenever the encoding or the flattening of the keys changes
+_FORMAT = b"locale-snapshot-2\n"
+_SUFFIX = ".keys"
+
+# Snapshots loaded or built by this process, by key
+_loaded: dict[str, frozenset[str]] = {}
+
+
+def snapshot_key(files: Iterable[tuple[str, bytes | None]]) -> str:
+    """Compute the key of the snapshot of a set of locale files.
+
+    Args:
+        files: The name and content of each file, or None as the content
+            of a missing file, in a fixed order.
+
+    Returns:
+        str: The hex digest of the format and of the files.
+    """
+    digest = hashlib.sha256(_FORMAT)
+    for name, content in files:
+        digest.update(name.encode("utf-8") + b"\0")
+        if content is None:
+            digest.update(b"-")
+        else:
+            digest.update(b"+%d\0" % len(content))
+            digest.update(content)
+    return digest.hexdigest()
+
+
+def encode_keys(keys: Iterable[str]) -> bytes:
+    """Encode keys as a sorted list, one key per line.
+
+    Args:
+        keys: The keys.
+
+    Returns:
+        bytes: The encoded keys.
+
+    Raises:
+        ValueError: If a key holds a line break, which would split it.
+    """
+    keys = sorted(keys)
+    if any("\n" in key for key in keys):
+        raise ValueError("keys holding line breaks cannot be snapshotted")
+    # The count and the line break ending every key tell a truncated
+    # snapshot from a complete one
+    body = "".join(f"{key}\n" for key in keys)
+    return (
+        _FORMAT + b"%d\n" % len(keys) + body.encode("utf-8", "surrogatepass")
+    )
+
+
+def decode_keys(data: bytes) -> list[str]:
+    """Decode keys encoded by encode_keys.
+
+    Args:
+        data: The encoded keys.
+
+    Returns:
+        list: The keys, in sorted order.
+
+    Raises:
+        ValueError: If the data is not a snapshot in the current format.
+    """
+    if not data.startswith(_FORMAT):
+        raise ValueError("not a snapshot in the current format")
+    count, _, body = data[len(_FORMAT) :].partition(b"\n")
+    if not count.isdigit():
+        raise ValueError("corrupt snapshot")
+    if not body:
+        keys = []
+    elif body.endswith(b"\n"):
+        keys = body[:-1].decode("utf-8", "surrogatepass").split("\n")
+    else:
+        raise ValueError("truncated snapshot")
+    if len(keys) != int(count):
+        raise ValueError("corrupt snapshot")
+    return keys
+
+
+def load_snapshot(
+    cache_dir: str | Path | None, key: str
+) -> frozenset[str] | None:
+    """Load the keys of a snapshot.
+
+    Args:
+        cache_dir: Directory of the snapshots, or None to only look in
+            memory.
+        key: Key of the snapshot, from snapshot_key.
+
+    Returns:
+        frozenset: The keys, or None if there is no valid snapshot.
+    """
+    keys = _loaded.get(key)
+    if keys is not None or cache_dir is None:
+        return keys
+    try:
+        data = (Path(cache_dir) / f"{key}{_SUFFIX}").read_bytes()
+        keys = frozenset(decode_keys(data))
+    except (OSError, ValueError, UnicodeDecodeError):
+        return None
+    _loaded[key] = keys
+    return keys
+
+
+def save_snapshot(
+    cache_dir: str | Path | None, key: str, keys: Iterable[str]
+) -> None:
+    """Save the keys of a set of locale files as a snapshot.
+
+    Older snapshots in the directory are removed, since the snapshot of
+    the current files is the only one a later run can use unless the
+    files are reverted.
+
+    Args:
+        cache_dir: Directory of the snapshots, or None to only keep the
+            keys in memory.
+        key: Key of the snapshot, from snapshot_key.
+        keys: The keys.
+
+    Returns:
+        None
+    """
+    keys = frozenset(keys)
+    _loaded[key] = keys
+    if cache_dir is None:
+        return
+    base = Path(cache_dir)
+    path = base / f"{key}{_SUFFIX}"
+    try:
+        base.mkdir(parents=True, exist_ok=True)
+        data = encode_keys(keys)
+        temp_path = base / f"{key}.{os.getpid()}.tmp"
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+        for old in base.glob(f"*{_SUFFIX}"):
+            if old != path:
+                old.unlink(missing_ok=True)
+    except (OSError, ValueError) as exc:
+        print(f"Warning: Failed to write snapshot: {exc}", file=sys.stderr)
+
+
+def clear_memory() -> None:
+    """Forget the snapshots kept in memory.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    _loaded.clear()
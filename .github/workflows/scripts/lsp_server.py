@@ -0,0 +1,704 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Serve the style and translation checks to editors over LSP.
+
+The server speaks the Language Server Protocol over stdin and stdout. It
+loads the translation keys of the locale directory once and keeps them in
+memory, together with the compiled css_check rules. Open documents are
+kept in sync through incremental edits, and only the document that
+changed is checked again, so diagnostics follow typing without rescanning
+the repository. Each diagnostic covers the exact range of the offending
+code.
+
+Once the client is initialized, the server asks it to watch the JSON
+files of the locale directory, and reloads the locale keys whenever the
+client reports a change to one of them.
+
+Usage:
+    python lsp_server.py --locales-dir public/locales/en
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import BinaryIO
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import css_check  # noqa: E402
+import line_index  # noqa: E402
+import translation_check  # noqa: E402
+
+# JSON-RPC error codes
+_PARSE_ERROR = -32700
+_INVALID_REQUEST = -32600
+_METHOD_NOT_FOUND = -32601
+_INTERNAL_ERROR = -32603
+_SERVER_NOT_INITIALIZED = -32002
+
+# LSP enumerations
+_SYNC_INCREMENTAL = 2
+_SEVERITY_ERROR = 1
+_SEVERITY_WARNING = 2
+_MESSAGE_ERROR = 1
+_MESSAGE_WARNING = 2
+
+# ID of the request registering the locale file watcher
+_REGISTER_WATCHER_ID = "register-locale-watcher"
+
+# Line breaks as counted by LSP positions
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+def read_message(stream: BinaryIO) -> dict | None:
+    """Read one JSON-RPC message framed by a Content-Length header.
+
+    Args:
+        stream: Binary stream to read from.
+
+    Returns:
+        dict: The decoded message, or None at the end of the stream.
+
+    Raises:
+        ValueError: If the header has no valid Content-Length or the body
+            is not valid JSON. The whole message has been read unless the
+            Content-Length is missing or invalid.
+    """
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode("ascii", "replace").partition(":")
+        if name.strip().lower() == "content-length":
+            # Checked once the whole header is read, so that the next
+            # message starts after it
+            length = value.strip()
+    if length is None:
+        raise ValueError("Message without a Content-Length header")
+    if not length.isdigit():
+        raise ValueError(f"Invalid Content-Length: {length}")
+    length = int(length)
+    body = stream.read(length)
+    if len(body) < length:
+        return None
+    return json.loads(body.decode("utf-8"))
+
+
+def write_message(stream: BinaryIO, message: dict) -> None:
+    """Write one JSON-RPC message framed by a Content-Length header.
+
+    Args:
+        stream: Binary stream to write to.
+        message: The message to send.
+
+    Returns:
+        None
+    """
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    stream.write(b"Content-Length: %d\r\n\r\n" % len(body))
+    stream.write(body)
+    stream.flush()
+
+
+def uri_to_path(uri: str) -> str:
+    """Convert a file URI to a local path.
+
+    Args:
+        uri: The document URI.
+
+    Returns:
+        str: The local path, or the URI itself if it is not a file URI.
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        return uri
+    return url2pathname(unquote(parsed.path))
+
+
+def _utf16_length(text: str) -> int:
+    """Count the UTF-16 code units of a string.
+
+    Args:
+        text: The string to measure.
+
+    Returns:
+        int: The number of code units.
+    """
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+class PositionIndex:
+    """Converts between string offsets and LSP positions.
+
+    LSP positions count lines and UTF-16 code units within a line, while
+    the checks report offsets into the Python string. The lines are found
+    by line_index.LineIndex.
+
+    Attributes:
+        text: The indexed text.
+        lines: Offsets of the lines of the text.
+    """
+
+    def __init__(self, text: str):
+        """Index the lines of a text.
+
+        Args:
+            text: The text to index.
+
+        Returns:
+            None
+        """
+        self.text = text
+        self.lines = line_index.LineIndex(text, _LINE_BREAK)
+
+    def offset(self, position: dict) -> int:
+        """Convert an LSP position to an offset.
+
+        Positions past the end of a line or of the text are clamped to it,
+        as the protocol requires.
+
+        Args:
+            position: Position with zero-based ``line`` and ``character``.
+
+        Returns:
+            int: The offset into the text.
+        """
+        line = position["line"]
+        if line < 0:
+            return 0
+        if line >= self.lines.line_count:
+            return len(self.text)
+        start = self.lines.start(line)
+        end = self.lines.end(line)
+        character = max(0, position["character"])
+        if self.text[start:end].isascii():
+            return min(start + character, end)
+        units = 0
+        for offset in range(start, end):
+            if units >= character:
+                return offset
+            units += 2 if ord(self.text[offset]) > 0xFFFF else 1
+        return end
+
+    def position(self, offset: int) -> dict:
+        """Convert an offset to an LSP position.
+
+        Args:
+            offset: The offset into the text.
+
+        Returns:
+            dict: Position with zero-based ``line`` and ``character``.
+        """
+        line = max(0, self.lines.line_of(offset))
+        start = self.lines.start(line)
+        return {
+            "line": line,
+            "character": _utf16_length(self.text[start:offset]),
+        }
+
+    def range(self, start: int, end: int) -> dict:
+        """Convert a pair of offsets to an LSP range.
+
+        Args:
+            start: Offset of the first character.
+            end: Offset just past the last character.
+
+        Returns:
+            dict: Range with ``start`` and ``end`` positions.
+        """
+        return {"start": self.position(start), "end": self.position(end)}
+
+
+def apply_change(text: str, change: dict) -> str:
+    """Apply one content change of a didChange notification.
+
+    Args:
+        text: The current document text.
+        change: The change, either with a ``range`` to replace or holding
+            the full new text.
+
+    Returns:
+        str: The updated text.
+    """
+    if "range" not in change:
+        return change["text"]
+    index = PositionIndex(text)
+    start = index.offset(change["range"]["start"])
+    end = max(start, index.offset(change["range"]["end"]))
+    return text[:start] + change["text"] + text[end:]
+
+
+def find_diagnostics(
+    text: str,
+    path: str,
+    valid_keys: set[str] | translation_check.KeyIndex | None,
+) -> list[dict]:
+    """Check a document and describe each violation as a diagnostic.
+
+    Args:
+        text: The document text.
+        path: Path of the document, which selects the checks that apply.
+        valid_keys: Known translation keys, preferably as a KeyIndex, or
+            None to skip the translation check.
+
+    Returns:
+        list: LSP diagnostics, sorted by position. Keys built at runtime
+        that match no known key are warnings, other violations errors.
+    """
+    name = os.path.basename(path)
+    if ".spec." in name or ".test." in name:
+        return []
+
+    located = []
+    if name.endswith(css_check.STYLED_SUFFIXES):
+        for start, end, violation in css_check.locate_embedded_styles(
+            text, path
+        ):
+            located.append(
+                (
+                    start,
+                    end,
+                    "css_check",
+                    violation.violation_type,
+                    " ".join(violation.description.split()),
+                    _SEVERITY_ERROR,
+                )
+            )
+    if valid_keys is not None and name.endswith(
+        translation_check.TRANSLATED_SUFFIXES
+    ):
+        for start, end, key in translation_check.locate_translation_tags(
+            text, path
+        ):
+            if key not in valid_keys:
+                located.append(
+                    (
+                        start,
+                        end,
+                        "translation_check",
+                        "missing-translation-key",
+                        f"Missing translation key: {key}",
+                        _SEVERITY_ERROR,
+                    )
+                )
+        if not isinstance(valid_keys, translation_check.KeyIndex):
+            valid_keys = translation_check.KeyIndex(valid_keys)
+        for start, end, parts in translation_check.locate_dynamic_tags(text):
+            if not valid_keys.matches(parts):
+                located.append(
+                    (
+                        start,
+                        end,
+                        "translation_check",
+                        "unmatched-dynamic-key",
+                        "No translation key matches: " + "*".join(parts),
+                        _SEVERITY_WARNING,
+                    )
+                )
+    if not located:
+        return []
+
+    index = PositionIndex(text)
+    located.sort()
+    return [
+        {
+            "range": index.range(start, end),
+            "severity": severity,
+            "source": source,
+            "code": code,
+            "message": message,
+        }
+        for start, end, source, code, message, severity in located
+    ]
+
+
+class LanguageServer:
+    """Language server holding the open documents and the locale keys.
+
+    Attributes:
+        locales_dir: Directory of the locale files the keys are read from.
+        valid_keys: Index of the known translation keys, or None if they
+            could not be loaded.
+        documents: Text of each open document, by URI.
+    """
+
+    def __init__(self, output: BinaryIO, locales_dir: str):
+        """Create a server writing its messages to a stream.
+
+        Args:
+            output: Binary stream the messages are written to.
+            locales_dir: Directory of the locale files. A relative path is
+                resolved against the workspace root.
+
+        Returns:
+            None
+        """
+        self.output = output
+        self.locales_dir = locales_dir
+        self.valid_keys = None
+        self.documents = {}
+        self.initialized = False
+        self.shutdown_requested = False
+        self._client_capabilities = {}
+        self._requests = {
+            "initialize": self._initialize,
+            "shutdown": self._shutdown,
+        }
+        self._notifications = {
+            "initialized": self._initialized,
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didClose": self._did_close,
+            "workspace/didChangeWatchedFiles": self._did_change_watched_files,
+        }
+
+    def serve(self, stream: BinaryIO) -> int:
+        """Handle messages until the client exits or the stream ends.
+
+        Args:
+            stream: Binary stream the messages are read from.
+
+        Returns:
+            int: The exit code, 0 if the client asked for a shutdown
+            before exiting.
+        """
+        while True:
+            try:
+                message = read_message(stream)
+            except ValueError as exc:
+                # The id of a message that cannot be read is unknown, so
+                # the error goes to id null as JSON-RPC requires
+                self._respond_error(None, _PARSE_ERROR, str(exc))
+                continue
+            if message is not None and not isinstance(message, dict):
+                self._respond_error(
+                    None, _INVALID_REQUEST, "Message is not a JSON object"
+                )
+                continue
+            if message is None or message.get("method") == "exit":
+                return 0 if self.shutdown_requested else 1
+            self.handle(message)
+
+    def handle(self, message: dict) -> None:
+        """Handle one request or notification.
+
+        Args:
+            message: The decoded JSON-RPC message.
+
+        Returns:
+            None
+        """
+        method = message.get("method")
+        if method is None:
+            # Responses to the server's own requests need no handling
+            return
+        if "id" not in message:
+            handler = self._notifications.get(method)
+            if handler is not None and self.initialized:
+                try:
+                    handler(message.get("params") or {})
+                except Exception as exc:
+                    # Notifications get no response, so log the error and
+                    # keep serving the other documents
+                    self._notify(
+                        "window/logMessage",
+                        {
+                            "type": _MESSAGE_ERROR,
+                            "message": f"Failed to handle {method}: {exc!r}",
+                        },
+                    )
+            return
+
+        if method != "initialize" and not self.initialized:
+            self._respond_error(
+                message["id"], _SERVER_NOT_INITIALIZED, "Not initialized"
+            )
+            return
+        handler = self._requests.get(method)
+        if handler is None:
+            self._respond_error(
+                message["id"], _METHOD_NOT_FOUND, f"Unknown method: {method}"
+            )
+            return
+        try:
+            result = handler(message.get("params") or {})
+        except Exception as exc:
+            self._respond_error(message["id"], _INTERNAL_ERROR, str(exc))
+            return
+        write_message(
+            self.output,
+            {"jsonrpc": "2.0", "id": message["id"], "result": result},
+        )
+
+    def _respond_error(self, request_id, code: int, text: str) -> None:
+        """Answer a request with an error.
+
+        Args:
+            request_id: ID of the request.
+            code: JSON-RPC error code.
+            text: Error message.
+
+        Returns:
+            None
+        """
+        write_message(
+            self.output,
+            {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {"code": code, "message": text},
+            },
+        )
+
+    def _notify(self, method: str, params: dict) -> None:
+        """Send a notification to the client.
+
+        Args:
+            method: The notification method.
+            params: Its parameters.
+
+        Returns:
+            None
+        """
+        write_message(
+            self.output, {"jsonrpc": "2.0", "method": method, "params": params}
+        )
+
+    def _load_keys(self) -> None:
+        """Load the translation keys of the locale directory.
+
+        When the directory is missing, the client is warned and the
+        translation check is skipped.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        try:
+            self.valid_keys = translation_check.KeyIndex(
+                translation_check.load_locale_keys(self.locales_dir)
+            )
+        except FileNotFoundError:
+            self.valid_keys = None
+            self._notify(
+                "window/showMessage",
+                {
+                    "type": _MESSAGE_WARNING,
+                    "message": (
+                        f"Locale directory not found: {self.locales_dir}. "
+                        "Translation keys are not checked."
+                    ),
+                },
+            )
+
+    def _publish(self, uri: str) -> None:
+        """Check an open document and publish its diagnostics.
+
+        Args:
+            uri: URI of the document.
+
+        Returns:
+            None
+        """
+        diagnostics = find_diagnostics(
+            self.documents[uri], uri_to_path(uri), self.valid_keys
+        )
+        self._notify(
+            "textDocument/publishDiagnostics",
+            {"uri": uri, "diagnostics": diagnostics},
+        )
+
+    def _initialize(self, params: dict) -> dict:
+        """Handle the initialize request.
+
+        Args:
+            params: The request parameters.
+
+        Returns:
+            dict: The server capabilities.
+        """
+        root_uri = params.get("rootUri")
+        if root_uri and not os.path.isabs(self.locales_dir):
+            self.locales_dir = os.path.join(
+                uri_to_path(root_uri), self.locales_dir
+            )
+        self._client_capabilities = params.get("capabilities") or {}
+        self.initialized = True
+        self._load_keys()
+        return {
+            "capabilities": {
+                "textDocumentSync": {
+                    "openClose": True,
+                    "change": _SYNC_INCREMENTAL,
+                },
+            },
+            "serverInfo": {"name": "talawa-admin-checks"},
+        }
+
+    def _initialized(self, params: dict) -> None:
+        """Ask the client to watch the locale files.
+
+        Clients only report changes to the files servers register watchers
+        for. Registration is skipped when the client does not support it.
+
+        Args:
+            params: The notification parameters.
+
+        Returns:
+            None
+        """
+        watched_files = self._client_capabilities.get("workspace", {}).get(
+            "didChangeWatchedFiles", {}
+        )
+        if not watched_files.get("dynamicRegistration"):
+            return
+        locales_dir = os.path.abspath(self.locales_dir)
+        if watched_files.get("relativePatternSupport"):
+            pattern = {
+                "baseUri": Path(locales_dir).as_uri(),
+                "pattern": "**/*.json",
+            }
+        else:
+            pattern = Path(locales_dir, "**", "*.json").as_posix()
+        write_message(
+            self.output,
+            {
+                "jsonrpc": "2.0",
+                "id": _REGISTER_WATCHER_ID,
+                "method": "client/registerCapability",
+                "params": {
+                    "registrations": [
+                        {
+                            "id": "locale-files",
+                            "method": "workspace/didChangeWatchedFiles",
+                            "registerOptions": {
+                                "watchers": [{"globPattern": pattern}]
+                            },
+                        }
+                    ]
+                },
+            },
+        )
+
+    def _shutdown(self, params: dict) -> None:
+        """Handle the shutdown request.
+
+        Args:
+            params: The request parameters.
+
+        Returns:
+            None
+        """
+        self.shutdown_requested = True
+        self.documents.clear()
+
+    def _did_open(self, params: dict) -> None:
+        """Track a newly opened document and check it.
+
+        Args:
+            params: The notification parameters.
+
+        Returns:
+            None
+        """
+        document = params["textDocument"]
+        self.documents[document["uri"]] = document["text"]
+        self._publish(document["uri"])
+
+    def _did_change(self, params: dict) -> None:
+        """Apply edits to an open document and check it again.
+
+        Args:
+            params: The notification parameters.
+
+        Returns:
+            None
+        """
+        uri = params["textDocument"]["uri"]
+        if uri not in self.documents:
+            return
+        text = self.documents[uri]
+        for change in params["contentChanges"]:
+            text = apply_change(text, change)
+        self.documents[uri] = text
+        self._publish(uri)
+
+    def _did_close(self, params: dict) -> None:
+        """Forget a closed document and clear its diagnostics.
+
+        Args:
+            params: The notification parameters.
+
+        Returns:
+            None
+        """
+        uri = params["textDocument"]["uri"]
+        self.documents.pop(uri, None)
+        self._notify(
+            "textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []}
+        )
+
+    def _did_change_watched_files(self, params: dict) -> None:
+        """Reload the locale keys when a locale file changed.
+
+        Args:
+            params: The notification parameters.
+
+        Returns:
+            None
+        """
+        locales_dir = os.path.abspath(self.locales_dir)
+        if not any(
+            os.path.abspath(uri_to_path(change["uri"])).startswith(
+                locales_dir + os.sep
+            )
+            for change in params.get("changes", [])
+        ):
+            return
+        self._load_keys()
+        for uri in self.documents:
+            self._publish(uri)
+
+
+def main() -> None:
+    """Run the language server on stdin and stdout.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    Raises:
+        SystemExit: Exits with status code 0 after a shutdown request, or
+            1 when the client exits without one.
+    """
+    parser = argparse.ArgumentParser(
+        description="Serve css_check and translation_check over LSP."
+    )
+    parser.add_argument(
+        "--locales-dir",
+        default="public/locales/en",
+        help="Directory of the locale files, relative to the workspace.",
+    )
+    args = parser.parse_args()
+
+    server = LanguageServer(sys.stdout.buffer, args.locales_dir)
+    sys.exit(server.serve(sys.stdin.buffer))
+
+
+if __name__ == "__main__":
+    main()
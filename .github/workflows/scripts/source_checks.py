@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Run the CSS and translation checks in a single pass over the sources.
+
+css_check.py and translation_check.py each start Python, walk the tree
+and read the same TypeScript sources. This driver discovers the sources
+once, reads and decodes each file once, and hands the same buffer to
+check_embedded_styles and find_translation_tags. The report holds the
+CSS section followed by the translation section, as each script prints
+them.
+
+Exit codes:
+    0: Both checks passed.
+    1: The CSS check failed.
+    2: Invalid arguments or configuration, such as a missing locale
+        directory or an unknown git reference.
+    4: The translation check failed.
+    5: Both checks failed.
+
+Usage:
+    python source_checks.py --directories src
+    python source_checks.py --since origin/develop
+
+The pull request workflow runs it with --since, excluding src/utils and
+src/types from the CSS check and scripts/__fixtures__ from the
+translation check.
+"""
+
+import argparse
+import os
+import sys
+from collections import namedtuple
+from collections.abc import Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import css_check  # noqa: E402
+import file_discovery  # noqa: E402
+import translation_check  # noqa: E402
+
+EXIT_CSS = 1
+EXIT_CONFIGURATION = 2
+EXIT_TRANSLATION = 4
+
+# Which checks apply to a discovered source file
+SourceFile = namedtuple("SourceFile", ["path", "css", "translation"])
+
+# File name filters of each check, which skip .test. and .spec. files
+_is_styled = file_discovery.compile_filter(css_check.STYLED_SUFFIXES)
+_is_translated = file_discovery.compile_filter(
+    translation_check.TRANSLATED_SUFFIXES
+)
+
+
+def _select(
+    path: str,
+    in_test_directory: bool,
+    css_excluded: bool,
+    translation_excluded: bool = False,
+) -> SourceFile | None:
+    """Decide which checks apply to a file.
+
+    The CSS check skips test directories and its excluded directories,
+    while the translation check, like translation_check.py, only skips
+    test files and its own excluded directories.
+
+    Args:
+        path: Path of the file.
+        in_test_directory: Whether the file is inside a test directory.
+        css_excluded: Whether the file is inside a directory excluded from
+            the CSS check.
+        translation_excluded: Whether the file is inside a directory
+            excluded from the translation check.
+
+    Returns:
+        SourceFile: The checks to run, or None if none applies.
+    """
+    name = os.path.basename(path)
+    translation = _is_translated(name) and not translation_excluded
+    css = _is_styled(name) and not in_test_directory and not css_excluded
+    if not css and not translation:
+        return None
+    return SourceFile(path, css, translation)
+
+
+def discover_sources(
+    directories: list[str],
+    files: list[str],
+    exclude_directories: list[str],
+    exclude_translation_directories: list[str] | None = None,
+) -> list[SourceFile]:
+    """Collect the source files to check, listing each directory once.
+
+    Directories are listed through file_discovery, so files that git
+    ignores are skipped. Exclusions are matched the way css_check.py
+    matches them, for the listed files as well.
+
+    Args:
+        directories: Directories to scan recursively.
+        files: Specific files to check.
+        exclude_directories: Directories excluded from the CSS check.
+        exclude_translation_directories: Directories excluded from the
+            translation check.
+
+    Returns:
+        sources: Each file with the checks that apply to it, in scan
+        order.
+    """
+    css_excluded = set(
+        os.path.abspath(directory) for directory in exclude_directories
+    )
+    translation_excluded = set(
+        os.path.abspath(directory)
+        for directory in exclude_translation_directories or []
+    )
+    sources = []
+    seen = set()
+
+    def add(path: str, in_test_directory: bool) -> None:
+        """Add a file unless it was already found.
+
+        Args:
+            path: Path of the file.
+            in_test_directory: Whether the file is inside a test directory.
+
+        Returns:
+            None
+        """
+        absolute = os.path.abspath(path)
+        if absolute in seen:
+            return
+        source = _select(
+            path,
+            in_test_directory,
+            css_check._is_inside(absolute, css_excluded),
+            css_check._is_inside(absolute, translation_excluded),
+        )
+        if source is not None:
+            seen.add(absolute)
+            sources.append(source)
+
+    for directory in directories:
+        if not os.path.isdir(directory):
+            print(
+                f"Warning: Directory not found: {directory}", file=sys.stderr
+            )
+            continue
+        is_test = os.path.basename(os.path.abspath(directory))
+        is_test = is_test in file_discovery.TEST_DIRECTORIES
+        for path in file_discovery.list_files(os.path.abspath(directory)):
+            parts = path.split("/")
+            in_test_directory = (
+                is_test
+                or not file_discovery.TEST_DIRECTORIES.isdisjoint(parts[:-1])
+            )
+            add(os.path.join(directory, *parts), in_test_directory)
+
+    for file_path in files:
+        if os.path.isfile(file_path):
+            add(file_path, False)
+        else:
+            print(f"Warning: File not found: {file_path}", file=sys.stderr)
+
+    return sources
+
+
+def check_sources(
+    sources: list[SourceFile],
+    valid_keys: set[str] | None,
+    missing_keys: dict[str, list[str]],
+    unmatched_keys: dict[str, list[str]] | None = None,
+) -> Iterator[tuple[str, list[css_check.DetailedViolation]]]:
+    """Read each source once and run the checks that apply to it.
+
+    The CSS violations are yielded file by file, so that the CSS report
+    can be streamed, while the missing translation keys are collected.
+    Files are read in sorted absolute path order, the order css_check.py
+    reports them in.
+
+    Args:
+        sources: The files to check, as returned by discover_sources.
+        valid_keys: Known translation keys, or None to skip the
+            translation check.
+        missing_keys: Filled with the sorted missing keys of each file
+            that has some.
+        unmatched_keys: Optionally filled with the keys built at runtime
+            that match no known key, by file, as found by
+            translation_check.find_unmatched_dynamic_keys.
+
+    Yields:
+        tuple: The absolute path of each file checked for CSS violations
+        and its violations.
+    """
+    key_index = None
+    if valid_keys is not None and unmatched_keys is not None:
+        key_index = translation_check.KeyIndex(valid_keys)
+
+    for source in sorted(sources, key=lambda s: os.path.abspath(s.path)):
+        try:
+            with open(source.path, "rb") as f:
+                content = f.read().decode("utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error reading file {source.path}: {e}", file=sys.stderr)
+            continue
+
+        if source.translation and valid_keys is not None:
+            tags = translation_check.locate_translation_tags(
+                content, source.path
+            )
+            missing = sorted(
+                {tag for _, _, tag in tags if tag not in valid_keys}
+            )
+            if missing:
+                missing_keys[source.path] = missing
+            if key_index is not None:
+                unmatched = translation_check.find_unmatched_dynamic_keys(
+                    content, key_index
+                )
+                if unmatched:
+                    unmatched_keys[source.path] = unmatched
+
+        if source.css:
+            file_path = os.path.abspath(source.path)
+            yield file_path, css_check.check_embedded_styles(
+                content, file_path
+            )
+
+
+def main() -> None:
+    """Run both checks and report their results.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    Raises:
+        SystemExit: Exits with the sum of the codes of the failed checks,
+            EXIT_CSS and EXIT_TRANSLATION, or with EXIT_CONFIGURATION for
+            configuration errors.
+    """
+    parser = argparse.ArgumentParser(
+        description="""Run the CSS and translation checks, reading each
+        source file once."""
+    )
+    parser.add_argument(
+        "--directories",
+        nargs="*",
+        default=[],
+        help="Directories to check (default: src).",
+    )
+    parser.add_argument(
+        "--files",
+        nargs="*",
+        default=[],
+        help="Specific files to check.",
+    )
+    parser.add_argument(
+        "--exclude_directories",
+        nargs="*",
+        default=[],
+        help="Directories to exclude from the CSS check.",
+    )
+    parser.add_argument(
+        "--exclude_translation_directories",
+        nargs="*",
+        default=[],
+        help="Directories to exclude from the translation check.",
+    )
+    parser.add_argument(
+        "--since",
+        metavar="GIT_REF",
+        help="""Check only the files changed since the merge base with
+        GIT_REF. CSS violations are only reported on changed lines.""",
+    )
+    parser.add_argument(
+        "--locales-dir",
+        default="public/locales/en",
+        help="Directory of the locale files.",
+    )
+    parser.add_argument(
+        "--checks",
+        nargs="+",
+        choices=["css", "translation"],
+        default=["css", "translation"],
+        help="Checks to run (default: both).",
+    )
+    args = parser.parse_args()
+
+    if args.since and (args.directories or args.files):
+        parser.error(
+            "--since cannot be combined with --directories or --files."
+        )
+
+    valid_keys = None
+    if "translation" in args.checks:
+        try:
+            valid_keys = translation_check.load_locale_keys(args.locales_dir)
+        except FileNotFoundError as exc:
+            print(
+                f"Error: Locale directory not found: {exc}",
+                file=sys.stderr,
+            )
+            sys.exit(EXIT_CONFIGURATION)
+
+    changed_lines = None
+    directories = args.directories
+    files = args.files
+    if args.since:
+        try:
+            changed_lines = css_check.get_changed_lines(args.since)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(EXIT_CONFIGURATION)
+        files = sorted(os.path.relpath(path) for path in changed_lines)
+    elif not directories and not files:
+        directories = ["src"]
+
+    sources = discover_sources(
+        directories,
+        files,
+        args.exclude_directories,
+        args.exclude_translation_directories,
+    )
+    if "css" not in args.checks:
+        sources = [source._replace(css=False) for source in sources]
+
+    missing_keys = {}
+    unmatched_keys = {}
+    results = check_sources(sources, valid_keys, missing_keys, unmatched_keys)
+    try:
+        css_violations = css_check.stream_violation_output(
+            results, changed_lines
+        )
+    finally:
+        results.close()
+
+    exit_code = 0
+    if "css" in args.checks:
+        if css_violations:
+            exit_code |= EXIT_CSS
+        else:
+            print("✓ No embedded CSS violations found.")
+
+    if "translation" in args.checks:
+        for source in sources:
+            if source.path in unmatched_keys:
+                print(
+                    translation_check.format_unmatched_warnings(
+                        source.path, unmatched_keys[source.path]
+                    ),
+                    file=sys.stderr,
+                )
+        if missing_keys:
+            for source in sources:
+                if source.path in missing_keys:
+                    print(
+                        translation_check.format_file_errors(
+                            source.path, missing_keys[source.path]
+                        )
+                    )
+            exit_code |= EXIT_TRANSLATION
+        else:
+            print("All translation tags validated successfully")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
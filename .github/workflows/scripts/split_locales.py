@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Split the locale files into bundles loaded per route.
+
+src/utils/i18n.ts loads the whole ``translation``, ``errors`` and
+``common`` namespaces on every page, while each screen only uses a slice
+of them. This build step scans the sources with the key extraction of
+translation_check.py and writes, for every locale and namespace:
+
+    <output>/<locale>/_shared/<namespace>.json
+        The keys used outside src/screens, by the components, hooks and
+        utilities any route may render.
+    <output>/<locale>/<route>/<namespace>.json
+        The keys a route uses on top of the shared ones, where a route is
+        a directory of src/screens such as ``AdminPortal/OrgList``.
+
+Bundles keep the nesting of the locale files, so a route needs the shared
+bundle and its own bundle of each namespace, merged with
+``i18n.addResourceBundle``, to resolve every key it uses. Keys that no
+source is found to use go to the shared bundles, since keys passed to t()
+in variables cannot always be traced. --drop-unused leaves them out,
+except in the namespaces where such calls make the usage unknown. The
+bundles are written as compact JSON, after the bundles of an earlier run
+are removed.
+
+``manifest.json`` lists the namespaces, locales and routes with the
+directory, number of keys and size of each bundle, along with the size of
+the full namespaces, so the app can map routes to bundles and the savings
+can be tracked.
+
+Usage:
+    python split_locales.py --output-dir build/locales
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import translation_check  # noqa: E402
+
+# Namespaces loaded by src/utils/i18n.ts
+NAMESPACES = ("translation", "errors", "common")
+SHARED_BUNDLE = "_shared"
+
+# Number of keys and size in bytes of one bundle of one locale
+BundleSize = namedtuple("BundleSize", ["keys", "bytes"])
+
+
+def group_by_route(
+    paths: list[Path], screens_dir: str | Path, depth: int = 2
+) -> dict[str | None, list[Path]]:
+    """Group source files by the route directory they are in.
+
+    Args:
+        paths: The source files.
+        screens_dir: Directory holding the screens.
+        depth: Number of directories below screens_dir that name a route,
+            such as two for ``AdminPortal/OrgList``.
+
+    Returns:
+        dict: The files of each route, by route name with ``/``
+        separators, and the files of no route under None.
+    """
+    screens = Path(screens_dir).resolve()
+    groups: dict[str | None, list[Path]] = {}
+    for path in paths:
+        route = None
+        try:
+            parts = path.resolve().relative_to(screens).parts
+        except ValueError:
+            parts = ()
+        if len(parts) > depth:
+            route = "/".join(parts[:depth])
+        groups.setdefault(route, []).append(path)
+    return groups
+
+
+def _select_keys(data: dict, keys: set[str], prefix: str = "") -> dict:
+    """Copy the part of locale JSON holding some keys.
+
+    Args:
+        data: Parsed locale JSON.
+        keys: The flattened keys to keep.
+        prefix: Prefix of the keys of data.
+
+    Returns:
+        dict: The copy, without objects left empty.
+    """
+    result = {}
+    for key, value in data.items():
+        flat_key = f"{prefix}{key}"
+        if isinstance(value, dict):
+            value = _select_keys(value, keys, f"{flat_key}.")
+            if value:
+                result[key] = value
+        elif flat_key in keys:
+            result[key] = value
+    return result
+
+
+def _write_bundle(path: Path, data: dict) -> int:
+    """Write a bundle as compact JSON.
+
+    Args:
+        path: Path of the bundle.
+        data: The bundle.
+
+    Returns:
+        int: Size of the bundle in bytes.
+    """
+    content = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    encoded = content.encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(encoded)
+    return len(encoded)
+
+
+def _clear_output(output: Path, locales: list[str]) -> None:
+    """Remove the bundles and manifest of an earlier run.
+
+    Only the locale directories listed in the earlier manifest or about to
+    be written are removed, so other files of the directory are kept.
+
+    Args:
+        output: Directory the bundles are written to.
+        locales: The locales about to be written.
+
+    Returns:
+        None
+    """
+    manifest_path = output / "manifest.json"
+    stale = set(locales)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            stale.update(json.load(f).get("locales", []))
+    except (OSError, json.JSONDecodeError, AttributeError):
+        pass
+    for locale in stale:
+        shutil.rmtree(output / locale, ignore_errors=True)
+    if manifest_path.exists():
+        manifest_path.unlink()
+
+
+def split_locales(
+    locales_root: str | Path,
+    output_dir: str | Path,
+    usages: dict[str | None, translation_check.KeyUsage],
+    drop_unused: bool = False,
+) -> dict:
+    """Write the shared and route bundles of every locale.
+
+    Args:
+        locales_root: Directory holding a directory per locale.
+        output_dir: Directory the bundles are written to. The bundles of an
+            earlier run are removed first.
+        usages: The keys used by the files of each route, and by the files
+            of no route under None, from group_by_route and
+            translation_check.scan_key_usage.
+        drop_unused: Whether to leave out the keys no file uses instead of
+            putting them in the shared bundles. They are kept in the
+            namespaces where calls with keys held in variables make the
+            usage unknown.
+
+    Returns:
+        dict: The manifest.
+    """
+    output = Path(output_dir)
+    routes = sorted(route for route in usages if route is not None)
+    shared_usage = usages.get(
+        None, translation_check.KeyUsage(set(), set(), set(), set())
+    )
+    all_usage = translation_check.merge_key_usage(usages.values())
+    locales = sorted(
+        path.name for path in Path(locales_root).iterdir() if path.is_dir()
+    )
+    _clear_output(output, locales)
+    warned = set()
+    full = {}
+    shared = {}
+    bundles = {route: {} for route in routes}
+
+    for locale in locales:
+        sizes = {route: [0, 0] for route in [SHARED_BUNDLE, *routes]}
+        full_bytes = 0
+        for namespace in NAMESPACES:
+            path = Path(locales_root) / locale / f"{namespace}.json"
+            if not path.exists():
+                continue
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError) as exc:
+                print(
+                    f"Warning: Failed to parse {path}: {exc}",
+                    file=sys.stderr,
+                )
+                continue
+            full_bytes += len(
+                json.dumps(
+                    data, ensure_ascii=False, separators=(",", ":")
+                ).encode("utf-8")
+            )
+            index = translation_check.KeyIndex(
+                translation_check.get_keys(data)
+            )
+
+            selected = {
+                route: translation_check.find_used_keys(index, usages[route])
+                for route in routes
+            }
+            shared_keys = translation_check.find_used_keys(index, shared_usage)
+            unresolved = translation_check.find_unresolved_files(
+                all_usage, namespace
+            )
+            if drop_unused and unresolved and namespace not in warned:
+                warned.add(namespace)
+                print(
+                    f"Warning: Keeping the unused keys of {namespace}, which "
+                    f"keys held in variables may use in {len(unresolved)} "
+                    "files",
+                    file=sys.stderr,
+                )
+            if not drop_unused or unresolved:
+                used = shared_keys.union(*selected.values())
+                shared_keys.update(
+                    key for key in index.starting_with("") if key not in used
+                )
+            selected[SHARED_BUNDLE] = shared_keys
+            for route, keys in selected.items():
+                if route != SHARED_BUNDLE:
+                    keys -= shared_keys
+                size = _write_bundle(
+                    output / locale / route / f"{namespace}.json",
+                    _select_keys(data, keys),
+                )
+                sizes[route][0] += len(keys)
+                sizes[route][1] += size
+
+        full[locale] = full_bytes
+        shared[locale] = BundleSize(*sizes[SHARED_BUNDLE])._asdict()
+        for route in routes:
+            bundles[route][locale] = BundleSize(*sizes[route])._asdict()
+
+    manifest = {
+        "namespaces": list(NAMESPACES),
+        "locales": locales,
+        "full_bytes": full,
+        "shared": {"path": SHARED_BUNDLE, "sizes": shared},
+        "routes": {
+            route: {"path": route, "sizes": bundles[route]} for route in routes
+        },
+    }
+    output.mkdir(parents=True, exist_ok=True)
+    with open(output / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    return manifest
+
+
+def format_manifest(manifest: dict, locale: str) -> str:
+    """Format the bundle sizes of a locale as a table.
+
+    Args:
+        manifest: The manifest, from split_locales.
+        locale: The locale to describe.
+
+    Returns:
+        str: The table, with the first load of each route, its own bundle
+        and the shared one, compared with loading the full namespaces.
+    """
+    full = manifest["full_bytes"][locale]
+    shared = manifest["shared"]["sizes"][locale]
+    lines = [
+        f"Locale {locale}: {full} bytes in full, shared bundle "
+        f"{shared['bytes']} bytes ({shared['keys']} keys)",
+        f"{'Route':<48}{'Keys':>8}{'Bytes':>10}{'First load':>14}",
+    ]
+    for route, entry in manifest["routes"].items():
+        size = entry["sizes"][locale]
+        first_load = shared["bytes"] + size["bytes"]
+        share = first_load / full * 100 if full else 0.0
+        lines.append(
+            f"{route:<48}{size['keys']:>8}{size['bytes']:>10}"
+            f"{share:>13.1f}%"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Split the locale files and write the manifest.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    Raises:
+        SystemExit: Exits with status code 0 on success, or 2 for
+            configuration errors.
+    """
+    parser = argparse.ArgumentParser(
+        description="""Split the locale files into a shared bundle and a
+        bundle per route, based on the keys each route uses."""
+    )
+    parser.add_argument(
+        "--output-dir",
+        required=True,
+        help="Directory the bundles and manifest.json are written to.",
+    )
+    parser.add_argument(
+        "--src-dir",
+        default="src",
+        help="Directory of the sources (default: src).",
+    )
+    parser.add_argument(
+        "--screens-dir",
+        default="src/screens",
+        help="Directory whose subdirectories are routes (default: "
+        "src/screens).",
+    )
+    parser.add_argument(
+        "--route-depth",
+        type=int,
+        default=2,
+        help="""Number of directories below the screens directory that
+        name a route (default: 2, as in AdminPortal/OrgList).""",
+    )
+    parser.add_argument(
+        "--locales-root",
+        default="public/locales",
+        help="Directory holding a directory per locale (default: "
+        "public/locales).",
+    )
+    parser.add_argument(
+        "--locale",
+        default="en",
+        help="Locale whose bundle sizes are printed (default: en).",
+    )
+    parser.add_argument(
+        "--drop-unused",
+        action="store_true",
+        help="""Leave out the keys no source is found to use instead of
+        putting them in the shared bundles, except in the namespaces where
+        keys held in variables make the usage unknown.""",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="""Number of processes used to scan the sources (default:
+        number of CPUs).""",
+    )
+    args = parser.parse_args()
+    if args.route_depth < 1:
+        parser.error("--route-depth must be at least 1.")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
+
+    if not os.path.isdir(args.locales_root):
+        print(
+            f"Error: Locale directory not found: {args.locales_root}",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+    if not os.path.isdir(args.src_dir):
+        print(
+            f"Error: Source directory not found: {args.src_dir}",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+    if Path(args.output_dir).resolve() == Path(args.locales_root).resolve():
+        print(
+            "Error: The output directory cannot be the locale directory.",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+
+    paths = translation_check.get_target_files(directories=[args.src_dir])
+    routes = group_by_route(paths, args.screens_dir, args.route_depth)
+    # Scan all files in one pool, then combine them per route
+    file_usages = dict(
+        zip(paths, translation_check.iter_key_usage(paths, args.jobs))
+    )
+    usages = {
+        route: translation_check.merge_key_usage(
+            file_usages[path] for path in route_paths
+        )
+        for route, route_paths in routes.items()
+    }
+
+    manifest = split_locales(
+        args.locales_root, args.output_dir, usages, args.drop_unused
+    )
+    if args.locale in manifest["locales"]:
+        print(format_manifest(manifest, args.locale))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Tests for the benchmark module."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmark import (  # noqa: E402
+    BenchmarkResult,
+    compare_to_baseline,
+    generate_locale_tree,
+    generate_tsx_tree,
+    main,
+    result_to_json,
+)
+from css_check import check_files  # noqa: E402
+
+
+class TestCorpusGenerators(unittest.TestCase):
+    """Test suite for the corpus generators."""
+
+    def setUp(self):
+        """Set up test directory."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test directory."""
+        shutil.rmtree(self.test_dir)
+
+    def _read_tree(self, root):
+        """Read every file of a tree.
+
+        Args:
+            root: Root directory of the tree.
+
+        Returns:
+            dict: The content of each file, by path relative to root.
+        """
+        contents = {}
+        for directory, _, names in os.walk(root):
+            for name in names:
+                path = os.path.join(directory, name)
+                with open(path, encoding="utf-8") as f:
+                    contents[os.path.relpath(path, root)] = f.read()
+        return contents
+
+    def test_tsx_tree_is_reproducible(self):
+        """Test that the same seed generates the same TSX tree."""
+        first = os.path.join(self.test_dir, "first")
+        second = os.path.join(self.test_dir, "second")
+        generate_tsx_tree(first, 120, keys=["a.b"], seed=7)
+        generate_tsx_tree(second, 120, keys=["a.b"], seed=7)
+
+        self.assertEqual(len(self._read_tree(first)), 120)
+        self.assertEqual(self._read_tree(first), self._read_tree(second))
+
+    def test_violation_density(self):
+        """Test that violations appear only when the density allows."""
+        clean = os.path.join(self.test_dir, "clean")
+        dirty = os.path.join(self.test_dir, "dirty")
+        generate_tsx_tree(clean, 5, violation_density=0)
+        generate_tsx_tree(dirty, 5, violation_density=1, lines=10)
+
+        self.assertEqual(check_files([clean], [], [], []).violations, [])
+        self.assertGreaterEqual(
+            len(check_files([dirty], [], [], []).violations), 50
+        )
+
+    def test_locale_tree(self):
+        """Test that every language has the files and nesting requested."""
+        keys = generate_locale_tree(
+            self.test_dir, languages=2, keys=30, depth=3, missing=0
+        )
+        contents = self._read_tree(self.test_dir)
+
+        self.assertEqual(len(contents), 9)
+        self.assertTrue(all(key.count(".") == 2 for key in keys))
+        english = json.loads(contents[os.path.join("en", "common.json")])
+        other = json.loads(contents[os.path.join("l01", "common.json")])
+        self.assertEqual(english.keys(), other.keys())
+
+
+class TestBaselineComparison(unittest.TestCase):
+    """Test suite for baseline comparison."""
+
+    def test_result_to_json_computes_throughput(self):
+        """Test that throughput is derived from the fastest run."""
+        result = BenchmarkResult("a", 10, 2 * 1024 * 1024, 2.0, 5)
+        report = result_to_json(result)
+        self.assertEqual(report["files_per_second"], 5.0)
+        self.assertEqual(report["mb_per_second"], 1.0)
+
+    def test_regressions_above_threshold(self):
+        """Test that only drops beyond the threshold are regressions."""
+        baseline = {
+            "results": {
+                "fast": {"files_per_second": 100.0},
+                "slow": {"files_per_second": 100.0},
+            }
+        }
+        results = {
+            "results": {
+                "fast": {"files_per_second": 95.0},
+                "slow": {"files_per_second": 80.0},
+                "new": {"files_per_second": 1.0},
+            }
+        }
+        regressions = compare_to_baseline(results, baseline, 0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("slow: 80.0 files/s"))
+
+    def test_main_fails_on_regression(self):
+        """Test that main exits with code 1 when a check got slower."""
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        baseline_path = os.path.join(test_dir, "baseline.json")
+        output_path = os.path.join(test_dir, "results.json")
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"results": {"css_check": {"files_per_second": 1e12}}}, f
+            )
+        test_args = ["benchmark.py", "--files", "3", "--repeat", "1"]
+        test_args += ["--languages", "1", "--locale-keys", "10"]
+        test_args += ["--output", output_path, "--baseline", baseline_path]
+
+        with patch("sys.argv", test_args):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                with patch("sys.stderr", new_callable=StringIO):
+                    with self.assertRaises(SystemExit) as cm:
+                        main()
+        self.assertEqual(cm.exception.code, 1)
+        self.assertIn("css_check:", mock_stdout.getvalue())
+        with open(output_path, encoding="utf-8") as f:
+            report = json.load(f)
+        self.assertEqual(
+            sorted(report["results"]),
+            [
+                "compare_translations",
+                "css_check",
+                "locale_keys_parsed",
+                "locale_keys_snapshot",
+                "translation_check",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,26 +2,48 @@
 # -*- coding: UTF-8 -*-
 """Comprehensive unit tests for css_check.py with 100% code coverage."""
 
+import json
 import unittest
 import tempfile
 import os
+import pickle
+import re
 import sys
+import time
 from unittest.mock import patch
 from io import StringIO
 import shutil
+import subprocess
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 )
 
 from css_check import (
+    _literal_trie,
+    _map_file,
+    _ruleset_hash,
     check_embedded_styles,
+    analyze_source,
+    lex_code_spans,
     process_typescript_file,
     check_files,
+    iter_file_violations,
+    stream_violation_output,
     validate_directories_input,
     format_violation_output,
+    get_changed_lines,
+    filter_changed_lines,
     DetailedViolation,
     CSSCheckResult,
+    ResultCache,
+    PrefilterStats,
+    ScanProfile,
+    ViolationStore,
+    ViolationSummary,
+    summarize_violations,
+    ViolationWatcher,
+    diff_violations,
     main,
 )
 
@@ -162,6 +184,65 @@ class TestCheckEmbeddedStyles(unittest.TestCase):
         self.assertEqual(violations[0].code_snippet, "#00ff00")
         self.assertEqual(violations[0].line_number, 3)
 
+    def test_checks_code_after_comment_marker_in_string(self):
+        """Test that a comment marker inside a string hides nothing."""
+        content = "<input accept=\"image/*\" />\nconst c = '#fff';"
+        violations = check_embedded_styles(content, "test.tsx")
+        self.assertEqual(len(violations), 1)
+        self.assertEqual(violations[0].line_number, 2)
+
+    def test_handles_crlf_line_endings(self):
+        """Test line numbers for files with CRLF line endings."""
+        content = "const a = 1;\r\n/* x\r\n */\r\nconst c = '#fff';"
+        violations = check_embedded_styles(content, "test.tsx")
+        self.assertEqual(len(violations), 1)
+        self.assertEqual(violations[0].line_number, 4)
+
+    def test_bytes_content_matches_text_content(self):
+        """Test that UTF-8 bytes give the same violations as text."""
+        content = (
+            "const a = 'caf\u00e9 // #000';\u2028const b = '#fff';\n"
+            "const c = \"\u00e9\";\u2029<div style={{ fontSize: '1px' }}>"
+        )
+        violations = check_embedded_styles(content, "test.tsx")
+        self.assertEqual(
+            check_embedded_styles(content.encode("utf-8"), "test.tsx"),
+            violations,
+        )
+        self.assertEqual([v.line_number for v in violations], [1, 2, 4, 4, 4])
+
+    def test_prefilter_skips_files_without_literals(self):
+        """Test that files no rule can match are not lexed."""
+        content = "const name = 'test';\n// #fff is in a comment\n"
+        with patch("css_check.analyze_source") as mock_analyze:
+            violations = check_embedded_styles(content.replace("#", ""), "a")
+        self.assertEqual(violations, [])
+        mock_analyze.assert_not_called()
+        self.assertEqual(check_embedded_styles(content, "test.tsx"), [])
+
+    def test_prefilter_counts_hits_and_skips(self):
+        """Test that the prefilter counts the lines each rule needs."""
+        stats = PrefilterStats()
+        content = "const a = 1;\nconst b = '#fff';\nconst c = 2;"
+        check_embedded_styles(content, "test.tsx", stats)
+        check_embedded_styles("const d = 3;", "test.tsx", stats)
+
+        self.assertEqual(stats.files_scanned, 1)
+        self.assertEqual(stats.files_skipped, 1)
+        self.assertEqual(stats.lines_scanned, 1)
+        self.assertEqual(stats.lines_skipped, 3)
+        self.assertEqual(stats.rule_hits["hex_color"], 1)
+        self.assertEqual(stats.rule_skips["hex_color"], 3)
+        self.assertEqual(stats.rule_skips["pixel_value"], 4)
+
+    def test_prefilter_keeps_longest_literal(self):
+        """Test that the literal trie matches the longest literal."""
+        pattern = re.compile(_literal_trie(["a", "ab", "abcd", "b"]))
+        self.assertEqual(
+            [hit.group(0) for hit in pattern.finditer("abcd abc a b")],
+            ["abcd", "ab", "a", "b"],
+        )
+
     def test_ignores_import_statements(self):
         """Test that import statements are ignored."""
         content = "import { colors } from './colors';"
@@ -211,8 +292,8 @@ class TestCheckEmbeddedStyles(unittest.TestCase):
         self.assertEqual(len(camelcase_violations), 0)
 
     def test_camelcase_in_object_with_brace(self):
-        """Test camelCase detection in object context."""
-        content = "{ backgroundColor: 'red' }"
+        """Test camelCase detection in a style object."""
+        content = "const buttonStyle = { backgroundColor: 'red' }"
         violations = check_embedded_styles(content, "test.tsx")
         self.assertEqual(len(violations), 1)
         self.assertEqual(
@@ -229,12 +310,57 @@ class TestCheckEmbeddedStyles(unittest.TestCase):
         ]
         self.assertEqual(len(pixel_violations), 0)
 
-    def test_pixel_value_with_width_keyword(self):
-        """Test pixel value detection with 'width' keyword."""
-        content = "const width: '100px',"
+    def test_pixel_value_in_sx_prop(self):
+        """Test pixel value detection in an sx prop."""
+        content = "<Box sx={{ width: '100px', }} />"
         violations = check_embedded_styles(content, "test.tsx")
         self.assertGreaterEqual(len(violations), 1)
 
+    def test_sizes_outside_style_objects_ignored(self):
+        """Test that sizes in non-style objects and strings are ignored."""
+        content = (
+            "const columns = [{ field: 'a', minWidth: 100, width: '10px' }];\n"
+            "const css = 'a { top: 8px }';"
+        )
+        self.assertEqual(check_embedded_styles(content, "test.tsx"), [])
+
+    def test_multi_line_style_object(self):
+        """Test that every key of a multi-line style object is reported."""
+        content = (
+            "const dataGridStyle = {\n"
+            "  '& .row': {\n"
+            "    backgroundColor: 'transparent',\n"
+            "  },\n"
+            "  borderRadius: '8px',\n"
+            "};"
+        )
+        violations = check_embedded_styles(content, "test.ts")
+        self.assertEqual(
+            [(v.line_number, v.violation_type) for v in violations],
+            [
+                (3, "camelcase_css_property"),
+                (5, "camelcase_css_property"),
+                (5, "pixel_value"),
+            ],
+        )
+
+    def test_style_member_assignment(self):
+        """Test camelCase detection when set on a style object."""
+        content = "element.style.fontSize = size;\nconfig.fontSize = size;"
+        violations = check_embedded_styles(content, "test.ts")
+        self.assertEqual([v.line_number for v in violations], [1])
+
+    def test_urls_inside_style_objects_ignored(self):
+        """Test that only the URL itself is skipped on a line."""
+        content = (
+            "<a href=\"#top\" style={{ background: 'url(#f00)', "
+            "color: '#fff' }} />"
+        )
+        violations = check_embedded_styles(content, "test.tsx")
+        self.assertEqual(
+            [v.code_snippet for v in violations], ["#fff", "style={{"]
+        )
+
     def test_multiple_violation_types_in_one_line(self):
         """Test detection of multiple violation types in a single line."""
         content = (
@@ -246,6 +372,249 @@ class TestCheckEmbeddedStyles(unittest.TestCase):
         self.assertIn("hex_color", violation_types)
         self.assertIn("camelcase_css_property", violation_types)
 
+    def test_same_line_violations_reported_in_rule_order(self):
+        """Test that violations on one line follow the rule table order."""
+        content = "const style = { fontSize: '16px', color: '#ff0000' };"
+        violations = check_embedded_styles(content, "test.tsx")
+        self.assertEqual(
+            [v.violation_type for v in violations],
+            ["hex_color", "camelcase_css_property", "pixel_value"],
+        )
+
+    def test_matches_do_not_span_lines(self):
+        """Test that a rule never matches across a line break."""
+        content = "const style = { width: '100px'\n};"
+        violations = check_embedded_styles(content, "test.tsx")
+        self.assertEqual(len(violations), 0)
+
+    def test_line_numbers_after_skipped_lines(self):
+        """Test line numbers are kept when lines are skipped."""
+        content = "import x from 'y';\n// '#000'\nconst c = '#fff';"
+        violations = check_embedded_styles(content, "test.tsx")
+        self.assertEqual(len(violations), 1)
+        self.assertEqual(violations[0].line_number, 3)
+
+
+class TestLexCodeSpans(unittest.TestCase):
+    """Test suite for lex_code_spans function."""
+
+    def _code(self, content):
+        """Return the code regions of content as strings.
+
+        Args:
+            content: The content to lex.
+
+        Returns:
+            list: The text of each code span.
+        """
+        return [content[start:end] for start, end in lex_code_spans(content)]
+
+    def test_removes_line_and_block_comments(self):
+        """Test that comments are left out of the code spans."""
+        content = "a /* b */ c // d\ne"
+        self.assertEqual(self._code(content), ["a ", " c ", "\ne"])
+
+    def test_block_comment_spans_lines(self):
+        """Test that block comment state carries across lines."""
+        content = "a /* b\nc */ d"
+        self.assertEqual(self._code(content), ["a ", " d"])
+
+    def test_comment_markers_inside_strings(self):
+        """Test that comment markers inside string literals are code."""
+        content = "x = 'http://a' + \"b/*\" // c"
+        self.assertEqual(self._code(content), ["x = 'http://a' + \"b/*\" "])
+
+    def test_escaped_quote_inside_string(self):
+        """Test that an escaped quote does not end a string literal."""
+        content = "x = 'it\\'s //'"
+        self.assertEqual(self._code(content), [content])
+
+    def test_template_literal_substitutions(self):
+        """Test template literals with nested substitutions and braces."""
+        content = "x = `a ${ {b: '}'} } // ${c}` // z\ny"
+        self.assertEqual(
+            self._code(content), ["x = `a ${ {b: '}'} } // ${c}` ", "\ny"]
+        )
+
+    def test_unterminated_comment(self):
+        """Test that an unterminated block comment runs to the end."""
+        self.assertEqual(self._code("a /* b"), ["a "])
+
+    def test_empty_content(self):
+        """Test that empty content has no code spans."""
+        self.assertEqual(lex_code_spans(""), [])
+
+    def test_regex_literal_with_slashes(self):
+        """Test that slashes inside a regex literal do not start comments."""
+        content = "x = /\\/\\/[/*]/g; // c"
+        self.assertEqual(self._code(content), ["x = /\\/\\/[/*]/g; "])
+
+    def test_apostrophe_in_jsx_text(self):
+        """Test that an apostrophe in JSX text does not start a string."""
+        content = "x = <p>Don't // stop</p>; // c"
+        self.assertEqual(self._code(content), ["x = <p>Don't // stop</p>; "])
+
+
+class TestAnalyzeSource(unittest.TestCase):
+    """Test suite for analyze_source function."""
+
+    def _flagged(self, content, bit, jsx=True):
+        """Return the characters of content whose mask has a bit set.
+
+        Args:
+            content: The content to analyze.
+            bit: The mask bit to look for.
+            jsx: Whether the content may contain JSX.
+
+        Returns:
+            str: The flagged characters, in order.
+        """
+        mask = analyze_source(content, jsx).mask
+        return "".join(char for char, bits in zip(content, mask) if bits & bit)
+
+    def test_style_and_sx_attributes(self):
+        """Test that style and sx attribute objects are style objects."""
+        content = "<a style={{ b: 1 }} sx={{ c }} d={{ e }}>{{ f }}</a>"
+        self.assertEqual(self._flagged(content, 1), "{ b: 1 }{ c }")
+
+    def test_style_named_objects(self):
+        """Test objects owned by style-named variables, keys and types."""
+        content = (
+            "const cardStyle = { a: { b } };\n"
+            "const c: CSSProperties = { d };\n"
+            "const e = { f: 1, sx: { g } };\n"
+            "const h = { i };"
+        )
+        self.assertEqual(self._flagged(content, 1), "{ a: { b } }{ d }{ g }")
+
+    def test_style_helper_arguments(self):
+        """Test that arguments of lower-case style helpers are styled."""
+        content = (
+            "const useStyles = makeStyles({ a: 1 });\n"
+            "const B = styled(Box)(() => ({ c }));\n"
+            "<StyleSettings value={{ d }} />"
+        )
+        self.assertEqual(self._flagged(content, 1), "{ a: 1 }{ c }")
+
+    def test_owner_across_whitespace(self):
+        """Test that owners are found across whitespace and line breaks."""
+        content = (
+            "const cardStyle =\n\t{ a };\n"
+            "const b = makeStyles \n({ c });\n"
+            "const d = e,\n{ f };"
+        )
+        mask = analyze_source(content).mask
+        self.assertEqual(self._flagged(content, 1), "{ a }{ c }")
+        self.assertEqual(analyze_source(content.encode("utf-8")).mask, mask)
+
+    def test_type_literals_are_not_style_objects(self):
+        """Test that style-named types do not count as style objects."""
+        content = (
+            "type ButtonStyle = { a: string };\n"
+            "interface IStyleProps { b: { c: string } }"
+        )
+        self.assertEqual(self._flagged(content, 1), "")
+
+    def test_urls(self):
+        """Test that href and src values and url() calls are URLs."""
+        content = (
+            '<a href="h" src={`s${x}`} alt="t" />;\n'
+            "const link = { href: 'k' }; x = 'a url(u) b';"
+        )
+        self.assertEqual(self._flagged(content, 2), "\"h\"{`s${x}`}'k'url(u)")
+
+    def test_generic_arrow_function_is_not_jsx(self):
+        """Test that type parameters of an arrow function are not JSX."""
+        content = "const f = <T,>(a: T) => ({ style: { b } });"
+        self.assertEqual(self._flagged(content, 1), "{ b }")
+
+    def test_ts_files_have_no_jsx(self):
+        """Test that angle brackets are not JSX when jsx is False."""
+        content = 'const a = <T>b; const c = { d: "\'" };'
+        self.assertEqual(
+            analyze_source(content, jsx=False).spans, [(0, len(content))]
+        )
+
+
+class TestPrefilterStats(unittest.TestCase):
+    """Test suite for PrefilterStats class."""
+
+    def test_merge_adds_counters(self):
+        """Test that merging adds every counter."""
+        stats = PrefilterStats()
+        other = PrefilterStats()
+        stats.record(3, {0: {"hex_color"}})
+        other.record(2, {})
+        other.record(1, {0: {"hex_color", "rgb_color"}})
+        stats.merge(other)
+
+        self.assertEqual(stats.files_scanned, 2)
+        self.assertEqual(stats.files_skipped, 1)
+        self.assertEqual(stats.lines_scanned, 2)
+        self.assertEqual(stats.lines_skipped, 4)
+        self.assertEqual(stats.rule_hits["hex_color"], 2)
+        self.assertEqual(stats.rule_hits["rgb_color"], 1)
+        self.assertEqual(stats.rule_skips["rgb_color"], 5)
+
+    def test_format_lists_every_rule(self):
+        """Test that the formatted table has a row per rule."""
+        stats = PrefilterStats()
+        stats.record(4, {1: {"pixel_value"}})
+        output = stats.format()
+
+        self.assertIn("scanned 1 of 1 files and 1 of 4 lines", output)
+        self.assertRegex(output, r"pixel_value +1 +3")
+        self.assertEqual(len(output.splitlines()), 2 + 7)
+
+
+class TestScanProfile(unittest.TestCase):
+    """Test suite for ScanProfile class."""
+
+    def test_check_embedded_styles_records_phases_and_rules(self):
+        """Test that checking a file records its phases and rule counts."""
+        profile = ScanProfile()
+        content = "const a = '#fff';\nconst buttonStyle = { fontSize: 1 };"
+        violations = check_embedded_styles(content, "a.ts", profile=profile)
+
+        self.assertEqual(len(violations), 2)
+        self.assertEqual(profile.rule_matches["hex_color"], 1)
+        self.assertEqual(profile.rule_violations["hex_color"], 1)
+        self.assertEqual(profile.rule_violations["camelcase_css_property"], 1)
+        self.assertGreater(profile.phases["lex"], 0)
+        self.assertGreater(profile.rule_seconds["pixel_value"], 0)
+
+    def test_merge_and_report_sorted_slowest_first(self):
+        """Test that merged profiles report files slowest first."""
+        profile = ScanProfile()
+        other = ScanProfile()
+        profile.record_file("fast.tsx", 0.1, 10, 0)
+        other.record_file("slow.tsx", 0.5, 20, 3)
+        other.phases["read"] = 0.25
+        other.rule_timing_seconds = 0.125
+        profile.merge(other)
+        report = profile.to_json()
+
+        self.assertEqual(report["files_scanned"], 2)
+        self.assertEqual(report["bytes_scanned"], 30)
+        self.assertEqual(report["phases"]["read"], 0.25)
+        self.assertEqual(report["rule_timing_seconds"], 0.125)
+        self.assertEqual(
+            [entry["path"] for entry in report["files"]],
+            ["slow.tsx", "fast.tsx"],
+        )
+        self.assertEqual(len(report["rules"]), 7)
+
+    def test_format_limits_files(self):
+        """Test that the formatted tables list only the slowest files."""
+        profile = ScanProfile()
+        for index in range(3):
+            profile.record_file(f"f{index}.tsx", index, 1, 0)
+        output = profile.format(limit=2)
+
+        self.assertIn("f2.tsx", output)
+        self.assertNotIn("f0.tsx", output)
+        self.assertRegex(output, r"lex +0\.0000")
+
 
 class TestProcessTypescriptFile(unittest.TestCase):
     """Test suite for process_typescript_file function."""
@@ -289,6 +658,24 @@ class TestProcessTypescriptFile(unittest.TestCase):
         process_typescript_file(file_path, violations)
         self.assertEqual(len(violations), 0)
 
+    def test_profile_leaves_out_rule_timing(self):
+        """Test that timing the rules does not count in the file time."""
+        file_path = os.path.join(self.test_dir, "test.tsx")
+        with open(file_path, "w") as f:
+            f.write("const color = '#ff0000';")
+        record_rules = ScanProfile.record_rules
+
+        def slow_record_rules(profile, *args):
+            record_rules(profile, *args)
+            time.sleep(0.2)
+
+        profile = ScanProfile()
+        with patch.object(ScanProfile, "record_rules", slow_record_rules):
+            process_typescript_file(file_path, [], profile=profile)
+        self.assertGreaterEqual(profile.rule_timing_seconds, 0.2)
+        self.assertLess(profile.files[file_path]["seconds"], 0.2)
+        self.assertLess(profile.phases["match"], 0.2)
+
     def test_handles_file_not_found(self):
         """Test handling of non-existent file."""
         file_path = os.path.join(self.test_dir, "nonexistent.tsx")
@@ -315,6 +702,62 @@ class TestProcessTypescriptFile(unittest.TestCase):
 
         self.assertEqual(len(violations), 0)
 
+    def test_memory_map_matches_reading_the_file(self):
+        """Test that scanning a memory map finds the same violations."""
+        file_path = os.path.join(self.test_dir, "test.tsx")
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write("// \u00e9\nconst color = '#ff0000';\n")
+
+        violations = []
+        mapped_violations = []
+        process_typescript_file(file_path, violations)
+        process_typescript_file(file_path, mapped_violations, memory_map=True)
+        self.assertEqual(mapped_violations, violations)
+        self.assertEqual(len(violations), 1)
+
+    def test_memory_map_is_closed_after_scan(self):
+        """Test that the memory map is closed once the file is scanned."""
+        file_path = os.path.join(self.test_dir, "test.tsx")
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write("const color = '#ff0000';\n")
+
+        mapped = []
+
+        def map_file(file):
+            mapped.append(_map_file(file))
+            return mapped[-1]
+
+        violations = []
+        with patch("css_check._map_file", side_effect=map_file):
+            process_typescript_file(file_path, violations, memory_map=True)
+        self.assertEqual(len(violations), 1)
+        self.assertTrue(mapped[0].closed)
+
+    def test_memory_map_handles_empty_file(self):
+        """Test that an empty file can be scanned with a memory map."""
+        file_path = os.path.join(self.test_dir, "empty.tsx")
+        open(file_path, "w").close()
+
+        violations = []
+        process_typescript_file(file_path, violations, memory_map=True)
+        self.assertEqual(violations, [])
+
+    def test_memory_map_reports_decode_error(self):
+        """Test that invalid UTF-8 is reported as when reading the file."""
+        file_path = os.path.join(self.test_dir, "bad_encoding.tsx")
+        with open(file_path, "wb") as f:
+            f.write(b"const color = '#ff0000'; // \xc3\xa9 \xff")
+
+        violations = []
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            process_typescript_file(file_path, violations)
+        with patch("sys.stderr", new_callable=StringIO) as mapped_stderr:
+            process_typescript_file(file_path, violations, memory_map=True)
+
+        self.assertIn("position 31", mock_stderr.getvalue())
+        self.assertEqual(mapped_stderr.getvalue(), mock_stderr.getvalue())
+        self.assertEqual(violations, [])
+
     def test_appends_to_existing_violations_list(self):
         """Test that violations are appended to existing list."""
         file_path = os.path.join(self.test_dir, "test.tsx")
@@ -335,6 +778,85 @@ class TestProcessTypescriptFile(unittest.TestCase):
         self.assertEqual(violations[0], existing_violation)
 
 
+class TestResultCache(unittest.TestCase):
+    """Test suite for the ResultCache class."""
+
+    def setUp(self):
+        """Create temporary directories for the cache and test files."""
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, "cache")
+        self.cache = ResultCache(self.cache_dir, 1024 * 1024)
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.test_dir)
+
+    def test_round_trip(self):
+        """Test that stored violations are returned for the same content."""
+        data = b"const color = '#ff0000';"
+        violations = check_embedded_styles(data.decode(), "a.tsx")
+        key = self.cache.key(data)
+        self.cache.put(key, violations)
+
+        cached = self.cache.get(key, "b.tsx")
+        self.assertEqual(len(cached), 1)
+        self.assertEqual(cached[0].file_path, "b.tsx")
+        self.assertEqual(cached[0].code_snippet, "#ff0000")
+        self.assertEqual(cached[0].description, violations[0].description)
+
+    def test_ruleset_covers_helper_modules(self):
+        """Test that the key hashes the modules that shape the results."""
+        with patch("builtins.open", wraps=open) as mock_open:
+            _ruleset_hash()
+        self.assertEqual(
+            {
+                os.path.basename(call.args[0])
+                for call in mock_open.call_args_list
+            },
+            {"css_check.py", "file_discovery.py", "line_index.py"},
+        )
+
+    def test_miss_for_changed_content(self):
+        """Test that different content does not hit the cache."""
+        self.cache.put(self.cache.key(b"a"), [])
+        self.assertIsNone(self.cache.get(self.cache.key(b"b"), "a.tsx"))
+
+    def test_corrupt_entry_is_a_miss(self):
+        """Test that an unreadable entry is treated as a miss."""
+        key = self.cache.key(b"a")
+        self.cache.put(key, [])
+        with open(self.cache._entry_path(key), "w") as f:
+            f.write("{not json")
+        self.assertIsNone(self.cache.get(key, "a.tsx"))
+
+    def test_evicts_least_recently_used_entries(self):
+        """Test that eviction keeps the cache under its size limit."""
+        cache = ResultCache(self.cache_dir, 3)
+        old_key = cache.key(b"old")
+        new_key = cache.key(b"new")
+        cache.put(old_key, [])
+        os.utime(cache._entry_path(old_key), (0, 0))
+        cache.put(new_key, [])
+
+        cache.evict()
+        self.assertIsNone(cache.get(old_key, "a.tsx"))
+        self.assertEqual(cache.get(new_key, "a.tsx"), [])
+
+    def test_cached_file_is_not_scanned_again(self):
+        """Test that process_typescript_file skips scanning on a hit."""
+        file_path = os.path.join(self.test_dir, "test.tsx")
+        with open(file_path, "w") as f:
+            f.write("const color = '#ff0000';")
+
+        first = []
+        process_typescript_file(file_path, first, self.cache)
+        second = []
+        with patch("css_check.check_embedded_styles") as mock_check:
+            process_typescript_file(file_path, second, self.cache)
+            mock_check.assert_not_called()
+        self.assertEqual(second, first)
+
+
 class TestCheckFiles(unittest.TestCase):
     """Test suite for check_files function."""
 
@@ -488,6 +1010,280 @@ class TestCheckFiles(unittest.TestCase):
         result = check_files([], [abs_path], [], [])
         self.assertEqual(len(result.violations), 1)
 
+    def test_prunes_subdirectories_of_test_directories(self):
+        """Test that nothing below a test directory is scanned."""
+        nested_dir = os.path.join(self.test_dir, "__tests__", "helpers")
+        os.makedirs(nested_dir)
+        with open(os.path.join(nested_dir, "helper.tsx"), "w") as f:
+            f.write("const color = '#ff0000';")
+
+        result = check_files([self.test_dir], [], [], [])
+        self.assertEqual(len(result.violations), 0)
+
+    def test_excluded_directories_are_never_listed(self):
+        """Test that excluded trees are pruned before being walked."""
+        exclude_dir = os.path.join(self.test_dir, "exclude")
+        os.makedirs(os.path.join(exclude_dir, "nested"))
+
+        with patch("css_check.os.scandir", wraps=os.scandir) as scandir:
+            check_files([self.test_dir], [], [], [exclude_dir])
+        listed = {call.args[0] for call in scandir.call_args_list}
+        self.assertNotIn(exclude_dir, listed)
+        self.assertNotIn(os.path.join(exclude_dir, "nested"), listed)
+
+    def test_exclusion_matches_whole_path_components(self):
+        """Test that excluding a directory keeps same-prefix siblings."""
+        sibling_dir = os.path.join(self.test_dir, "utils")
+        os.makedirs(sibling_dir)
+        with open(os.path.join(sibling_dir, "a.tsx"), "w") as f:
+            f.write("const color = '#ff0000';")
+
+        excluded = os.path.join(self.test_dir, "util")
+        result = check_files([self.test_dir], [], [], [excluded])
+        self.assertEqual(len(result.violations), 1)
+
+    def test_excluding_the_scanned_directory(self):
+        """Test that a scanned directory inside an exclusion is skipped."""
+        with open(os.path.join(self.subdir, "a.tsx"), "w") as f:
+            f.write("const color = '#ff0000';")
+
+        result = check_files([self.subdir], [], [], [self.test_dir])
+        self.assertEqual(len(result.violations), 0)
+
+    def test_scans_each_file_once(self):
+        """Test that overlapping directories and files are deduplicated."""
+        file_path = os.path.join(self.subdir, "nested.tsx")
+        with open(file_path, "w") as f:
+            f.write("const color = '#ff0000';")
+
+        result = check_files(
+            [self.test_dir, self.subdir, self.test_dir], [file_path], [], []
+        )
+        self.assertEqual(len(result.violations), 1)
+
+    def test_parallel_scan_matches_serial_scan(self):
+        """Test that jobs > 1 returns the same violations in order."""
+        for index, size in enumerate([1, 20, 5]):
+            file_path = os.path.join(self.subdir, f"file{index}.tsx")
+            with open(file_path, "w") as f:
+                f.write("const color = '#ff0000';\n" * size)
+
+        serial = check_files([self.test_dir], [], [], [])
+        with patch("css_check._FILES_PER_JOB", 1):
+            parallel = check_files([self.test_dir], [], [], [], jobs=2)
+        self.assertEqual(len(serial.violations), 26)
+        self.assertEqual(parallel.violations, serial.violations)
+
+
+class TestIterFileViolations(unittest.TestCase):
+    """Test suite for iter_file_violations function."""
+
+    def setUp(self):
+        """Create temporary files for tests."""
+        self.test_dir = tempfile.mkdtemp()
+        for name, content in [
+            ("b.tsx", "const color = '#ff0000';"),
+            ("a.tsx", "const name = 'test';"),
+            ("c.tsx", "const color = '#00ff00';\nconst x = '#fff';"),
+        ]:
+            with open(os.path.join(self.test_dir, name), "w") as f:
+                f.write(content)
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.test_dir)
+
+    def test_yields_each_file_in_sorted_order(self):
+        """Test that every file is yielded once, in sorted path order."""
+        results = list(iter_file_violations([self.test_dir], [], [], []))
+
+        self.assertEqual(
+            [os.path.basename(path) for path, _ in results],
+            ["a.tsx", "b.tsx", "c.tsx"],
+        )
+        self.assertEqual([len(v) for _, v in results], [0, 1, 2])
+
+    def test_parallel_results_match_serial_results(self):
+        """Test that worker processes yield the same results in order."""
+        serial = list(iter_file_violations([self.test_dir], [], [], []))
+        with patch("css_check._FILES_PER_JOB", 1):
+            parallel = list(
+                iter_file_violations([self.test_dir], [], [], [], jobs=2)
+            )
+
+        self.assertEqual(serial, parallel)
+
+    def test_few_files_are_scanned_serially(self):
+        """Test that no worker pool is started for a handful of files."""
+        with patch("css_check.ProcessPoolExecutor") as mock_pool:
+            results = list(
+                iter_file_violations([self.test_dir], [], [], [], jobs=8)
+            )
+        mock_pool.assert_not_called()
+        self.assertEqual(len(results), 3)
+
+    def test_closing_early_stops_the_scan(self):
+        """Test that files after a closed iteration are never read."""
+        results = iter_file_violations([self.test_dir], [], [], [])
+        next(results)
+
+        with patch("css_check._scan_file") as mock_scan:
+            results.close()
+        mock_scan.assert_not_called()
+
+
+class TestStreamViolationOutput(unittest.TestCase):
+    """Test suite for stream_violation_output function."""
+
+    def _results(self):
+        """Build per-file results for two files.
+
+        Args:
+            None
+
+        Returns:
+            list: File paths paired with their violations.
+        """
+        return [
+            ("a.tsx", check_embedded_styles("x = '#fff';", "a.tsx")),
+            ("b.tsx", []),
+            ("c.tsx", check_embedded_styles("a='#000';\nb='#111';", "c.tsx")),
+        ]
+
+    def test_matches_format_violation_output(self):
+        """Test that streamed output equals the buffered report."""
+        violations = [v for _, found in self._results() for v in found]
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            total = stream_violation_output(iter(self._results()))
+
+        self.assertEqual(total, 3)
+        self.assertEqual(
+            mock_stdout.getvalue(), format_violation_output(violations) + "\n"
+        )
+
+    def test_stops_at_max_violations(self):
+        """Test that the report stops once the limit is reached."""
+        results = iter(self._results())
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            total = stream_violation_output(results, max_violations=2)
+
+        output = mock_stdout.getvalue()
+        self.assertEqual(total, 2)
+        self.assertIn("Total violations: 2", output)
+        self.assertIn("Scan stopped after 2 violation(s)", output)
+        self.assertEqual(output.count("Line "), 2)
+
+    def test_prints_nothing_without_violations(self):
+        """Test that no report is printed when nothing is found."""
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            total = stream_violation_output(iter([("a.tsx", [])]))
+
+        self.assertEqual(total, 0)
+        self.assertEqual(mock_stdout.getvalue(), "")
+
+
+class TestViolationWatcher(unittest.TestCase):
+    """Test suite for watch mode."""
+
+    def setUp(self):
+        """Set up test directory."""
+        self.test_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.test_dir, "test.tsx")
+        self._write("const a = '#fff';\n")
+
+    def tearDown(self):
+        """Clean up test directory."""
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, content):
+        """Write the test file with a new modification time.
+
+        Args:
+            content: The new content of the file.
+
+        Returns:
+            None
+        """
+        with open(self.file_path, "w") as f:
+            f.write(content)
+        stat = os.stat(self.file_path)
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    def _watcher(self):
+        """Return a watcher tracking the test directory.
+
+        Args:
+            None
+
+        Returns:
+            ViolationWatcher: The watcher, after the first scan.
+        """
+        watcher = ViolationWatcher()
+        for _ in watcher.track(
+            iter_file_violations([self.test_dir], [], [], [])
+        ):
+            pass
+        return watcher
+
+    def test_diff_ignores_moved_lines(self):
+        """Test that violations moved to another line are unchanged."""
+        old = check_embedded_styles("const a = '#fff';", "a.tsx")
+        new = check_embedded_styles("\n\nconst a = '#fff';\n#000", "a.tsx")
+        added, resolved = diff_violations(old, new)
+        self.assertEqual([v.code_snippet for v in added], ["#000"])
+        self.assertEqual(resolved, [])
+
+    def test_poll_rescans_only_changed_files(self):
+        """Test that polling reports added and resolved violations."""
+        watcher = self._watcher()
+        self.assertEqual(watcher.total(), 1)
+        with patch("css_check._scan_file") as mock_scan:
+            self.assertEqual(watcher.poll(), [])
+        mock_scan.assert_not_called()
+
+        self._write("const a = 'rgb(1, 2, 3)';\n")
+        [(file_path, added, resolved)] = watcher.poll()
+        self.assertEqual(file_path, self.file_path)
+        self.assertEqual([v.violation_type for v in added], ["rgb_color"])
+        self.assertEqual([v.violation_type for v in resolved], ["hex_color"])
+        self.assertEqual(watcher.poll(), [])
+
+    def test_deleted_file_resolves_its_violations(self):
+        """Test that deleting a file resolves all its violations."""
+        watcher = self._watcher()
+        os.remove(self.file_path)
+        [(_, added, resolved)] = watcher.poll()
+        self.assertEqual((len(added), len(resolved)), (0, 1))
+        self.assertEqual(watcher.total(), 0)
+
+    def test_main_watch_reports_changes(self):
+        """Test that --watch reports changes until interrupted."""
+        polls = []
+
+        def fake_sleep(interval):
+            """Edit the file once, then stop the watch."""
+            polls.append(interval)
+            if len(polls) == 1:
+                self._write("const a = 1;\n")
+            else:
+                raise KeyboardInterrupt
+
+        test_args = ["css_check.py", "--directories", self.test_dir]
+        test_args += ["--no-cache", "--watch", "--watch-interval", "0.5"]
+        with patch("sys.argv", test_args):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                with patch("css_check.time.sleep", side_effect=fake_sleep):
+                    with self.assertRaises(SystemExit) as cm:
+                        main()
+        self.assertEqual(cm.exception.code, 0)
+        self.assertEqual(polls, [0.5, 0.5])
+        output = mock_stdout.getvalue()
+        self.assertIn("Watching 1 files", output)
+        self.assertIn("  - Line 1: [hex_color] #fff", output)
+        self.assertIn("Total violations: 0", output)
+
 
 class TestValidateDirectoriesInput(unittest.TestCase):
     """Test suite for validate_directories_input function."""
@@ -509,6 +1305,151 @@ class TestValidateDirectoriesInput(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0], self.test_dir)
 
+    def test_keeps_files_as_files(self):
+        """Test that a file is not replaced by its parent directory."""
+        result = validate_directories_input([self.test_file])
+        self.assertEqual(result, [self.test_file])
+
+    def test_expands_glob_patterns(self):
+        """Test that glob patterns expand to the paths they match."""
+        nested_dir = os.path.join(self.test_dir, "a", "b")
+        os.makedirs(nested_dir)
+        nested_file = os.path.join(nested_dir, "deep.tsx")
+        with open(nested_file, "w") as f:
+            f.write("test")
+
+        pattern = os.path.join(self.test_dir, "**", "*.tsx")
+        result = validate_directories_input([pattern])
+        self.assertEqual(sorted(result), sorted([nested_file, self.test_file]))
+
+    def test_removes_duplicate_paths(self):
+        """Test that paths given more than once are kept once."""
+        pattern = os.path.join(self.test_dir, "*.tsx")
+        result = validate_directories_input(
+            [self.test_file, pattern, self.test_dir, self.test_dir]
+        )
+        self.assertEqual(result, [self.test_file, self.test_dir])
+
+    def test_raises_for_invalid_path(self):
+        """Test that a missing path raises ValueError."""
+        with self.assertRaises(ValueError):
+            validate_directories_input([os.path.join(self.test_dir, "no")])
+
+    def test_raises_for_pattern_without_matches(self):
+        """Test that a glob pattern matching nothing raises ValueError."""
+        with self.assertRaises(ValueError):
+            validate_directories_input([os.path.join(self.test_dir, "*.js")])
+
+
+class TestChangedLines(unittest.TestCase):
+    """Test suite for get_changed_lines and filter_changed_lines."""
+
+    def setUp(self):
+        """Create a temporary git repository with one commit."""
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        self._git("init", "-q")
+        with open("a.tsx", "w") as f:
+            f.write("const a = '#fff';\nconst b = 1;\nconst c = 2;\n")
+        self._git("add", "a.tsx")
+        self._git("commit", "-q", "-m", "initial")
+
+    def tearDown(self):
+        """Restore the working directory and remove the repository."""
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def _git(self, *args):
+        """Run a git command in the test repository.
+
+        Args:
+            *args: Arguments passed to git.
+
+        Returns:
+            None
+        """
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=t@t", *args],
+            check=True,
+            capture_output=True,
+        )
+
+    def test_collects_changed_line_ranges(self):
+        """Test that only added and modified lines are reported."""
+        with open("a.tsx", "w") as f:
+            f.write("const a = '#fff';\nconst b = '#000';\nconst c = 2;\n")
+        with open("b.tsx", "w") as f:
+            f.write("const d = 1;\n")
+        self._git("add", "b.tsx")
+
+        changed = get_changed_lines("HEAD")
+        self.assertEqual(
+            changed,
+            {
+                os.path.abspath("a.tsx"): [(2, 2)],
+                os.path.abspath("b.tsx"): [(1, 1)],
+            },
+        )
+
+    def test_deleted_lines_are_not_changed_lines(self):
+        """Test that a pure deletion yields no changed range."""
+        with open("a.tsx", "w") as f:
+            f.write("const a = '#fff';\nconst c = 2;\n")
+
+        changed = get_changed_lines("HEAD")
+        self.assertEqual(changed, {os.path.abspath("a.tsx"): []})
+
+    def test_paths_with_spaces_and_non_ascii_names(self):
+        """Test that quoted paths and paths with spaces are read back."""
+        os.mkdir("sp ace")
+        names = [os.path.join("sp ace", "a b.tsx"), "sp ace \u00e9.tsx"]
+        for name in names:
+            with open(name, "w", encoding="utf-8") as f:
+                f.write("const a = '#fff';\n")
+        self._git("add", ".")
+        self._git("config", "diff.noprefix", "true")
+
+        changed = get_changed_lines("HEAD")
+        self.assertEqual(
+            changed, {os.path.abspath(name): [(1, 1)] for name in names}
+        )
+
+    def test_invalid_reference_raises_value_error(self):
+        """Test that an unknown reference raises ValueError."""
+        with self.assertRaises(ValueError):
+            get_changed_lines("does-not-exist")
+
+    def test_filters_violations_outside_changed_lines(self):
+        """Test that violations on unchanged lines are dropped."""
+        violations = [
+            DetailedViolation("/a.tsx", line, "hex_color", "#fff", "d")
+            for line in (1, 3, 5, 9)
+        ]
+        kept = filter_changed_lines(violations, {"/a.tsx": [(3, 5)]})
+        self.assertEqual([v.line_number for v in kept], [3, 5])
+
+    def test_filters_violations_in_unchanged_files(self):
+        """Test that violations in files outside the diff are dropped."""
+        violations = [DetailedViolation("/b.tsx", 1, "hex_color", "#f", "d")]
+        self.assertEqual(filter_changed_lines(violations, {}), [])
+
+    def test_main_reports_only_changed_lines(self):
+        """Test that main --since ignores legacy violations."""
+        with open("a.tsx", "w") as f:
+            f.write("const a = '#fff';\nconst b = '#000';\nconst c = 2;\n")
+        test_args = ["css_check.py", "--since", "HEAD", "--no-cache"]
+
+        with patch("sys.argv", test_args):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+                self.assertEqual(cm.exception.code, 1)
+                output = mock_stdout.getvalue()
+        self.assertIn("#000", output)
+        self.assertNotIn("#fff", output)
+        self.assertIn("Total violations: 1", output)
+
 
 class TestFormatViolationOutput(unittest.TestCase):
     """Test suite for format_violation_output function."""
@@ -589,6 +1530,144 @@ class TestFormatViolationOutput(unittest.TestCase):
         self.assertIn("file2.tsx", result)
 
 
+class TestViolationStore(unittest.TestCase):
+    """Test suite for the compact violation store."""
+
+    def setUp(self):
+        """Set up violations sharing paths, rules and snippets."""
+        self.violations = [
+            DetailedViolation("b.tsx", 3, "hex_color", "#fff", "Hex"),
+            DetailedViolation("a.tsx", 7, "hex_color", "#fff", "Hex"),
+            DetailedViolation("b.tsx", 1, "pixel_value", "4px", "Pixels"),
+            DetailedViolation("a.tsx", 7, "hex_color", "#000", "Other"),
+        ]
+
+    def test_views_match_added_violations(self):
+        """Test that the store reads back the violations it was given."""
+        store = ViolationStore(self.violations)
+
+        self.assertEqual(len(store), 4)
+        self.assertEqual(list(store), self.violations)
+        self.assertEqual(store, self.violations)
+        self.assertEqual(store[-1], self.violations[-1])
+        self.assertEqual(store[1:3], self.violations[1:3])
+        with self.assertRaises(IndexError):
+            store[4]
+
+    def test_strings_are_interned(self):
+        """Test that equal paths and snippets are stored once."""
+        store = ViolationStore(self.violations)
+        store.append(
+            DetailedViolation(
+                "a.tsx",
+                9,
+                "hex_color",
+                "#fff",
+                "A hex color code is used.",
+            )
+        )
+
+        self.assertIs(store[0].file_path, store[2].file_path)
+        self.assertIs(store[0].code_snippet, store[4].code_snippet)
+        self.assertIs(store[1].description, store[0].description)
+        self.assertEqual(store[4].description, "A hex color code is used.")
+
+    def test_by_file_groups_in_report_order(self):
+        """Test that files are sorted by path and violations by line."""
+        groups = list(ViolationStore(self.violations).by_file())
+
+        self.assertEqual(
+            groups,
+            [
+                ("a.tsx", [self.violations[1], self.violations[3]]),
+                ("b.tsx", [self.violations[2], self.violations[0]]),
+            ],
+        )
+
+    def test_output_matches_list_output(self):
+        """Test that a store formats like the list it was built from."""
+        self.assertEqual(
+            format_violation_output(ViolationStore(self.violations)),
+            format_violation_output(self.violations),
+        )
+
+    def test_store_survives_pickling(self):
+        """Test that a store sent to or from a worker is unchanged."""
+        store = ViolationStore(self.violations)
+        self.assertEqual(pickle.loads(pickle.dumps(store)), store)
+
+
+class TestViolationSummary(unittest.TestCase):
+    """Test suite for the summary counters."""
+
+    def _violations(self, file_path, *rules):
+        """Build one violation per rule in a file.
+
+        Args:
+            file_path: Path of the file.
+            *rules: The rule of each violation.
+
+        Returns:
+            list: The violations.
+        """
+        return [
+            DetailedViolation(file_path, line, rule, "x", "d")
+            for line, rule in enumerate(rules, 1)
+        ]
+
+    def test_counts_per_rule_directory_and_file(self):
+        """Test the counters and rankings of a summary."""
+        results = [
+            ("src/a/one.tsx", self._violations("src/a/one.tsx", "hex_color")),
+            ("src/a/deep/two.tsx", []),
+            (
+                "src/b/three.tsx",
+                self._violations(
+                    "src/b/three.tsx", "pixel_value", "hex_color", "hex_color"
+                ),
+            ),
+            ("top.tsx", self._violations("top.tsx", "rgb_color")),
+        ]
+        summary = ViolationSummary(depth=2, top=2)
+
+        self.assertEqual(summarize_violations(iter(results), summary), 5)
+        report = summary.to_json()
+        self.assertEqual(
+            (report["files_scanned"], report["files_affected"]), (4, 3)
+        )
+        self.assertEqual(
+            report["rules"],
+            [
+                {"rule": "hex_color", "violations": 3, "files": 2},
+                {"rule": "rgb_color", "violations": 1, "files": 1},
+                {"rule": "pixel_value", "violations": 1, "files": 1},
+            ],
+        )
+        self.assertEqual(
+            [entry["directory"] for entry in report["directories"]],
+            ["src/b", ".", "src/a"],
+        )
+        self.assertEqual(
+            report["top_files"],
+            [
+                {"path": "src/b/three.tsx", "violations": 3},
+                {"path": "src/a/one.tsx", "violations": 1},
+            ],
+        )
+        self.assertIn("Total violations: 5 in 3 of 4 files", summary.format())
+
+    def test_changed_lines_filter(self):
+        """Test that violations outside changed lines are not counted."""
+        violations = self._violations("a.tsx", "hex_color", "rgb_color")
+        summary = ViolationSummary()
+
+        total = summarize_violations(
+            iter([("a.tsx", violations)]), summary, {"a.tsx": [(2, 2)]}
+        )
+        self.assertEqual(total, 1)
+        self.assertEqual(dict(summary.rule_violations), {"rgb_color": 1})
+
+
 class TestMain(unittest.TestCase):
     """Test suite for main function."""
 
@@ -657,6 +1736,153 @@ class TestMain(unittest.TestCase):
                     main()
                 self.assertEqual(cm.exception.code, 1)
 
+    def test_no_cache_does_not_create_cache_directory(self):
+        """Test that --no-cache neither reads nor writes the cache."""
+        file_path = os.path.join(self.test_dir, "test.tsx")
+        with open(file_path, "w") as f:
+            f.write("const color = '#ff0000';")
+        cache_dir = os.path.join(self.test_dir, "cache")
+        test_args = ["css_check.py", "--files", file_path, "--no-cache"]
+        test_args += ["--cache-dir", cache_dir]
+
+        with patch("sys.argv", test_args):
+            with patch("sys.stdout", new_callable=StringIO):
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+                self.assertEqual(cm.exception.code, 1)
+        self.assertFalse(os.path.exists(cache_dir))
+
+    def test_since_cannot_be_combined_with_files(self):
+        """Test that --since is rejected together with --files."""
+        test_args = ["css_check.py", "--since", "HEAD", "--files", "a.tsx"]
+
+        with patch("sys.argv", test_args):
+            with patch("sys.stderr", new_callable=StringIO):
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+                self.assertEqual(cm.exception.code, 2)
+
+    def test_rejects_invalid_jobs_argument(self):
+        """Test that main rejects a --jobs value below 1."""
+        test_args = ["css_check.py", "--directories", self.test_dir]
+        test_args += ["--jobs", "0"]
+
+        with patch("sys.argv", test_args):
+            with patch("sys.stderr", new_callable=StringIO):
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+                self.assertEqual(cm.exception.code, 2)
+
+    def test_file_in_directories_checks_only_that_file(self):
+        """Test that passing a file does not scan its siblings."""
+        target = os.path.join(self.test_dir, "target.tsx")
+        sibling = os.path.join(self.test_dir, "sibling.tsx")
+        with open(target, "w") as f:
+            f.write("const name = 'test';")
+        with open(sibling, "w") as f:
+            f.write("const color = '#ff0000';")
+        test_args = ["css_check.py", "--directories", target, "--no-cache"]
+
+        with patch("sys.argv", test_args):
+            with patch("sys.stdout", new_callable=StringIO):
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+                self.assertEqual(cm.exception.code, 0)
+
+    def test_fail_fast_reports_a_single_violation(self):
+        """Test that --fail-fast stops at the first violation."""
+        for name in ["a.tsx", "b.tsx"]:
+            with open(os.path.join(self.test_dir, name), "w") as f:
+                f.write("const color = '#ff0000';")
+        test_args = ["css_check.py", "--directories", self.test_dir]
+        test_args += ["--fail-fast", "--no-cache"]
+
+        with patch("sys.argv", test_args):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+                self.assertEqual(cm.exception.code, 1)
+                output = mock_stdout.getvalue()
+                self.assertIn("Total violations: 1", output)
+                self.assertNotIn("b.tsx", output)
+
+    def test_rejects_invalid_max_violations_argument(self):
+        """Test that main rejects a --max-violations value below 1."""
+        test_args = ["css_check.py", "--directories", self.test_dir]
+        test_args += ["--max-violations", "0"]
+
+        with patch("sys.argv", test_args):
+            with patch("sys.stderr", new_callable=StringIO):
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+                self.assertEqual(cm.exception.code, 2)
+
+    def test_prefilter_stats_are_printed_to_stderr(self):
+        """Test that --prefilter-stats reports counters on stderr."""
+        file_path = os.path.join(self.test_dir, "test.tsx")
+        with open(file_path, "w") as f:
+            f.write("const color = '#ff0000';")
+        test_args = ["css_check.py", "--files", file_path, "--no-cache"]
+        test_args += ["--prefilter-stats"]
+
+        with patch("sys.argv", test_args):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                with patch("sys.stderr", new_callable=StringIO) as mock_err:
+                    with self.assertRaises(SystemExit):
+                        main()
+        self.assertIn("scanned 1 of 1 files", mock_err.getvalue())
+        self.assertNotIn("Prefilter", mock_stdout.getvalue())
+
+    def test_profile_writes_json_report(self):
+        """Test that --profile writes a JSON report and prints tables."""
+        file_path = os.path.join(self.test_dir, "test.tsx")
+        with open(file_path, "w") as f:
+            f.write("const color = '#ff0000';")
+        report_path = os.path.join(self.test_dir, "profile.json")
+        test_args = ["css_check.py", "--files", file_path, "--no-cache"]
+        test_args += ["--profile", report_path]
+
+        with patch("sys.argv", test_args):
+            with patch("sys.stdout", new_callable=StringIO):
+                with patch("sys.stderr", new_callable=StringIO) as mock_err:
+                    with self.assertRaises(SystemExit) as cm:
+                        main()
+        self.assertEqual(cm.exception.code, 1)
+        with open(report_path, encoding="utf-8") as f:
+            report = json.load(f)
+        self.assertEqual(report["files"][0]["path"], file_path)
+        self.assertEqual(report["files"][0]["violations"], 1)
+        self.assertGreater(report["wall_seconds"], 0)
+        self.assertIn("Slowest files", mock_err.getvalue())
+
+    def test_summary_prints_json_report(self):
+        """Test that --summary json prints counters instead of violations."""
+        file_path = os.path.join(self.test_dir, "test.tsx")
+        with open(file_path, "w") as f:
+            f.write("const color = '#ff0000';")
+        test_args = ["css_check.py", "--files", file_path, "--no-cache"]
+        test_args += ["--summary", "json"]
+
+        with patch("sys.argv", test_args):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+        self.assertEqual(cm.exception.code, 1)
+        report = json.loads(mock_stdout.getvalue())
+        self.assertEqual(report["total_violations"], 1)
+        self.assertEqual(report["top_files"][0]["path"], file_path)
+
+    def test_summary_rejects_violation_limit(self):
+        """Test that --summary cannot be combined with --fail-fast."""
+        test_args = ["css_check.py", "--files", "a.tsx", "--summary"]
+        test_args += ["--fail-fast"]
+
+        with patch("sys.argv", test_args):
+            with patch("sys.stderr", new_callable=StringIO):
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+        self.assertEqual(cm.exception.code, 2)
+
     def test_handles_invalid_directory_input(self):
         """Test that main handles invalid directory input."""
         invalid_dir = os.path.join(self.test_dir, "nonexistent")
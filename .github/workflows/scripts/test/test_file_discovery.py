@@ -0,0 +1,170 @@
+"""Tests for the file_discovery module."""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import file_discovery  # noqa: E402
+from file_discovery import (  # noqa: E402
+    clear_cache,
+    compile_filter,
+    discover_files,
+    list_files,
+)
+
+
+class TestFileDiscovery(unittest.TestCase):
+    """Test suite for listing and filtering source files."""
+
+    def setUp(self):
+        """Set up test directory."""
+        self.test_dir = tempfile.mkdtemp()
+        clear_cache()
+
+    def tearDown(self):
+        """Clean up test directory."""
+        shutil.rmtree(self.test_dir)
+        clear_cache()
+
+    def _write(self, *paths):
+        """Create empty files below the test directory.
+
+        Args:
+            *paths: Paths of the files, with ``/`` separators.
+        """
+        for path in paths:
+            full_path = os.path.join(self.test_dir, *path.split("/"))
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, "w", encoding="utf-8") as f:
+                f.write(path)
+
+    def _git(self, *args):
+        """Run git in the test directory.
+
+        Args:
+            *args: Arguments of the git command.
+        """
+        subprocess.run(
+            ["git", "-C", self.test_dir, *args],
+            capture_output=True,
+            check=True,
+        )
+
+    def test_walk_honors_gitignore(self):
+        """Test that the fallback walk skips what .gitignore ignores."""
+        self._write(
+            "a.ts",
+            "node_modules/lib/x.ts",
+            "build/out.ts",
+            "src/build/kept.ts",
+            "src/gen.ts",
+            "src/keep.gen.ts",
+            "src/.gitignore",
+            "logs/a.log",
+        )
+        with open(os.path.join(self.test_dir, ".gitignore"), "w") as f:
+            f.write("# comment\nnode_modules/\n/build\n*.log\n")
+        with open(os.path.join(self.test_dir, "src", ".gitignore"), "w") as f:
+            f.write("*.gen.ts\n!keep.gen.ts\ngen.ts\n")
+
+        with patch("file_discovery._git_listing", return_value=None):
+            paths = list_files(self.test_dir)
+        self.assertEqual(
+            paths,
+            (
+                ".gitignore",
+                "a.ts",
+                "src/.gitignore",
+                "src/keep.gen.ts",
+                "src/build/kept.ts",
+            ),
+        )
+
+    def test_git_listing(self):
+        """Test that git lists tracked and untracked, unignored files."""
+        if shutil.which("git") is None:
+            self.skipTest("git is not installed")
+        self._write("tracked.ts", "deleted.ts", "ignored/x.ts", "new.ts")
+        with open(os.path.join(self.test_dir, ".gitignore"), "w") as f:
+            f.write("ignored/\n")
+        self._git("init", "-q")
+        self._git("add", "tracked.ts", "deleted.ts")
+        os.remove(os.path.join(self.test_dir, "deleted.ts"))
+
+        with patch("file_discovery._walk") as walk:
+            paths = list_files(self.test_dir)
+        walk.assert_not_called()
+        self.assertEqual(paths, (".gitignore", "new.ts", "tracked.ts"))
+
+    def test_listing_is_cached(self):
+        """Test that a directory is listed once until the cache is cleared."""
+        self._write("a.ts")
+        self.assertEqual(list_files(self.test_dir), ("a.ts",))
+        self._write("b.ts")
+        self.assertEqual(list_files(self.test_dir), ("a.ts",))
+        clear_cache()
+        self.assertEqual(list_files(self.test_dir), ("a.ts", "b.ts"))
+
+    def test_filter(self):
+        """Test the suffix, exclusion and test file filters."""
+        matches = compile_filter((".ts", ".tsx"), (".d.ts",))
+        self.assertTrue(matches("src/App.tsx"))
+        self.assertFalse(matches("src/App.test.tsx"))
+        self.assertFalse(matches("src/types.d.ts"))
+        self.assertFalse(matches("src/App.css"))
+        self.assertTrue(
+            compile_filter((".ts",), skip_test_files=False)("a.spec.ts")
+        )
+
+    def test_discover_files_prunes_directories(self):
+        """Test that excluded and pruned directories are left out."""
+        listed = [
+            "src/App.tsx",
+            "src/__tests__/helper.ts",
+            "src/utils/util.ts",
+            "src/utilsx/kept.ts",
+        ]
+        self._write(*listed)
+        exclude = [os.path.join(self.test_dir, "src", "utils")]
+
+        # Once walking the directory, once filtering the git listing
+        for git_listing in (None, listed):
+            clear_cache()
+            with patch(
+                "file_discovery._git_listing", return_value=git_listing
+            ):
+                paths = discover_files(
+                    self.test_dir,
+                    compile_filter((".ts", ".tsx")),
+                    exclude,
+                    ["__tests__"],
+                )
+            self.assertEqual(
+                paths,
+                [
+                    os.path.join(self.test_dir, "src", "App.tsx"),
+                    os.path.join(self.test_dir, "src", "utilsx", "kept.ts"),
+                ],
+            )
+
+    def test_discover_inside_excluded_directory(self):
+        """Test that nothing is found below an excluded directory."""
+        self._write("src/App.tsx")
+        with patch.object(file_discovery, "list_files") as listing:
+            paths = discover_files(
+                os.path.join(self.test_dir, "src"),
+                compile_filter((".tsx",)),
+                [self.test_dir],
+            )
+        self.assertEqual(paths, [])
+        listing.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for the line_index module."""
+
+import os
+import re
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import line_index  # noqa: E402
+from line_index import LineIndex  # noqa: E402
+
+_TEXT_LINE_BREAK = re.compile(
+    r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]"
+)
+_UTF8_LINE_BREAK = re.compile(
+    rb"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]"
+)
+
+
+def _index(content):
+    """Index content with the line breaks of str.splitlines.
+
+    Args:
+        content: Text or UTF-8 encoded bytes.
+
+    Returns:
+        LineIndex: The index.
+    """
+    if isinstance(content, str):
+        return LineIndex(content, _TEXT_LINE_BREAK)
+    return LineIndex(content, _UTF8_LINE_BREAK)
+
+
+class TestLineIndex(unittest.TestCase):
+    """Test suite for the line index, with and without NumPy."""
+
+    def _check_against_splitlines(self, text):
+        """Check that the index finds the lines of str.splitlines.
+
+        Args:
+            text: The text to index.
+        """
+        lines = text.splitlines()
+        if not text or text.splitlines(keepends=True)[-1] != lines[-1]:
+            # The index counts the empty line after a final line break
+            lines.append("")
+        for content in (text, text.encode("utf-8")):
+            index = _index(content)
+            self.assertEqual(index.line_count, len(lines))
+            found = [
+                content[index.start(line) : index.end(line)]
+                for line in range(index.line_count)
+            ]
+            if isinstance(content, bytes):
+                found = [line.decode("utf-8") for line in found]
+            self.assertEqual(found, lines)
+
+    def _run_with_and_without_numpy(self, test):
+        """Run a test with NumPy, if installed, and with the fallback.
+
+        Args:
+            test: The test to run.
+        """
+        if line_index.numpy is not None:
+            with self.subTest(numpy=True):
+                test()
+        with self.subTest(numpy=False):
+            with patch.object(line_index, "numpy", None):
+                test()
+
+    def test_lines_match_splitlines(self):
+        """Test that the lines are the ones of str.splitlines."""
+        texts = [
+            "",
+            "one",
+            "one\ntwo\n",
+            "\n\nthree",
+            "é\n€ and 😀\nx",
+            "crlf\r\nlf\ncr\rend",
+            "nel\x85ls\u2028ps\u2029ff\x0cend\n",
+        ]
+
+        def test():
+            for text in texts:
+                self._check_against_splitlines(text)
+
+        self._run_with_and_without_numpy(test)
+
+    def test_offsets_resolve_to_positions(self):
+        """Test that batches of offsets resolve to lines and columns."""
+        text = "ab\ncde\n\nf"
+
+        def test():
+            index = _index(text)
+            offsets = [text.index("f"), 0, text.index("d"), 2, len(text)]
+            self.assertEqual(index.lines_of(offsets), [3, 0, 1, 0, 3])
+            self.assertEqual(
+                index.positions(offsets),
+                [(3, 0), (0, 0), (1, 1), (0, 2), (3, 1)],
+            )
+            self.assertEqual(index.line_of(text.index("\n\n") + 1), 2)
+            self.assertEqual(index.lines_of([]), [])
+
+        self._run_with_and_without_numpy(test)
+
+    def test_non_ascii_text_uses_character_offsets(self):
+        """Test that columns of text count characters, not bytes."""
+        text = "é😀\nabc"
+
+        def test():
+            index = _index(text)
+            self.assertEqual(index.positions([1, 3]), [(0, 1), (1, 0)])
+            self.assertEqual(index.end(0), 2)
+
+        self._run_with_and_without_numpy(test)
+
+
+if __name__ == "__main__":
+    unittest.main()
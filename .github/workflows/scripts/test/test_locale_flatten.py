@@ -0,0 +1,54 @@
+"""Tests for the locale_flatten module."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import compare_translations  # noqa: E402
+import translation_check  # noqa: E402
+from locale_flatten import flatten  # noqa: E402
+
+
+class TestFlatten(unittest.TestCase):
+    """Test suite for flattening nested locale JSON."""
+
+    def test_keys_in_document_order(self):
+        """Test that keys are yielded depth first, in key order."""
+        data = {
+            "a": "1",
+            "b": {"c": "2", "d": {"e": ["3"]}, "empty": {}},
+            "f": None,
+        }
+        self.assertEqual(
+            list(flatten(data)),
+            [("a", "1"), ("b.c", "2"), ("b.d.e", ["3"]), ("f", None)],
+        )
+        self.assertEqual(list(flatten({"a": 1}, "p.")), [("p.a", 1)])
+
+    def test_deep_nesting(self):
+        """Test that nesting deeper than the recursion limit is flattened."""
+        data = {}
+        node = data
+        for _ in range(sys.getrecursionlimit() * 2):
+            node["n"] = {}
+            node = node["n"]
+        node["leaf"] = "x"
+
+        ((key, value),) = flatten(data)
+        self.assertTrue(key.endswith(".n.leaf"))
+        self.assertEqual(value, "x")
+
+    def test_callers(self):
+        """Test the key formats of both scripts."""
+        data = {"a": {"b": "1"}, "c": "2"}
+        self.assertEqual(
+            compare_translations.flatten_json(data, "root"),
+            {"root.a.b": "1", "root.c": "2"},
+        )
+        self.assertEqual(translation_check.get_keys(data), {"a.b", "c"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Tests for the locale_snapshot module."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import locale_snapshot  # noqa: E402
+from locale_snapshot import (  # noqa: E402
+    decode_keys,
+    encode_keys,
+    load_snapshot,
+    save_snapshot,
+    snapshot_key,
+)
+
+
+class TestLocaleSnapshot(unittest.TestCase):
+    """Test suite for encoding, saving and loading key snapshots."""
+
+    def setUp(self):
+        """Set up a snapshot directory."""
+        self.cache_dir = tempfile.mkdtemp()
+        locale_snapshot.clear_memory()
+
+    def tearDown(self):
+        """Clean up the snapshot directory."""
+        shutil.rmtree(self.cache_dir)
+        locale_snapshot.clear_memory()
+
+    def test_round_trip(self):
+        """Test that keys decode in sorted order."""
+        keys = {
+            "organization.title",
+            "organization.members",
+            "login",
+            "événement.nom",
+            "a" * 300,
+            "",
+        }
+        data = encode_keys(keys)
+
+        self.assertEqual(decode_keys(data), sorted(keys))
+        self.assertEqual(decode_keys(encode_keys([])), [])
+        self.assertEqual(decode_keys(encode_keys([""])), [""])
+
+    def test_keys_with_line_breaks_stay_in_memory(self):
+        """Test that keys holding line breaks are not written to disk."""
+        with self.assertRaises(ValueError):
+            encode_keys(["a\nb"])
+        with patch("sys.stderr", new_callable=StringIO):
+            save_snapshot(self.cache_dir, "key", {"a\nb"})
+        self.assertEqual(os.listdir(self.cache_dir), [])
+        self.assertEqual(load_snapshot(self.cache_dir, "key"), {"a\nb"})
+
+    def test_invalid_data_is_rejected(self):
+        """Test that truncated or foreign data does not decode."""
+        data = encode_keys({"one", "two"})
+        for invalid in (data[:-1], data + b"x", b"{}", data[:-3] + b"\xff"):
+            with self.subTest(invalid=invalid):
+                with self.assertRaises(ValueError):
+                    decode_keys(invalid)
+
+    def test_key_depends_on_content(self):
+        """Test that the snapshot key changes with any locale file."""
+        base = snapshot_key([("a.json", b"{}"), ("b.json", None)])
+        self.assertEqual(
+            base, snapshot_key([("a.json", b"{}"), ("b.json", None)])
+        )
+        self.assertNotEqual(
+            base, snapshot_key([("a.json", b"{}"), ("b.json", b"")])
+        )
+        self.assertNotEqual(
+            base, snapshot_key([("a.json", b"{ }"), ("b.json", None)])
+        )
+
+    def test_saved_snapshot_replaces_older_ones(self):
+        """Test that a saved snapshot loads in a new process."""
+        save_snapshot(self.cache_dir, "old", {"stale"})
+        save_snapshot(self.cache_dir, "new", {"b", "a"})
+        locale_snapshot.clear_memory()
+
+        self.assertEqual(os.listdir(self.cache_dir), ["new.keys"])
+        self.assertEqual(load_snapshot(self.cache_dir, "new"), {"a", "b"})
+        self.assertIsNone(load_snapshot(self.cache_dir, "old"))
+        self.assertIsNone(load_snapshot(None, "old"))
+
+    def test_corrupt_snapshot_is_a_miss(self):
+        """Test that an unreadable snapshot is ignored."""
+        with open(os.path.join(self.cache_dir, "key.keys"), "wb") as f:
+            f.write(b"garbage")
+        self.assertIsNone(load_snapshot(self.cache_dir, "key"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,451 @@
+"""Tests for the lsp_server module."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lsp_server import (  # noqa: E402
+    LanguageServer,
+    PositionIndex,
+    apply_change,
+    find_diagnostics,
+    read_message,
+    write_message,
+)
+
+
+def _frame(*messages):
+    """Frame messages as a client would send them.
+
+    Args:
+        *messages: The messages to send.
+
+    Returns:
+        BytesIO: A stream holding the framed messages.
+    """
+    stream = BytesIO()
+    for message in messages:
+        write_message(stream, message)
+    stream.seek(0)
+    return stream
+
+
+def _read_all(stream):
+    """Read every message written to a stream.
+
+    Args:
+        stream: The stream the server wrote to.
+
+    Returns:
+        list: The decoded messages.
+    """
+    stream.seek(0)
+    messages = []
+    while True:
+        message = read_message(stream)
+        if message is None:
+            return messages
+        messages.append(message)
+
+
+def _position(line, character):
+    """Build an LSP position.
+
+    Args:
+        line: Zero-based line.
+        character: Zero-based UTF-16 column.
+
+    Returns:
+        dict: The position.
+    """
+    return {"line": line, "character": character}
+
+
+class TestMessageFraming(unittest.TestCase):
+    """Test suite for reading and writing framed messages."""
+
+    def test_round_trip(self):
+        """Test that written messages are read back unchanged."""
+        messages = [{"id": 1, "text": "héllo"}, {"method": "exit"}]
+        self.assertEqual(_read_all(_frame(*messages)), messages)
+
+    def test_extra_headers_are_ignored(self):
+        """Test that headers other than Content-Length are skipped."""
+        body = b'{"id":1}'
+        stream = BytesIO(
+            b"Content-Type: application/vscode-jsonrpc; charset=utf-8\r\n"
+            b"content-length: %d\r\n\r\n" % len(body) + body
+        )
+        self.assertEqual(read_message(stream), {"id": 1})
+
+    def test_missing_content_length(self):
+        """Test that a header without Content-Length is rejected."""
+        with self.assertRaises(ValueError):
+            read_message(BytesIO(b"Content-Type: x\r\n\r\n{}"))
+
+    def test_invalid_content_length(self):
+        """Test that a Content-Length that is not a number is rejected."""
+        with self.assertRaises(ValueError):
+            read_message(BytesIO(b"Content-Length: x\r\n\r\n{}"))
+
+
+class TestPositionIndex(unittest.TestCase):
+    """Test suite for conversions between offsets and positions."""
+
+    def test_utf16_columns(self):
+        """Test that columns count UTF-16 code units."""
+        text = "a😀b\r\ncé d\nx"
+        index = PositionIndex(text)
+        self.assertEqual(index.position(text.index("b")), _position(0, 3))
+        self.assertEqual(index.position(text.index("d")), _position(1, 3))
+        self.assertEqual(index.offset(_position(0, 3)), text.index("b"))
+        self.assertEqual(index.offset(_position(2, 0)), text.index("x"))
+
+    def test_positions_are_clamped(self):
+        """Test that positions past a line or the text are clamped."""
+        text = "ab\ncd"
+        index = PositionIndex(text)
+        self.assertEqual(index.offset(_position(0, 10)), 2)
+        self.assertEqual(index.offset(_position(9, 0)), len(text))
+
+
+class TestApplyChange(unittest.TestCase):
+    """Test suite for applying document changes."""
+
+    def test_incremental_edit(self):
+        """Test that a range is replaced by the new text."""
+        change = {
+            "range": {"start": _position(1, 2), "end": _position(1, 4)},
+            "text": "XY\nZ",
+        }
+        self.assertEqual(
+            apply_change("one\n😀two\n", change), "one\n😀XY\nZo\n"
+        )
+
+    def test_full_replacement(self):
+        """Test that a change without a range replaces the whole text."""
+        self.assertEqual(apply_change("old", {"text": "new"}), "new")
+
+
+class TestFindDiagnostics(unittest.TestCase):
+    """Test suite for building diagnostics from the checks."""
+
+    def test_ranges_cover_the_violations(self):
+        """Test that both checks report the range of their match."""
+        text = (
+            "const x = t('known');\n"
+            "const y = t('unknown');\n"
+            "const c = '#fff';\n"
+        )
+        diagnostics = find_diagnostics(text, "/src/App.tsx", {"known"})
+
+        self.assertEqual(
+            [(d["source"], d["range"]) for d in diagnostics],
+            [
+                (
+                    "translation_check",
+                    {"start": _position(1, 13), "end": _position(1, 20)},
+                ),
+                (
+                    "css_check",
+                    {"start": _position(2, 11), "end": _position(2, 15)},
+                ),
+            ],
+        )
+        self.assertEqual(
+            diagnostics[0]["message"], "Missing translation key: unknown"
+        )
+        self.assertEqual(diagnostics[1]["code"], "hex_color")
+
+    def test_unmatched_dynamic_keys(self):
+        """Test that keys built at runtime are checked by their parts."""
+        text = "t(`roles.${role}`);\nt(`status.${s}`);\n"
+        diagnostics = find_diagnostics(text, "a.ts", {"roles.admin"})
+
+        self.assertEqual(len(diagnostics), 1)
+        self.assertEqual(diagnostics[0]["code"], "unmatched-dynamic-key")
+        self.assertEqual(diagnostics[0]["severity"], 2)
+        self.assertEqual(
+            diagnostics[0]["range"],
+            {"start": _position(1, 2), "end": _position(1, 15)},
+        )
+        self.assertEqual(
+            diagnostics[0]["message"], "No translation key matches: status.*"
+        )
+
+    def test_checks_follow_the_file_type(self):
+        """Test that only the checks that apply to a file are run."""
+        text = "const c = '#fff'; t('unknown');\n"
+        self.assertEqual(
+            [d["source"] for d in find_diagnostics(text, "a.js", set())],
+            ["translation_check"],
+        )
+        self.assertEqual(find_diagnostics(text, "a.test.tsx", set()), [])
+        self.assertEqual(
+            [d["source"] for d in find_diagnostics(text, "a.ts", None)],
+            ["css_check"],
+        )
+
+
+class TestLanguageServer(unittest.TestCase):
+    """Test suite for a full session with the server."""
+
+    def setUp(self):
+        """Set up a workspace with a locale directory."""
+        self.test_dir = tempfile.mkdtemp()
+        self.locales_dir = os.path.join(self.test_dir, "locales")
+        os.makedirs(self.locales_dir)
+        self._write_keys({"known": "Known"})
+        self.uri = "file://" + os.path.join(self.test_dir, "App.tsx")
+
+    def tearDown(self):
+        """Clean up test directory."""
+        shutil.rmtree(self.test_dir)
+
+    def _write_keys(self, keys):
+        """Write the translation keys of the workspace.
+
+        Args:
+            keys: The locale JSON content.
+        """
+        path = os.path.join(self.locales_dir, "translation.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(keys, f)
+
+    def _run(self, *messages):
+        """Run a session and collect what the server sent.
+
+        Args:
+            *messages: The messages sent by the client.
+
+        Returns:
+            tuple: The exit code and the messages sent by the server.
+        """
+        output = BytesIO()
+        server = LanguageServer(output, self.locales_dir)
+        code = server.serve(
+            _frame({"id": 1, "method": "initialize"}, *messages)
+        )
+        return code, _read_all(output)
+
+    def _diagnostics(self, messages):
+        """Collect the published diagnostics.
+
+        Args:
+            messages: The messages sent by the server.
+
+        Returns:
+            list: The codes of the diagnostics of each publication.
+        """
+        return [
+            [d["code"] for d in m["params"]["diagnostics"]]
+            for m in messages
+            if m.get("method") == "textDocument/publishDiagnostics"
+        ]
+
+    def test_session(self):
+        """Test that edits are applied and the buffer is checked again."""
+        code, messages = self._run(
+            {
+                "method": "textDocument/didOpen",
+                "params": {
+                    "textDocument": {
+                        "uri": self.uri,
+                        "version": 1,
+                        "text": "t('known');\n",
+                    }
+                },
+            },
+            {
+                "method": "textDocument/didChange",
+                "params": {
+                    "textDocument": {"uri": self.uri, "version": 2},
+                    "contentChanges": [
+                        {
+                            "range": {
+                                "start": _position(0, 3),
+                                "end": _position(0, 8),
+                            },
+                            "text": "other",
+                        }
+                    ],
+                },
+            },
+            {
+                "method": "textDocument/didClose",
+                "params": {"textDocument": {"uri": self.uri}},
+            },
+            {"id": 2, "method": "shutdown"},
+            {"method": "exit"},
+        )
+
+        self.assertEqual(code, 0)
+        capabilities = messages[0]["result"]["capabilities"]
+        self.assertEqual(capabilities["textDocumentSync"]["change"], 2)
+        self.assertEqual(
+            self._diagnostics(messages),
+            [[], ["missing-translation-key"], []],
+        )
+        self.assertEqual(
+            messages[-1], {"jsonrpc": "2.0", "id": 2, "result": None}
+        )
+
+    def test_locale_changes_are_reloaded(self):
+        """Test that a watched locale change checks open buffers again."""
+        open_message = {
+            "method": "textDocument/didOpen",
+            "params": {
+                "textDocument": {
+                    "uri": self.uri,
+                    "version": 1,
+                    "text": "t('added');\n",
+                }
+            },
+        }
+        output = BytesIO()
+        server = LanguageServer(output, self.locales_dir)
+        server.handle({"id": 1, "method": "initialize", "params": {}})
+        server.handle(open_message)
+        self._write_keys({"known": "Known", "added": "Added"})
+        server.handle(
+            {
+                "method": "workspace/didChangeWatchedFiles",
+                "params": {
+                    "changes": [
+                        {
+                            "uri": "file://"
+                            + os.path.join(
+                                self.locales_dir, "translation.json"
+                            ),
+                            "type": 2,
+                        }
+                    ]
+                },
+            }
+        )
+
+        self.assertEqual(
+            self._diagnostics(_read_all(output)),
+            [["missing-translation-key"], []],
+        )
+
+    def test_locale_watcher_is_registered(self):
+        """Test that the locale files are watched once initialized."""
+        watched = {"didChangeWatchedFiles": {"dynamicRegistration": True}}
+        output = BytesIO()
+        server = LanguageServer(output, self.locales_dir)
+        server.serve(
+            _frame(
+                {
+                    "id": 1,
+                    "method": "initialize",
+                    "params": {"capabilities": {"workspace": watched}},
+                },
+                {"method": "initialized", "params": {}},
+                {"id": "register-locale-watcher", "result": None},
+                {"method": "exit"},
+            )
+        )
+
+        messages = _read_all(output)
+        self.assertEqual(len(messages), 2)
+        registration = messages[1]["params"]["registrations"][0]
+        self.assertEqual(messages[1]["method"], "client/registerCapability")
+        self.assertEqual(
+            registration["method"], "workspace/didChangeWatchedFiles"
+        )
+        self.assertEqual(
+            registration["registerOptions"]["watchers"][0]["globPattern"],
+            os.path.join(self.locales_dir, "**", "*.json"),
+        )
+
+    def test_locale_watcher_needs_client_support(self):
+        """Test that no watcher is registered without client support."""
+        code, messages = self._run({"method": "initialized", "params": {}})
+
+        self.assertEqual(code, 1)
+        self.assertEqual(len(messages), 1)
+
+    def test_failing_notification_is_logged(self):
+        """Test that a malformed notification does not stop the server."""
+        code, messages = self._run(
+            {"method": "textDocument/didOpen", "params": {}},
+            {
+                "method": "textDocument/didChange",
+                "params": {"textDocument": {}},
+            },
+            {
+                "method": "textDocument/didOpen",
+                "params": {
+                    "textDocument": {"uri": self.uri, "text": "t('x');\n"}
+                },
+            },
+            {"id": 2, "method": "shutdown"},
+            {"method": "exit"},
+        )
+
+        self.assertEqual(code, 0)
+        logged = [
+            m["params"]["message"]
+            for m in messages
+            if m.get("method") == "window/logMessage"
+        ]
+        self.assertEqual(len(logged), 2)
+        self.assertIn("textDocument/didOpen", logged[0])
+        self.assertEqual(
+            self._diagnostics(messages), [["missing-translation-key"]]
+        )
+
+    def test_requests_before_initialize(self):
+        """Test that requests are refused until the server is initialized."""
+        output = BytesIO()
+        server = LanguageServer(output, self.locales_dir)
+        code = server.serve(_frame({"id": 1, "method": "shutdown"}))
+
+        self.assertEqual(code, 1)
+        self.assertEqual(_read_all(output)[0]["error"]["code"], -32002)
+
+    def test_unreadable_messages_are_answered(self):
+        """Test that unreadable messages get an error and are skipped."""
+        stream = _frame({"id": 1, "method": "initialize", "params": {}})
+        stream.seek(0, os.SEEK_END)
+        for body in (b"{not json", b"[1]"):
+            stream.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+        stream.write(b"Content-Length: -1\r\n\r\n")
+        write_message(stream, {"id": 2, "method": "shutdown"})
+        write_message(stream, {"method": "exit"})
+        stream.seek(0)
+
+        output = BytesIO()
+        server = LanguageServer(output, self.locales_dir)
+        code = server.serve(stream)
+
+        self.assertEqual(code, 0)
+        messages = _read_all(output)
+        self.assertEqual(
+            [(m["id"], m.get("error", {}).get("code")) for m in messages],
+            [
+                (1, None),
+                (None, -32700),
+                (None, -32600),
+                (None, -32700),
+                (2, None),
+            ],
+        )
+
+    def test_unknown_request(self):
+        """Test that unknown requests get a method-not-found error."""
+        code, messages = self._run({"id": 2, "method": "textDocument/hover"})
+
+        self.assertEqual(code, 1)
+        self.assertEqual(messages[-1]["error"]["code"], -32601)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+"""Tests for the source_checks module."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import css_check  # noqa: E402
+import file_discovery  # noqa: E402
+from source_checks import (  # noqa: E402
+    SourceFile,
+    check_sources,
+    discover_sources,
+    main,
+)
+
+
+class TestSourceChecks(unittest.TestCase):
+    """Test suite for the single-read driver."""
+
+    def setUp(self):
+        """Set up a source tree and a locale directory."""
+        self.test_dir = tempfile.mkdtemp()
+        self.src = os.path.join(self.test_dir, "src")
+        self.locales_dir = os.path.join(self.test_dir, "locales")
+        os.makedirs(os.path.join(self.src, "__tests__"))
+        os.makedirs(os.path.join(self.src, "utils"))
+        os.makedirs(self.locales_dir)
+        with open(
+            os.path.join(self.locales_dir, "translation.json"),
+            "w",
+            encoding="utf-8",
+        ) as f:
+            json.dump({"known": "Known"}, f)
+
+    def tearDown(self):
+        """Clean up test directory."""
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, relative_path, content):
+        """Write a source file.
+
+        Args:
+            relative_path: Path of the file inside the source tree.
+            content: Content of the file.
+
+        Returns:
+            str: The path of the file.
+        """
+        path = os.path.join(self.src, relative_path)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def _main(self, *args):
+        """Run the driver and capture its output.
+
+        Args:
+            *args: Command line arguments.
+
+        Returns:
+            tuple: The exit code and the output. The error output is kept
+            in self.stderr.
+        """
+        # Every run stands for a new process, which lists the files again
+        file_discovery.clear_cache()
+        argv = ["source_checks.py", "--locales-dir", self.locales_dir]
+        with patch("sys.argv", argv + list(args)):
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                with patch("sys.stderr", new_callable=StringIO) as stderr:
+                    with self.assertRaises(SystemExit) as cm:
+                        main()
+        self.stderr = stderr.getvalue()
+        return cm.exception.code, mock_stdout.getvalue()
+
+    def test_discovery_selects_checks_per_file(self):
+        """Test that each file gets the checks that apply to it."""
+        app = self._write("App.tsx", "")
+        script = self._write("script.js", "")
+        helper = self._write(os.path.join("__tests__", "helper.ts"), "")
+        util = self._write(os.path.join("utils", "util.ts"), "")
+        self._write("App.test.tsx", "")
+        self._write("App.module.css", "")
+
+        sources = discover_sources(
+            [self.src], [], [os.path.join(self.src, "utils")]
+        )
+        self.assertEqual(
+            sources,
+            [
+                SourceFile(app, True, True),
+                SourceFile(script, False, True),
+                SourceFile(helper, False, True),
+                SourceFile(util, False, True),
+            ],
+        )
+
+    def test_since_applies_the_exclusions(self):
+        """Test that changed files are excluded as in a directory scan."""
+        fixtures = os.path.join(self.test_dir, "__fixtures__")
+        os.makedirs(fixtures)
+        fixture = os.path.join(fixtures, "Fixture.tsx")
+        with open(fixture, "w", encoding="utf-8") as f:
+            f.write("t('missing');")
+        util = self._write(os.path.join("utils", "util.ts"), "'#fff';")
+        changed = {fixture: [(1, 1)], os.path.abspath(util): [(1, 1)]}
+
+        with patch("css_check.get_changed_lines", return_value=changed):
+            code, output = self._main(
+                "--since",
+                "HEAD",
+                "--exclude_directories",
+                os.path.join(self.src, "utils"),
+                "--exclude_translation_directories",
+                fixtures,
+            )
+        self.assertEqual(code, 0, output)
+
+    def test_each_file_is_read_once(self):
+        """Test that both checks share a single read of each file."""
+        path = self._write("App.tsx", "const c = '#fff'; t('missing');")
+        missing = {}
+        with patch("builtins.open", wraps=open) as mock_open:
+            results = list(
+                check_sources([SourceFile(path, True, True)], set(), missing)
+            )
+
+        self.assertEqual(mock_open.call_count, 1)
+        self.assertEqual(len(results[0][1]), 1)
+        self.assertEqual(missing, {path: ["missing"]})
+
+    def test_css_results_follow_css_check_order(self):
+        """Test that files are checked in the order css_check reports."""
+        os.makedirs(os.path.join(self.src, "a", "a"))
+        self._write(os.path.join("a", "b.tsx"), "const c = '#fff';")
+        self._write(os.path.join("a", "a", "x.tsx"), "const c = '#fff';")
+        self._write("z.tsx", "const c = '#fff';")
+
+        sources = discover_sources([self.src], [], [])
+        checked = [path for path, _ in check_sources(sources, None, {})]
+        expected = [
+            path
+            for path, _ in css_check.iter_file_violations(
+                [self.src], [], [], []
+            )
+        ]
+        self.assertEqual(checked, expected)
+        self.assertEqual(
+            [os.path.relpath(path, self.src) for path in checked],
+            [
+                os.path.join("a", "a", "x.tsx"),
+                os.path.join("a", "b.tsx"),
+                "z.tsx",
+            ],
+        )
+
+    def test_unmatched_dynamic_keys_warn(self):
+        """Test that unmatched keys built at runtime are only warnings."""
+        self._write("Known.tsx", "t(`kn${suffix}`);")
+        self.assertEqual(self._main("--directories", self.src)[0], 0)
+        self.assertEqual(self.stderr, "")
+
+        roles = self._write("Roles.tsx", "t('roles.' + role);")
+        self.assertEqual(self._main("--directories", self.src)[0], 0)
+        self.assertIn(
+            f"Warning: No translation key matches roles.* in {roles}",
+            self.stderr,
+        )
+
+        self._write("Joined.tsx", "t('roles.' + 'admin');")
+        code, output = self._main("--directories", self.src)
+        self.assertEqual(code, 4)
+        self.assertIn("  - Missing: roles.admin", output)
+
+    def test_exit_codes_per_check(self):
+        """Test that the exit code tells which checks failed."""
+        self._write("App.tsx", "t('known');")
+        self.assertEqual(self._main("--directories", self.src)[0], 0)
+
+        self._write("Style.tsx", "const c = '#fff';")
+        code, output = self._main("--directories", self.src)
+        self.assertEqual(code, 1)
+        self.assertIn("All translation tags validated successfully", output)
+
+        self._write("Text.tsx", "t('missing');")
+        code, output = self._main("--directories", self.src)
+        self.assertEqual(code, 5)
+        self.assertIn("  - Missing: missing", output)
+
+        code, output = self._main(
+            "--directories", self.src, "--checks", "translation"
+        )
+        self.assertEqual(code, 4)
+        self.assertNotIn("EMBEDDED CSS VIOLATIONS FOUND", output)
+
+    def test_missing_locale_directory(self):
+        """Test that a missing locale directory is a configuration error."""
+        shutil.rmtree(self.locales_dir)
+        self.assertEqual(self._main("--directories", self.src)[0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,286 @@
+"""Tests for the split_locales module."""
+
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import split_locales  # noqa: E402
+import translation_check  # noqa: E402
+
+SCRIPT = Path(__file__).resolve().parents[1] / "split_locales.py"
+
+
+class TestSplitLocales(unittest.TestCase):
+    """Test suite for splitting locale files into route bundles."""
+
+    def setUp(self):
+        """Create sources with two routes and locales in two languages."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.src = self.test_dir / "src"
+        self.screens = self.src / "screens"
+        sources = {
+            "components/Header/Header.tsx": (
+                "useTranslation('translation', { keyPrefix: 'header' });\n"
+                "t('title'); tCommon('save');\n"
+            ),
+            "screens/Admin/OrgList/OrgList.tsx": (
+                "useTranslation('translation', { keyPrefix: 'orgList' });\n"
+                "t('title'); t(`sort${order}`); tErrors('notFound');\n"
+            ),
+            "screens/Admin/OrgList/OrgCard.tsx": "tCommon('save');\n",
+            "screens/Auth/Login/Login.tsx": (
+                "useTranslation('translation', { keyPrefix: 'login' });\n"
+                "t('title');\n"
+            ),
+        }
+        for name, content in sources.items():
+            path = self.src / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+
+        self.locales = self.test_dir / "locales"
+        translations = {
+            "en": ("Title", "Save", "Not found"),
+            "fr": ("Titre", "Enregistrer", "Introuvable"),
+        }
+        for locale, (title, save, not_found) in translations.items():
+            locale_dir = self.locales / locale
+            locale_dir.mkdir(parents=True)
+            files = {
+                "translation": {
+                    "header": {"title": title},
+                    "orgList": {
+                        "title": title,
+                        "sortAsc": "A-Z",
+                        "sortDesc": "Z-A",
+                    },
+                    "login": {"title": title},
+                    "unused": {"key": title},
+                },
+                "common": {"save": save},
+                "errors": {"notFound": not_found},
+            }
+            for namespace, data in files.items():
+                (locale_dir / f"{namespace}.json").write_text(
+                    json.dumps(data, indent=2), encoding="utf-8"
+                )
+        self.output = self.test_dir / "out"
+
+    def tearDown(self):
+        """Clean up the temporary tree."""
+        shutil.rmtree(self.test_dir)
+
+    def _usages(self):
+        """Scan the sources and merge their key usage per route.
+
+        Args:
+            None
+
+        Returns:
+            dict: The key usage of each route.
+        """
+        paths = translation_check.get_target_files(directories=[self.src])
+        groups = split_locales.group_by_route(paths, self.screens)
+        return {
+            route: translation_check.scan_key_usage(route_paths)
+            for route, route_paths in groups.items()
+        }
+
+    def _bundle(self, locale, route, namespace):
+        """Read a written bundle.
+
+        Args:
+            locale: Locale of the bundle.
+            route: Route of the bundle.
+            namespace: Namespace of the bundle.
+
+        Returns:
+            dict: The bundle.
+        """
+        path = self.output / locale / route / f"{namespace}.json"
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def test_group_by_route(self):
+        """Test that files below the route depth belong to their route."""
+        paths = [
+            self.src / "components" / "a.tsx",
+            self.screens / "Admin" / "OrgList" / "a.tsx",
+            self.screens / "Admin" / "OrgList" / "nested" / "b.tsx",
+            self.screens / "Admin" / "index.tsx",
+        ]
+        groups = split_locales.group_by_route(paths, self.screens)
+        self.assertEqual(
+            groups,
+            {
+                None: [paths[0], paths[3]],
+                "Admin/OrgList": [paths[1], paths[2]],
+            },
+        )
+        self.assertEqual(
+            list(split_locales.group_by_route(paths, self.screens, 1)),
+            [None, "Admin"],
+        )
+
+    def test_bundles(self):
+        """Test that routes only get the keys shared bundles lack."""
+        manifest = split_locales.split_locales(
+            self.locales, self.output, self._usages()
+        )
+
+        self.assertEqual(
+            self._bundle("fr", "_shared", "translation"),
+            {"header": {"title": "Titre"}, "unused": {"key": "Titre"}},
+        )
+        self.assertEqual(
+            self._bundle("fr", "_shared", "common"), {"save": "Enregistrer"}
+        )
+        self.assertEqual(
+            self._bundle("fr", "Admin/OrgList", "translation"),
+            {
+                "orgList": {
+                    "title": "Titre",
+                    "sortAsc": "A-Z",
+                    "sortDesc": "Z-A",
+                }
+            },
+        )
+        self.assertEqual(self._bundle("fr", "Admin/OrgList", "common"), {})
+        self.assertEqual(
+            self._bundle("en", "Admin/OrgList", "errors"),
+            {"notFound": "Not found"},
+        )
+        self.assertEqual(
+            self._bundle("en", "Auth/Login", "translation"),
+            {"login": {"title": "Title"}},
+        )
+
+        self.assertEqual(manifest["locales"], ["en", "fr"])
+        self.assertEqual(
+            sorted(manifest["routes"]), ["Admin/OrgList", "Auth/Login"]
+        )
+        org_list = manifest["routes"]["Admin/OrgList"]
+        self.assertEqual(org_list["path"], "Admin/OrgList")
+        self.assertEqual(org_list["sizes"]["en"]["keys"], 4)
+        size = sum(
+            len(path.read_bytes())
+            for path in (self.output / "en" / "Admin/OrgList").iterdir()
+        )
+        self.assertEqual(org_list["sizes"]["en"]["bytes"], size)
+        self.assertEqual(
+            json.loads((self.output / "manifest.json").read_text()), manifest
+        )
+        self.assertIn(
+            "Admin/OrgList",
+            split_locales.format_manifest(manifest, "en"),
+        )
+
+    def test_drop_unused(self):
+        """Test that unused keys are only dropped when the usage is known."""
+        split_locales.split_locales(
+            self.locales, self.output, self._usages(), drop_unused=True
+        )
+        self.assertEqual(
+            self._bundle("en", "_shared", "translation"),
+            {"header": {"title": "Title"}},
+        )
+
+        (self.screens / "Auth" / "Login" / "Login.tsx").write_text(
+            "useTranslation('translation');\nt(label);\n", encoding="utf-8"
+        )
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            split_locales.split_locales(
+                self.locales, self.output, self._usages(), drop_unused=True
+            )
+        shared = self._bundle("en", "_shared", "translation")
+        self.assertEqual(shared["unused"], {"key": "Title"})
+        self.assertEqual(shared["login"], {"title": "Title"})
+        self.assertNotIn("orgList", shared)
+        self.assertIn("unused keys of translation", stderr.getvalue())
+
+    def test_stale_bundles_are_removed(self):
+        """Test that bundles of an earlier run are removed, but not others."""
+        split_locales.split_locales(self.locales, self.output, self._usages())
+        shutil.rmtree(self.locales / "fr")
+        notes = self.output / "notes.txt"
+        notes.write_text("kept", encoding="utf-8")
+
+        usages = self._usages()
+        del usages["Auth/Login"]
+        manifest = split_locales.split_locales(
+            self.locales, self.output, usages
+        )
+        self.assertEqual(list(manifest["routes"]), ["Admin/OrgList"])
+        self.assertFalse((self.output / "fr").exists())
+        self.assertFalse((self.output / "en" / "Auth").exists())
+        self.assertTrue(notes.exists())
+
+    def test_entry_point(self):
+        """Test the command line writes the bundles and prints the sizes."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(SCRIPT),
+                "--output-dir",
+                str(self.output),
+                "--src-dir",
+                str(self.src),
+                "--screens-dir",
+                str(self.screens),
+                "--locales-root",
+                str(self.locales),
+                "--jobs",
+                "2",
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("Auth/Login", result.stdout)
+        self.assertTrue((self.output / "manifest.json").exists())
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(SCRIPT),
+                "--output-dir",
+                str(self.output),
+                "--locales-root",
+                str(self.test_dir / "missing"),
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        self.assertEqual(result.returncode, 2)
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(SCRIPT),
+                "--output-dir",
+                str(self.locales),
+                "--src-dir",
+                str(self.src),
+                "--locales-root",
+                str(self.locales),
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        self.assertEqual(result.returncode, 2)
+        self.assertTrue((self.locales / "en" / "common.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
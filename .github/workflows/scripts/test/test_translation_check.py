@@ -8,6 +8,7 @@ import shutil
 import tempfile
 import subprocess
 import importlib.util
+from io import StringIO
 from pathlib import Path
 from unittest.mock import patch
 
@@ -57,6 +58,25 @@ class TestTranslationCheck(unittest.TestCase):
             f.write("{invalid}")
         self.assertIn("login", translation_check.load_locale_keys(self.en_dir))
 
+    def test_load_locales_snapshot(self):
+        """Verify keys come from a snapshot until a locale file changes."""
+        cache_dir = os.path.join(self.test_dir, "cache")
+        translation_check.locale_snapshot.clear_memory()
+        keys = translation_check.load_locale_keys(self.en_dir, cache_dir)
+        translation_check.locale_snapshot.clear_memory()
+
+        with patch.object(translation_check, "get_keys") as get_keys:
+            cached = translation_check.load_locale_keys(self.en_dir, cache_dir)
+        get_keys.assert_not_called()
+        self.assertEqual(cached, keys)
+
+        with open(self.common_json, "w", encoding="utf-8") as f:
+            json.dump({"logout": "Logout"}, f)
+        self.assertEqual(
+            translation_check.load_locale_keys(self.en_dir, cache_dir),
+            {"logout"},
+        )
+
     def test_load_locales_not_found(self):
         """Verify exception on invalid locale path."""
         with self.assertRaises(FileNotFoundError):
@@ -85,6 +105,27 @@ class TestTranslationCheck(unittest.TestCase):
             {"key"},
         )
 
+    def test_locate_tags_offsets(self):
+        """Verify located tags carry the offsets of the raw key."""
+        content = "// translation-check-keyPrefix: ns\nt('a'); t('x.b')"
+        self.assertEqual(
+            translation_check.locate_translation_tags(content),
+            [(38, 39, "ns.a"), (46, 49, "x.b")],
+        )
+
+    def test_check_source_reads_once(self):
+        """Verify both checks share a single read of the file."""
+        p = Path(self.test_dir) / "c.tsx"
+        p.write_text("t('missing'); t(`roles.${r}`); t('login');")
+        index = translation_check.KeyIndex({"login"})
+        with patch.object(Path, "read_text", autospec=True) as read_text:
+            read_text.side_effect = (
+                lambda path, **kwargs: p.read_bytes().decode()
+            )
+            result = translation_check.check_source(p, {"login"}, index)
+        self.assertEqual(read_text.call_count, 1)
+        self.assertEqual(result, (["missing"], ["roles.*"]))
+
     def test_find_tags_io_error(self):
         """Verify handling of inaccessible files."""
         tags = translation_check.find_translation_tags(Path(self.test_dir))
@@ -130,6 +171,236 @@ class TestTranslationCheck(unittest.TestCase):
             0,
         )
 
+    def test_locate_dynamic_tags(self):
+        """Verify template-literal and concatenated keys are split."""
+        content = (
+            "useTranslation('translation', { keyPrefix: 'ns' });\n"
+            "t(`roles.${role}.title`); t('roles.' + a + b, {});\n"
+            "t(prefix + 'Label'); t(`${a}${b}`); t(key); t('static');\n"
+            "t('common:' + name); t(`done`); t('roles.' + 'admin');\n"
+        )
+        self.assertEqual(
+            [
+                parts
+                for _, _, parts in translation_check.locate_dynamic_tags(
+                    content
+                )
+            ],
+            [
+                ("roles.", ".title"),
+                ("roles.", ""),
+                ("ns.", "Label"),
+            ],
+        )
+        start, end, _ = translation_check.locate_dynamic_tags(content)[0]
+        self.assertEqual(content[start:end], "`roles.${role}.title`")
+        self.assertEqual(
+            translation_check.find_translation_tags(content),
+            {"ns.static", "ns.done", "roles.admin"},
+        )
+
+    def test_key_index(self):
+        """Verify prefix, suffix and pattern queries on the key index."""
+        index = translation_check.KeyIndex(
+            ["roles.admin.title", "roles.user", "status.open", "rolesX"]
+        )
+        self.assertIn("roles.user", index)
+        self.assertNotIn("roles", index)
+        self.assertEqual(
+            index.starting_with("roles."), ["roles.admin.title", "roles.user"]
+        )
+        self.assertEqual(index.ending_with(".open"), ["status.open"])
+        self.assertTrue(index.matches(("roles.", ".title")))
+        self.assertTrue(index.matches(("", "user")))
+        self.assertTrue(index.matches(("r", "admin", "")))
+        self.assertFalse(index.matches(("roles.", ".open")))
+        self.assertFalse(index.matches(("roles.admin.title", "x")))
+        self.assertFalse(index.matches(("status.",)))
+
+    def test_main_unmatched_dynamic_flow(self):
+        """Verify a dynamic key matching no known key is only a warning."""
+        p = Path(self.test_dir) / "d.tsx"
+        p.write_text("t(`auth.${a}`); t(`roles.${r}`);", encoding="utf-8")
+
+        with patch(
+            "sys.argv",
+            [
+                "translation_check.py",
+                "--locales-dir",
+                self.en_dir,
+                "--files",
+                str(p),
+            ],
+        ):
+            with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+                with patch("sys.stdout", new_callable=StringIO):
+                    with self.assertRaises(SystemExit) as cm:
+                        translation_check.main()
+        self.assertEqual(cm.exception.code, 0)
+        self.assertEqual(
+            mock_stderr.getvalue(),
+            f"Warning: No translation key matches roles.* in {p}\n",
+        )
+
+    def test_find_unused_keys(self):
+        """Verify keys used by calls, literals or dynamic keys are kept."""
+        p = Path(self.test_dir) / "u.tsx"
+        p.write_text(
+            "useTranslation('translation', { keyPrefix: 'ns' });\n"
+            "t('used'); t(`roles.${r}`); const options = ['daily'];\n",
+            encoding="utf-8",
+        )
+        usage = translation_check.scan_key_usage([p])
+        keys = [
+            "ns.used",
+            "ns.daily",
+            "roles.admin",
+            "ns.unused",
+            "other.used",
+        ]
+        self.assertEqual(
+            translation_check.find_unused_keys(keys, usage),
+            ["ns.unused", "other.used"],
+        )
+
+    def test_locate_hooks(self):
+        """Verify each t function gets the namespace and prefix of its hook."""
+        content = (
+            "const { t } = useTranslation('translation', {\n"
+            "  keyPrefix: 'events',\n});\n"
+            "const { t: tCommon, i18n } = useTranslation('common');\n"
+            "const { t: tAny } = useTranslation();\n"
+            "const { t: tScoped } = useTranslation('x', { keyPrefix: k });\n"
+        )
+        Hook = translation_check.Hook
+        self.assertEqual(
+            translation_check.locate_hooks(content),
+            [
+                Hook("t", "translation", "events"),
+                Hook("tCommon", "common", ""),
+                Hook("tAny", "translation", ""),
+                Hook("tScoped", "x", None),
+            ],
+        )
+        self.assertEqual(
+            translation_check.locate_hooks(
+                "// translation-check-keyPrefix: ns\nt('a');"
+            ),
+            [Hook("t", "*", "ns")],
+        )
+
+    def test_usage_follows_each_hook(self):
+        """Verify calls resolve against the prefix of their own hook."""
+        p = Path(self.test_dir) / "h.tsx"
+        p.write_text(
+            "const { t } = useTranslation('translation', "
+            "{ keyPrefix: 'events' });\n"
+            "const { t: tYear } = useTranslation('translation', "
+            "{ keyPrefix: 'year' });\n"
+            "const { t: tCommon } = useTranslation('common');\n"
+            "t('title'); tYear('days.mon'); tYear(`months.${m}`);\n"
+            "t(option); tCommon(name);\n",
+            encoding="utf-8",
+        )
+        usage = translation_check.scan_key_usage([p])
+        keys = [
+            "events.title",
+            "events.any",
+            "year.days.mon",
+            "year.months.jan",
+            "year.days.tue",
+            "other",
+        ]
+        self.assertEqual(
+            translation_check.find_unused_keys(keys, usage),
+            ["other", "year.days.tue"],
+        )
+        self.assertEqual(
+            translation_check.find_unresolved_files(usage, "common"), [str(p)]
+        )
+        self.assertEqual(
+            translation_check.find_unresolved_files(usage, "translation"), []
+        )
+
+    def test_unused_savings_per_locale(self):
+        """Verify unused keys and their bytes are reported per locale."""
+        fr_dir = os.path.join(self.locales_dir, "fr")
+        os.makedirs(fr_dir)
+        with open(os.path.join(fr_dir, "common.json"), "w") as f:
+            json.dump(
+                {"login": "Connexion", "auth": {"signup": "S'inscrire"}}, f
+            )
+        usage = translation_check.KeyUsage({"login"}, set(), set(), set())
+
+        report = translation_check.find_unused_by_locale(self.en_dir, usage)
+        self.assertEqual(sorted(report), ["en", "fr"])
+        unused = report["fr"]["common.json"]
+        self.assertEqual(unused.keys, ["auth.signup"])
+        remaining = json.dumps({"login": "Connexion"}, indent=2)
+        self.assertEqual(unused.size - unused.saved, len(remaining))
+        self.assertIn(
+            "    - auth.signup",
+            translation_check.format_unused_report(report, "en"),
+        )
+
+        usage.unresolved.add(("common", "a.tsx"))
+        report = translation_check.find_unused_by_locale(self.en_dir, usage)
+        self.assertEqual(report["en"]["common.json"].unresolved, ["a.tsx"])
+        output = translation_check.format_unused_report(report, "en")
+        self.assertIn("Possibly unused translation keys in en:", output)
+        self.assertIn("  en: 0 of ", output)
+
+    def test_unused_entry_point(self):
+        """Verify --unused scans in parallel and reports unused keys."""
+        for name in ("a.tsx", "b.tsx"):
+            (Path(self.test_dir) / name).write_text(
+                "t('login')", encoding="utf-8"
+            )
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(SCRIPT_DIR / "translation_check.py"),
+                "--locales-dir",
+                self.en_dir,
+                "--directories",
+                self.test_dir,
+                "--unused",
+                "--jobs",
+                "2",
+                "--no-cache",
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("  common.json:\n    - auth.signup\n", result.stdout)
+        self.assertIn("  en: ", result.stdout)
+
+    def test_unused_without_locale_files(self):
+        """Verify --unused fails cleanly on a directory without locales."""
+        empty_dir = os.path.join(self.locales_dir, "empty")
+        os.makedirs(empty_dir)
+        with patch(
+            "sys.argv",
+            [
+                "translation_check.py",
+                "--locales-dir",
+                empty_dir,
+                "--directories",
+                self.test_dir,
+                "--unused",
+                "--jobs",
+                "1",
+                "--no-cache",
+            ],
+        ):
+            with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+                with self.assertRaises(SystemExit) as cm:
+                    translation_check.main()
+        self.assertEqual(cm.exception.code, 2)
+        self.assertIn("No locale files found", mock_stderr.getvalue())
+
     def test_main_success_flow(self):
         """Verify exit code 0 on successful validation."""
         with patch(
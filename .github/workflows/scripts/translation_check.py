@@ -3,29 +3,109 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import functools
 import json
+import os
 import re
 import sys
+from collections import namedtuple
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import file_discovery  # noqa: E402
+import locale_flatten  # noqa: E402
+import locale_snapshot  # noqa: E402
+
+# Matches: useTranslation('translation', { keyPrefix: 'namespace' })
+_KEY_PREFIX_PATTERN = re.compile(
+    r"useTranslation\s*\([^)]*keyPrefix\s*:\s*['\"]([^'\"]+)['\"]"
+)
+# Matches: // translation-check-keyPrefix: namespace
+_COMMENT_PREFIX_PATTERN = re.compile(
+    r"(?://|/\*)\s*translation-check-keyPrefix:\s*(\S+)"
+)
+# Matches: t('key') and i18n.t('key'), capturing the key, unless the key is
+# concatenated with something else
+_TAG_PATTERN = re.compile(
+    r"(?:(?:\bi18n)\.)?\bt\(\s*['\"]([^'\" \n]+)['\"](?!\s*\+)"
+)
+# Operands of a key built at runtime: string literals, template literals
+# and expressions such as role, user.role or getRole()
+_KEY_OPERAND = (
+    r"'[^'\\\n]*'|\"[^\"\\\n]*\"|`[^`\\]*`"
+    r"|[A-Za-z_$][\w$]*(?:\??\.[A-Za-z_$][\w$]*|\[[^\]\n]*\])*"
+    r"(?:\([^()\n]*\))?"
+)
+_KEY_OPERAND_PATTERN = re.compile(_KEY_OPERAND)
+# Matches: t(`roles.${role}`) and t('roles.' + role), capturing the argument
+_DYNAMIC_TAG_PATTERN = re.compile(
+    rf"(?:\bi18n\.)?\bt\(\s*((?:{_KEY_OPERAND})"
+    rf"(?:\s*\+\s*(?:{_KEY_OPERAND}))*)\s*[,)]"
+)
+# Matches: the argument of a call to any t function, capturing it
+_CALL_ARGUMENT_PATTERN = re.compile(
+    rf"((?:{_KEY_OPERAND})(?:\s*\+\s*(?:{_KEY_OPERAND}))*)\s*[,)]"
+)
+# Matches: ${expression} inside a template literal
+_TEMPLATE_HOLE_PATTERN = re.compile(r"\$\{[^}]*\}")
+# Suffixes of the files checked for translation keys
+TRANSLATED_SUFFIXES = (".ts", ".tsx", ".js", ".jsx")
+# Locale files holding the valid keys, in the order they are loaded
+_LOCALE_FILES = ("common.json", "translation.json", "errors.json")
+# Matches: string literals that may hold a key passed to t() in a variable
+_KEY_LITERAL_PATTERN = re.compile(r"(['\"`])([^'\"`\\\n]+)\1")
+# Matches: const { t: tCommon } = useTranslation('common', { keyPrefix: 'x' }),
+# capturing the destructured names and the arguments of the hook
+_HOOK_PATTERN = re.compile(
+    r"\{([^{}]*)\}\s*=\s*useTranslation\s*\(((?:[^()]|\([^()]*\))*)\)"
+)
+# Matches: the t function among the destructured names, capturing its alias
+_HOOK_NAME_PATTERN = re.compile(
+    r"(?<![\w$])t\s*(?::\s*([A-Za-z_$][\w$]*)\s*)?(?:,|\Z)"
+)
+# Matches: the namespace a hook is called with, as a string or the first
+# string of an array
+_HOOK_NAMESPACE_PATTERN = re.compile(r"\s*\[?\s*(['\"])([^'\"]+)\1")
+# Matches: the keyPrefix option of a hook, capturing it when it is a string
+_HOOK_PREFIX_PATTERN = re.compile(r"keyPrefix\s*:\s*(?:(['\"])([^'\"]*)\1)?")
+# Namespace of the hooks called without one, as set up in src/utils/i18n.ts
+_DEFAULT_NAMESPACE = "translation"
+# Namespace of the t functions whose hook is unknown
+_ANY_NAMESPACE = "*"
+
+# Keys that source files may use: the keys named by t() calls, string
+# literals resolved like keys, the literal parts of keys built at runtime,
+# and the namespaces and files of the calls whose key is held in a variable
+# and could be any key of the namespace
+KeyUsage = namedtuple(
+    "KeyUsage", ["keys", "literals", "dynamic", "unresolved"]
+)
+# Unused keys of a locale file, with the size of the file, the bytes
+# removing them saves and the files whose keys held in variables may still
+# use them
+UnusedKeys = namedtuple("UnusedKeys", ["keys", "size", "saved", "unresolved"])
+# A t function returned by useTranslation: the name it is called by, its
+# namespace and its keyPrefix, empty without one and None when it is not a
+# string
+Hook = namedtuple("Hook", ["name", "namespace", "prefix"])
+
 
 def get_keys(data: dict, prefix: str = "") -> set[str]:
     """Flatten nested translation JSON into dot-notation keys.
 
     Args:
         data: Parsed JSON dictionary containing translation keys.
-        prefix: Prefix used for nested key traversal.
+        prefix: Prefix prepended to every key, ending with a dot for
+            nested keys.
 
     Returns:
         keys: A set of flattened translation keys.
     """
-    keys: set[str] = set()
-    for key, value in data.items():
-        if isinstance(value, dict):
-            keys.update(get_keys(value, f"{prefix}{key}."))
-        else:
-            keys.add(f"{prefix}{key}")
-    return keys
+    return {key for key, _ in locale_flatten.flatten(data, prefix)}
 
 
 def get_translation_keys(data: dict) -> set[str]:
@@ -40,11 +120,19 @@ def get_translation_keys(data: dict) -> set[str]:
     return get_keys(data)
 
 
-def load_locale_keys(locales_dir: str | Path) -> set[str]:
+def load_locale_keys(
+    locales_dir: str | Path, cache_dir: str | Path | None = None
+) -> set[str]:
     """Load all valid translation keys from locale JSON files.
 
+    The keys are taken from a snapshot of the flattened keys when the
+    content of the locale files has not changed since it was built, and
+    the snapshot is rebuilt otherwise. Snapshots are kept in memory, and
+    in cache_dir when given.
+
     Args:
         locales_dir: Path to the locale directory.
+        cache_dir: Optional directory of the snapshots.
 
     Returns:
         keys: A set of all valid translation keys.
@@ -56,20 +144,42 @@ def load_locale_keys(locales_dir: str | Path) -> set[str]:
     if not base.exists():
         raise FileNotFoundError(locales_dir)
 
-    keys: set[str] = set()
+    # Whether every locale file could be read and parsed
+    complete = True
+    contents: list[tuple[str, bytes | None]] = []
+    for name in _LOCALE_FILES:
+        try:
+            contents.append((name, (base / name).read_bytes()))
+        except FileNotFoundError:
+            contents.append((name, None))
+        except OSError as exc:
+            print(
+                f"Warning: Failed to parse {base / name}: {exc}",
+                file=sys.stderr,
+            )
+            contents.append((name, None))
+            complete = False
 
-    for name in ("common.json", "translation.json", "errors.json"):
-        path = base / name
-        if path.exists():
+    snapshot = locale_snapshot.snapshot_key(contents)
+    cached = locale_snapshot.load_snapshot(cache_dir, snapshot)
+    keys: set[str] = set()
+    if cached is not None:
+        keys.update(cached)
+    else:
+        for name, content in contents:
+            if content is None:
+                continue
             try:
-                keys.update(
-                    get_keys(json.loads(path.read_text(encoding="utf-8")))
-                )
-            except (json.JSONDecodeError, OSError) as exc:
+                keys.update(get_keys(json.loads(content.decode("utf-8"))))
+            except (json.JSONDecodeError, UnicodeDecodeError) as exc:
                 print(
-                    f"Warning: Failed to parse {path}: {exc}",
+                    f"Warning: Failed to parse {base / name}: {exc}",
                     file=sys.stderr,
                 )
+                complete = False
+        # Files that cannot be parsed are reported again on every run
+        if complete:
+            locale_snapshot.save_snapshot(cache_dir, snapshot, keys)
 
     if not keys:
         print(
@@ -80,6 +190,137 @@ def load_locale_keys(locales_dir: str | Path) -> set[str]:
     return keys
 
 
+class KeyIndex:
+    """Sorted translation keys, searched by prefix and suffix.
+
+    The keys, and the keys spelled backwards, are kept in sorted arrays,
+    so the keys starting or ending with a string are found with a binary
+    search instead of a scan of all keys.
+    """
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        """Index the keys.
+
+        Args:
+            keys: The translation keys.
+
+        Returns:
+            None
+        """
+        self._keys = sorted(set(keys))
+        self._reversed_keys = sorted(key[::-1] for key in self._keys)
+
+    def __len__(self) -> int:
+        """Return the number of keys.
+
+        Args:
+            None
+
+        Returns:
+            int: The number of keys.
+        """
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        """Tell whether a key is known.
+
+        Args:
+            key: The key.
+
+        Returns:
+            bool: True if the key is known.
+        """
+        index = bisect.bisect_left(self._keys, key)
+        return index < len(self._keys) and self._keys[index] == key
+
+    @staticmethod
+    def _starting_with(keys: list[str], prefix: str) -> list[str]:
+        """Return the sorted keys starting with a prefix.
+
+        Args:
+            keys: Sorted keys.
+            prefix: The prefix.
+
+        Returns:
+            list: The keys starting with the prefix.
+        """
+        start = bisect.bisect_left(keys, prefix)
+        # No key holds a character above the last code point
+        end = bisect.bisect_left(keys, prefix + "\U0010ffff", start)
+        return keys[start:end]
+
+    def starting_with(self, prefix: str) -> list[str]:
+        """Return the keys starting with a prefix.
+
+        Args:
+            prefix: The prefix.
+
+        Returns:
+            list: The keys, in sorted order.
+        """
+        return self._starting_with(self._keys, prefix)
+
+    def ending_with(self, suffix: str) -> list[str]:
+        """Return the keys ending with a suffix.
+
+        Args:
+            suffix: The suffix.
+
+        Returns:
+            list: The keys, in the order of their reversed spelling.
+        """
+        return [
+            key[::-1]
+            for key in self._starting_with(self._reversed_keys, suffix[::-1])
+        ]
+
+    def matching(self, parts: Sequence[str]) -> Iterator[str]:
+        """Find the keys that can be built from the parts of a key.
+
+        Args:
+            parts: The literal parts of the key, with an unknown part of any
+                length between two parts, as found by locate_dynamic_tags.
+
+        Yields:
+            str: Each key starting with the first part, ending with the last
+            part and holding the other parts in order in between.
+        """
+        if len(parts) == 1:
+            if parts[0] in self:
+                yield parts[0]
+            return
+        prefix, suffix = parts[0], parts[-1]
+        if prefix or not suffix:
+            candidates = self.starting_with(prefix)
+        else:
+            candidates = self.ending_with(suffix)
+        if len(parts) == 2:
+            length = len(prefix) + len(suffix)
+            for key in candidates:
+                if (
+                    len(key) >= length
+                    and key.startswith(prefix)
+                    and key.endswith(suffix)
+                ):
+                    yield key
+            return
+        pattern = re.compile(".*".join(map(re.escape, parts)), re.DOTALL)
+        for key in candidates:
+            if pattern.fullmatch(key):
+                yield key
+
+    def matches(self, parts: Sequence[str]) -> bool:
+        """Tell whether any key can be built from the parts of a key.
+
+        Args:
+            parts: The literal parts of the key, as for matching.
+
+        Returns:
+            bool: True if some key matches the parts.
+        """
+        return next(self.matching(parts), None) is not None
+
+
 def find_translation_tags(source: str | Path) -> set[str]:
     """Find all translation tags used inside a source file or string.
 
@@ -108,22 +349,30 @@ def find_translation_tags(source: str | Path) -> set[str]:
             content = source.read_text(encoding="utf-8")
         except (OSError, UnicodeDecodeError):
             return set()
+        source_name = str(source)
     else:
         content = source
+        source_name = "source"
+
+    return {tag for _, _, tag in locate_translation_tags(content, source_name)}
+
+
+def _primary_prefix(content: str, source_name: str | None) -> str | None:
+    """Find the keyPrefix the keys of a source are resolved against.
 
+    Args:
+        content: The source code.
+        source_name: Name of the source used in warnings, or None to not
+            warn about multiple keyPrefixes.
+
+    Returns:
+        prefix: The first keyPrefix of the source, or None if it has none.
+    """
     # Find keyPrefix from useTranslation calls
-    # Matches: useTranslation('translation', { keyPrefix: 'namespace' })
-    key_prefix_pattern = (
-        r"useTranslation\s*\([^)]*keyPrefix\s*:\s*['\"]([^'\"]+)['\"]"
-    )
-    key_prefixes = re.findall(key_prefix_pattern, content)
+    key_prefixes = _KEY_PREFIX_PATTERN.findall(content)
 
     # Also check for explicit keyPrefix comment directive
-    # Matches: // translation-check-keyPrefix: namespace
-    comment_prefix_pattern = (
-        r"(?://|/\*)\s*translation-check-keyPrefix:\s*(\S+)"
-    )
-    comment_prefixes = re.findall(comment_prefix_pattern, content)
+    comment_prefixes = _COMMENT_PREFIX_PATTERN.findall(content)
 
     # Combine prefixes from useTranslation and comments
     all_prefixes = key_prefixes + comment_prefixes
@@ -131,32 +380,130 @@ def find_translation_tags(source: str | Path) -> set[str]:
     # Get the primary keyPrefix (if multiple, use the first one found)
     # Note: This assumes single keyPrefix per file. Files with multiple
     # components using different keyPrefixes may have inaccurate results.
-    if len(all_prefixes) > 1:
-        file_name = str(source) if isinstance(source, Path) else "source"
+    if source_name is not None and len(all_prefixes) > 1:
         print(
-            f"Warning: Multiple keyPrefixes found in {file_name}. "
+            f"Warning: Multiple keyPrefixes found in {source_name}. "
             f"Using first: '{all_prefixes[0]}'. Found: {all_prefixes}",
             file=sys.stderr,
         )
-    primary_prefix = all_prefixes[0] if all_prefixes else None
+    return all_prefixes[0] if all_prefixes else None
+
+
+def locate_translation_tags(
+    content: str, source_name: str = "source"
+) -> list[tuple[int, int, str]]:
+    """Find the translation tags used in a source string and where they are.
+
+    Keys are resolved against the keyPrefix of the file as described in
+    find_translation_tags. Keys concatenated from string literals only,
+    such as ``t('roles.' + 'admin')``, are joined into a single key.
+
+    Args:
+        content: The source code.
+        source_name: Name of the source used in warnings.
+
+    Returns:
+        tags: The start and end offsets of the key inside each ``t()``
+        call, and the key it resolves to, in order of appearance.
+    """
+    primary_prefix = _primary_prefix(content, source_name)
 
     # Find all t('key') calls
-    tags = re.findall(
-        r"(?:(?:\bi18n)\.)?\bt\(\s*['\"]([^'\" \n]+)['\"]",
-        content,
-    )
+    located = [
+        (match.start(1), match.end(1), match.group(1))
+        for match in _TAG_PATTERN.finditer(content)
+    ]
+    # Keys concatenated from string literals only, such as t('a.' + 'b'),
+    # are known before runtime
+    for match in _DYNAMIC_TAG_PATTERN.finditer(content):
+        parts = _key_parts(match.group(1))
+        if parts is not None and len(parts) == 1 and parts[0]:
+            located.append((match.start(1), match.end(1), parts[0]))
 
-    result = set()
-    for tag in tags:
+    result = []
+    for start, end, key in sorted(located):
         # Remove namespace prefix if present (e.g., "translation:key" -> "key")
-        clean_tag = tag.split(":")[-1]
+        clean_tag = key.split(":")[-1]
 
         # If the tag already contains a dot (full path), use it as-is
         # Otherwise, prefix it with the keyPrefix if one exists
         if "." in clean_tag or primary_prefix is None:
-            result.add(clean_tag)
+            tag = clean_tag
         else:
-            result.add(f"{primary_prefix}.{clean_tag}")
+            tag = f"{primary_prefix}.{clean_tag}"
+        result.append((start, end, tag))
+
+    return result
+
+
+def _key_parts(argument: str) -> list[str] | None:
+    """Split a key built at runtime into its known and unknown parts.
+
+    Args:
+        argument: The argument of the ``t()`` call, as matched by
+            _DYNAMIC_TAG_PATTERN.
+
+    Returns:
+        parts: The literal text of the key, split where an unknown value
+        is inserted, or None if the argument is a single string literal.
+    """
+    operands = _KEY_OPERAND_PATTERN.findall(argument)
+    if len(operands) == 1 and operands[0][0] in "'\"":
+        return None
+
+    parts = [""]
+    for operand in operands:
+        if operand[0] in "'\"":
+            parts[-1] += operand[1:-1]
+        elif operand[0] == "`":
+            pieces = _TEMPLATE_HOLE_PATTERN.split(operand[1:-1])
+            parts[-1] += pieces[0]
+            parts.extend(pieces[1:])
+        else:
+            parts.append("")
+    if len(parts) > 2:
+        # Consecutive values make up a single unknown part
+        parts[1:-1] = [part for part in parts[1:-1] if part]
+    return parts
+
+
+def locate_dynamic_tags(
+    content: str,
+) -> list[tuple[int, int, tuple[str, ...]]]:
+    """Find the translation keys built at runtime in a source string.
+
+    These are the keys written as template literals, such as
+    ``t(`roles.${role}`)``, or concatenated, such as ``t('roles.' + role)``.
+    Keys made of string literals only are left to locate_translation_tags.
+    Keys are resolved against the keyPrefix of the file like the keys of
+    locate_translation_tags, based on their literal text. Calls whose key
+    has no literal text at all, such as ``t(key)``, cannot be checked and
+    are left out.
+
+    Args:
+        content: The source code.
+
+    Returns:
+        tags: The start and end offsets of the argument of each ``t()``
+        call and the literal parts of its key, with an unknown part of any
+        length between two parts, in order of appearance.
+    """
+    primary_prefix = _primary_prefix(content, None)
+
+    result = []
+    for match in _DYNAMIC_TAG_PATTERN.finditer(content):
+        parts = _key_parts(match.group(1))
+        if parts is None:
+            continue
+        if len(parts) == 1:
+            # Joined into a key by locate_translation_tags
+            continue
+        parts[0] = parts[0].split(":")[-1]
+        if not any(parts):
+            continue
+        if primary_prefix is not None and "." not in "".join(parts):
+            parts[0] = f"{primary_prefix}.{parts[0]}"
+        result.append((match.start(1), match.end(1), tuple(parts)))
 
     return result
 
@@ -168,6 +515,11 @@ def get_target_files(
 ) -> list[Path]:
     """Resolve target source files for translation validation.
 
+    Directories are listed through file_discovery, so files that git
+    ignores are skipped. A file is excluded when its name ends with one of
+    the exclude patterns or when one of its directories below the scanned
+    directory is named after one.
+
     Args:
         files: Explicit list of files to scan.
         directories: Directories to recursively scan.
@@ -179,45 +531,44 @@ def get_target_files(
     Raises:
         FileNotFoundError: If the default src directory is missing.
     """
-    exclude = exclude or []
+    exclude = tuple(exclude or ())
+    matches = file_discovery.compile_filter(TRANSLATED_SUFFIXES, exclude)
     targets: list[Path] = []
 
     if files:
         for file_path in files:
             path = Path(file_path)
             if path.exists() and path.is_file():
-                targets.append(path)
+                if matches(path.name) and not set(exclude) & set(path.parts):
+                    targets.append(path)
             else:
                 print(
                     f"Warning: File not found: {file_path}",
                     file=sys.stderr,
                 )
 
-    if directories:
-        for directory in directories:
-            dir_path = Path(directory)
-            if dir_path.exists() and dir_path.is_dir():
-                targets.extend(dir_path.rglob("*"))
-            else:
-                print(
-                    f"Warning: Directory not found: {directory}",
-                    file=sys.stderr,
-                )
-
     if not files and not directories:
         src_path = Path("src")
         if not src_path.exists() or not src_path.is_dir():
             raise FileNotFoundError("Default 'src' directory not found")
-        targets = list(src_path.rglob("*"))
-
-    return [
-        path
-        for path in targets
-        if path.suffix in {".ts", ".tsx", ".js", ".jsx"}
-        and not any(path.name.endswith(x) or x in path.parts for x in exclude)
-        and ".spec." not in path.name
-        and ".test." not in path.name
-    ]
+        directories = [str(src_path)]
+
+    for directory in directories or []:
+        dir_path = Path(directory)
+        if dir_path.exists() and dir_path.is_dir():
+            targets.extend(
+                Path(path)
+                for path in file_discovery.discover_files(
+                    directory, matches, prune_names=exclude
+                )
+            )
+        else:
+            print(
+                f"Warning: Directory not found: {directory}",
+                file=sys.stderr,
+            )
+
+    return targets
 
 
 def check_file(path: Path, valid_keys: set[str]) -> list[str]:
@@ -230,11 +581,486 @@ def check_file(path: Path, valid_keys: set[str]) -> list[str]:
     Returns:
         missing_keys: A sorted list of missing translation keys.
     """
+    return check_source(path, valid_keys)[0]
+
+
+def check_source(
+    path: Path, valid_keys: set[str], key_index: KeyIndex | None = None
+) -> tuple[list[str], list[str]]:
+    """Check a file for missing keys and unmatched keys built at runtime.
+
+    The file is read once for both checks.
+
+    Args:
+        path: File path to check.
+        valid_keys: Set of valid translation keys.
+        key_index: Index of the valid translation keys, or None to skip
+            the keys built at runtime.
+
+    Returns:
+        tuple: The sorted missing keys and the sorted keys built at runtime
+        that match no known key, written with ``*`` for their unknown
+        parts.
+    """
+    try:
+        content = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return [], []
+    missing = sorted(
+        {
+            tag
+            for _, _, tag in locate_translation_tags(content, str(path))
+            if tag not in valid_keys
+        }
+    )
+    unmatched = []
+    if key_index is not None:
+        unmatched = find_unmatched_dynamic_keys(content, key_index)
+    return missing, unmatched
+
+
+def find_unmatched_dynamic_keys(
+    content: str, key_index: KeyIndex
+) -> list[str]:
+    """Find the keys built at runtime that no known key can match.
+
+    Args:
+        content: The source code.
+        key_index: Index of the valid translation keys.
+
+    Returns:
+        unmatched: A sorted list of the unmatched keys, written with ``*``
+        for their unknown parts.
+    """
     return sorted(
-        tag for tag in find_translation_tags(path) if tag not in valid_keys
+        {
+            "*".join(parts)
+            for _, _, parts in locate_dynamic_tags(content)
+            if not key_index.matches(parts)
+        }
     )
 
 
+def format_file_errors(file: str, missing: list[str]) -> str:
+    """Format the missing translation keys of a file.
+
+    Args:
+        file: Path of the file.
+        missing: Its missing translation keys.
+
+    Returns:
+        str: The report of the file.
+    """
+    return "\n".join(
+        [f"File: {file}"] + [f"  - Missing: {tag}" for tag in missing]
+    )
+
+
+def format_unmatched_warnings(file: str, unmatched: list[str]) -> str:
+    """Format the keys built at runtime of a file that match no known key.
+
+    These are warnings rather than errors: the unknown part of such a key
+    may hold a value the check cannot see, such as a key of another
+    namespace.
+
+    Args:
+        file: Path of the file.
+        unmatched: Its unmatched keys, as found by
+            find_unmatched_dynamic_keys.
+
+    Returns:
+        str: One warning per key.
+    """
+    return "\n".join(
+        f"Warning: No translation key matches {tag} in {file}"
+        for tag in unmatched
+    )
+
+
+def locate_hooks(content: str) -> list[Hook]:
+    """Find the t functions a source gets from useTranslation.
+
+    A ``t`` that no hook in the source defines, such as one received as a
+    prop, is resolved against the first keyPrefix of the source, as in
+    locate_translation_tags, in an unknown namespace.
+
+    Args:
+        content: The source code.
+
+    Returns:
+        list: The t functions, in order of appearance.
+    """
+    hooks = []
+    for match in _HOOK_PATTERN.finditer(content):
+        name = _HOOK_NAME_PATTERN.search(match.group(1).strip())
+        if name is None:
+            continue
+        arguments = match.group(2)
+        namespace = _DEFAULT_NAMESPACE
+        if arguments.strip():
+            literal = _HOOK_NAMESPACE_PATTERN.match(arguments)
+            namespace = literal.group(2) if literal else _ANY_NAMESPACE
+        prefix = _HOOK_PREFIX_PATTERN.search(arguments)
+        if prefix is not None:
+            prefix = prefix.group(2)
+        else:
+            prefix = ""
+        hooks.append(Hook(name.group(1) or "t", namespace, prefix))
+
+    if all(hook.name != "t" for hook in hooks):
+        prefix = _primary_prefix(content, None) or ""
+        hooks.append(Hook("t", _ANY_NAMESPACE, prefix))
+    return hooks
+
+
+@functools.lru_cache(maxsize=None)
+def _call_pattern(name: str) -> re.Pattern:
+    """Compile the pattern of the calls to a t function.
+
+    Args:
+        name: Name the function is called by.
+
+    Returns:
+        re.Pattern: A pattern matching ``name(``.
+    """
+    return re.compile(rf"(?<![\w$.]){re.escape(name)}\(\s*")
+
+
+def _resolve_calls(
+    content: str, path: str, hook: Hook, usage: KeyUsage
+) -> None:
+    """Add the keys the calls to a t function may use.
+
+    Keys are resolved like i18next does, with the keyPrefix of the hook in
+    front of every key. A call whose key has no literal text, such as
+    ``t(option)``, may use any key below the keyPrefix, or any key of the
+    namespace when the hook has no keyPrefix.
+
+    Args:
+        content: The source code.
+        path: Path of the source.
+        hook: The t function.
+        usage: Updated with the keys used by the calls.
+
+    Returns:
+        None
+    """
+    for call in _call_pattern(hook.name).finditer(content):
+        if content.startswith(")", call.end()):
+            continue
+        argument = _CALL_ARGUMENT_PATTERN.match(content, call.end())
+        parts = None
+        if argument is not None:
+            parts = _key_parts(argument.group(1))
+            if parts is None:
+                parts = [argument.group(1).strip()[1:-1]]
+        namespace = hook.namespace
+        if parts is not None and ":" in parts[0]:
+            namespace, parts[0] = parts[0].split(":", 1)
+
+        if parts is None or not any(parts):
+            if hook.prefix:
+                usage.dynamic.add((f"{hook.prefix}.", ""))
+            else:
+                usage.unresolved.add((namespace, path))
+            continue
+        if hook.prefix is None:
+            # The keyPrefix is only known at runtime
+            prefixed = ("", f".{parts[0]}", *parts[1:])
+        elif hook.prefix:
+            prefixed = (f"{hook.prefix}.{parts[0]}", *parts[1:])
+        else:
+            prefixed = tuple(parts)
+        for key in {prefixed, tuple(parts)}:
+            if len(key) == 1:
+                usage.keys.add(key[0])
+            else:
+                usage.dynamic.add(key)
+
+
+def _scan_usage(path: str) -> KeyUsage:
+    """Collect the translation keys a source file may use.
+
+    Every call to a t function is resolved against the keyPrefix of the
+    hook that defines it. String literals, which may hold keys passed to
+    t() in variables, are resolved against every keyPrefix of the file.
+
+    Args:
+        path: Path of the file.
+
+    Returns:
+        KeyUsage: The keys used by the file, empty if it cannot be read.
+    """
+    usage = KeyUsage(set(), set(), set(), set())
+    try:
+        content = Path(path).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return usage
+
+    usage.keys.update(
+        tag for _, _, tag in locate_translation_tags(content, path)
+    )
+    usage.dynamic.update(parts for _, _, parts in locate_dynamic_tags(content))
+    hooks = locate_hooks(content)
+    for hook in hooks:
+        _resolve_calls(content, path, hook, usage)
+
+    prefixes = {hook.prefix for hook in hooks if hook.prefix}
+    prefixes.update(_KEY_PREFIX_PATTERN.findall(content))
+    prefixes.update(_COMMENT_PREFIX_PATTERN.findall(content))
+    for _, literal in _KEY_LITERAL_PATTERN.findall(content):
+        literal = literal.split(":")[-1]
+        usage.literals.add(literal)
+        usage.literals.update(f"{prefix}.{literal}" for prefix in prefixes)
+    return usage
+
+
+def iter_key_usage(paths: list[Path], jobs: int = 1) -> Iterator[KeyUsage]:
+    """Collect the translation keys each of a set of source files may use.
+
+    Args:
+        paths: The source files.
+        jobs: Number of worker processes used to scan the files.
+
+    Yields:
+        KeyUsage: The keys used by each file, in the order of paths.
+    """
+    names = [str(path) for path in paths]
+    if jobs > 1 and len(names) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # Batches keep the cost of sending results back low
+            chunksize = max(1, len(names) // (jobs * 4))
+            yield from executor.map(_scan_usage, names, chunksize=chunksize)
+    else:
+        yield from map(_scan_usage, names)
+
+
+def merge_key_usage(usages: Iterable[KeyUsage]) -> KeyUsage:
+    """Combine the keys used by several source files.
+
+    Args:
+        usages: The keys used by each file.
+
+    Returns:
+        KeyUsage: The keys used by any of the files.
+    """
+    merged = KeyUsage(set(), set(), set(), set())
+    for usage in usages:
+        merged.keys.update(usage.keys)
+        merged.literals.update(usage.literals)
+        merged.dynamic.update(usage.dynamic)
+        merged.unresolved.update(usage.unresolved)
+    return merged
+
+
+def scan_key_usage(paths: list[Path], jobs: int = 1) -> KeyUsage:
+    """Collect the translation keys a set of source files may use.
+
+    Args:
+        paths: The source files.
+        jobs: Number of worker processes used to scan the files.
+
+    Returns:
+        KeyUsage: The keys used by any of the files.
+    """
+    return merge_key_usage(iter_key_usage(paths, jobs))
+
+
+def find_used_keys(index: KeyIndex, usage: KeyUsage) -> set[str]:
+    """Find the keys of an index that source files use.
+
+    A key is used when a ``t()`` call names it, when a key built at
+    runtime may resolve to it, or when it is written as a string literal,
+    since keys are often passed to ``t()`` through variables.
+
+    Args:
+        index: Index of the translation keys.
+        usage: The keys used by the source files, from scan_key_usage.
+
+    Returns:
+        used: The keys of the index that are used.
+    """
+    used = {key for key in usage.keys | usage.literals if key in index}
+    for parts in usage.dynamic:
+        used.update(index.matching(parts))
+    return used
+
+
+def find_unresolved_files(usage: KeyUsage, namespace: str) -> list[str]:
+    """Find the files whose keys held in variables may use any key.
+
+    Args:
+        usage: The keys used by the source files, from scan_key_usage.
+        namespace: The namespace, such as ``common``.
+
+    Returns:
+        list: The sorted paths of the files with calls to a t function of
+        the namespace, or of an unknown namespace, whose key could not be
+        resolved.
+    """
+    return sorted(
+        {
+            path
+            for call_namespace, path in usage.unresolved
+            if call_namespace in (namespace, _ANY_NAMESPACE)
+        }
+    )
+
+
+def find_unused_keys(keys: Iterable[str], usage: KeyUsage) -> list[str]:
+    """Find the keys that no source file uses.
+
+    Args:
+        keys: The translation keys.
+        usage: The keys used by the source files, from scan_key_usage.
+
+    Returns:
+        unused: The unused keys, in sorted order, as defined by
+        find_used_keys.
+    """
+    index = KeyIndex(keys)
+    used = find_used_keys(index, usage)
+    return [key for key in index.starting_with("") if key not in used]
+
+
+def _without_keys(data: dict, keys: set[str], prefix: str = "") -> dict:
+    """Copy locale JSON without some of its keys.
+
+    Objects left empty by the removal are removed as well.
+
+    Args:
+        data: Parsed locale JSON.
+        keys: The flattened keys to remove.
+        prefix: Prefix of the keys of data.
+
+    Returns:
+        dict: The copy.
+    """
+    result = {}
+    for key, value in data.items():
+        flat_key = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            value = _without_keys(value, keys, f"{flat_key}.")
+            if not value:
+                continue
+        elif flat_key in keys:
+            continue
+        result[key] = value
+    return result
+
+
+def _json_size(data: dict) -> int:
+    """Return the size of locale JSON written with the usual formatting.
+
+    Args:
+        data: Parsed locale JSON.
+
+    Returns:
+        int: Size in bytes of the JSON in UTF-8, indented by two spaces.
+    """
+    return len(json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+def find_unused_by_locale(
+    locales_dir: str | Path, usage: KeyUsage
+) -> dict[str, dict[str, UnusedKeys]]:
+    """Find the unused keys of every locale next to a locale directory.
+
+    Args:
+        locales_dir: Path to a locale directory, such as
+            ``public/locales/en``. The locales are its sibling directories.
+        usage: The keys used by the source files, from scan_key_usage.
+
+    Returns:
+        dict: The unused keys of each locale file, by locale and file name.
+
+    Raises:
+        FileNotFoundError: If the locale directory does not exist.
+    """
+    base = Path(locales_dir)
+    if not base.is_dir():
+        raise FileNotFoundError(locales_dir)
+
+    report: dict[str, dict[str, UnusedKeys]] = {}
+    for locale_dir in sorted(base.resolve().parent.iterdir()):
+        if not locale_dir.is_dir():
+            continue
+        for name in _LOCALE_FILES:
+            path = locale_dir / name
+            if not path.exists():
+                continue
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError) as exc:
+                print(
+                    f"Warning: Failed to parse {path}: {exc}",
+                    file=sys.stderr,
+                )
+                continue
+            unused = find_unused_keys(get_keys(data), usage)
+            size = _json_size(data)
+            saved = size - _json_size(_without_keys(data, set(unused)))
+            report.setdefault(locale_dir.name, {})[name] = UnusedKeys(
+                unused,
+                size,
+                saved,
+                find_unresolved_files(usage, Path(name).stem),
+            )
+    return report
+
+
+def format_unused_report(
+    report: dict[str, dict[str, UnusedKeys]], locale: str
+) -> str:
+    """Format the unused keys of a locale and the savings of every locale.
+
+    Keys of a locale file that t() calls with keys held in variables may
+    use are listed apart as possibly unused, with those files, and are
+    left out of the savings.
+
+    Args:
+        report: The unused keys, from find_unused_by_locale.
+        locale: The locale whose unused keys are listed.
+
+    Returns:
+        str: The report.
+    """
+    files = [
+        (name, unused)
+        for name, unused in report.get(locale, {}).items()
+        if unused.keys
+    ]
+    lines = []
+    unused_files = [item for item in files if not item[1].unresolved]
+    if unused_files:
+        lines.append(f"Unused translation keys in {locale}:")
+        for name, unused in unused_files:
+            lines.append(f"  {name}:")
+            lines.extend(f"    - {key}" for key in unused.keys)
+    possible_files = [item for item in files if item[1].unresolved]
+    if possible_files:
+        lines.append(f"Possibly unused translation keys in {locale}:")
+        for name, unused in possible_files:
+            lines.append(f"  {name}:")
+            lines.append("    Keys held in variables may use any of them in:")
+            lines.extend(f"      {path}" for path in unused.unresolved)
+            lines.extend(f"    - {key}" for key in unused.keys)
+    lines.append("Bytes saved by removing the unused keys, per locale:")
+    for name, locale_files in report.items():
+        unused_files = [
+            unused for unused in locale_files.values() if not unused.unresolved
+        ]
+        count = sum(len(unused.keys) for unused in unused_files)
+        size = sum(unused.size for unused in locale_files.values())
+        saved = sum(unused.saved for unused in unused_files)
+        share = saved / size * 100 if size else 0.0
+        lines.append(
+            f"  {name}: {saved} of {size} bytes ({share:.1f}%), "
+            f"{count} keys"
+        )
+    return "\n".join(lines)
+
+
 def main() -> None:
     """CLI entry point for translation validation.
 
@@ -250,16 +1076,49 @@ def main() -> None:
 
     Raises:
         SystemExit: Exits with status code 0 on success, 1 if missing
-            translation keys are found, or 2 for configuration errors.
+            translation keys are found, or with --unused if keys that no
+            source file can use are found, or 2 for configuration errors.
+            Keys built at runtime that match no known key are only
+            reported as warnings.
     """
     parser = argparse.ArgumentParser()
     parser.add_argument("--files", nargs="*", default=[])
     parser.add_argument("--directories", nargs="*", default=[])
     parser.add_argument("--locales-dir", default="public/locales/en")
+    parser.add_argument(
+        "--cache-dir",
+        default=".translation_check_cache",
+        help="""Directory of the snapshot of the locale keys, rebuilt when
+        a locale file changes (default: .translation_check_cache).""",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse the locale files without reading or writing a snapshot.",
+    )
+    parser.add_argument(
+        "--unused",
+        action="store_true",
+        help="""Instead of checking the keys used by the source files,
+        report the keys of the locale directory that no source file uses
+        and the bytes removing the unused keys would save in every
+        locale.""",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="""Number of processes used to scan the source files with
+        --unused (default: number of CPUs).""",
+    )
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
 
     try:
-        valid_keys = load_locale_keys(args.locales_dir)
+        valid_keys = load_locale_keys(
+            args.locales_dir, None if args.no_cache else args.cache_dir
+        )
     except FileNotFoundError as exc:
         print(
             f"Error: Locale directory not found: {exc}",
@@ -273,18 +1132,44 @@ def main() -> None:
         print(f"Error: {exc}", file=sys.stderr)
         sys.exit(2)
 
+    if args.unused:
+        usage = scan_key_usage(targets, args.jobs)
+        report = find_unused_by_locale(args.locales_dir, usage)
+        locale = Path(args.locales_dir).resolve().name
+        if locale not in report:
+            print(
+                f"Error: No locale files found in {args.locales_dir}",
+                file=sys.stderr,
+            )
+            sys.exit(2)
+        if not any(unused.keys for unused in report[locale].values()):
+            print("No unused translation keys found")
+            sys.exit(0)
+        print(format_unused_report(report, locale))
+        sys.exit(
+            int(
+                any(
+                    unused.keys and not unused.unresolved
+                    for unused in report[locale].values()
+                )
+            )
+        )
+
+    key_index = KeyIndex(valid_keys)
     errors: dict[str, list[str]] = {}
     for path in targets:
-        missing = check_file(path, valid_keys)
+        missing, unmatched = check_source(path, valid_keys, key_index)
+        if unmatched:
+            print(
+                format_unmatched_warnings(str(path), unmatched),
+                file=sys.stderr,
+            )
         if missing:
             errors[str(path)] = missing
 
     if errors:
-        for file, tags in errors.items():
-            print(
-                f"File: {file}\n"
-                + "\n".join(f"  - Missing: {tag}" for tag in tags)
-            )
+        for file, missing in errors.items():
+            print(format_file_errors(file, missing))
         sys.exit(1)
 
     print("All translation tags validated successfully")